@@ -0,0 +1,239 @@
+# On-disk store of finalized day totals
+
+# Python packages
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sensor_cache import merge_intervals, missing_intervals
+
+# Set by configure_aggregates from the report parameters
+AGGREGATES = None
+
+
+def configure_aggregates(params: dict = None):
+    """Enable the day totals store from the "aggregates" report parameters
+    Args:
+        params (dict): directory, refresh_hours, invalidate_from
+    """
+
+    global AGGREGATES
+
+    AGGREGATES = AggregateStore(**params) if params else None
+
+
+def day_number(date: datetime) -> int:
+    """Days since 1970-01-01 of a naive date, the rollups day key"""
+
+    return int(np.datetime64(pd.Timestamp(date), "D").astype("int64"))
+
+
+class TotalsWindow:
+    """Stored and new day totals of one report source and period
+
+    Days from fetch_start on come from the rows fetched this run, the
+    earlier ones of the period from the store. Rows fetched from before
+    fetch_start, as the batch prefetch fetches the whole period, are kept
+    too and replace the stored days they cover. New days that can no
+    longer change are written back, replacing what the store had for them.
+    Args:
+        store (AggregateStore): Store the totals are kept in.
+        folder (Path): Store folder of the source.
+        period (tuple): First and past the last day number of the report.
+        fetch_day (int): First day number fetched this run.
+        final_day (int): Days before it are finalized.
+    """
+
+    def __init__(
+        self,
+        store: "AggregateStore",
+        folder: Path,
+        period: tuple,
+        fetch_day: int,
+        final_day: int,
+    ):
+        self.store = store
+        self.folder = folder
+        self.period = period
+        self.fetch_day = fetch_day
+        self.final_day = final_day
+
+    @property
+    def fetch_start(self) -> datetime:
+        """Start of the rows to fetch, midnight of fetch_day"""
+
+        return datetime(1970, 1, 1) + timedelta(days=self.fetch_day)
+
+    def merge(self, totals: pd.DataFrame, group: str) -> pd.DataFrame:
+        """Store the finalized new days and add the stored ones
+        Args:
+            totals (pd.DataFrame): group, day number and totals of the
+                fetched rows, see rollups.rollup.
+            group (str): Column with the sensor or label of every row.
+        Returns:
+            pd.DataFrame: Totals of every day of the period, ordered by day
+                then group.
+        """
+
+        first, last = self.period
+        fetched = self.fetch_day
+        if len(totals):
+            fetched = min(self.fetch_day, int(totals.day.min()))
+        coverage, stored, invalidated = self.store.read(self.folder)
+        stored = stored.reindex(columns=totals.columns)
+
+        if self.final_day > fetched:
+            new = totals[totals.day < self.final_day]
+            replaced = stored.day.between(fetched, self.final_day - 1)
+            stored = pd.concat(
+                [stored[~replaced], new.astype({group: str})],
+                ignore_index=True,
+            )
+            coverage = merge_intervals(coverage + [[fetched, self.final_day]])
+            self.store.write(self.folder, coverage, stored, invalidated)
+
+        stored = stored[stored.day.between(first, fetched - 1)]
+        df = pd.concat(
+            [stored, totals.astype({group: str})], ignore_index=True
+        )
+        df[group] = pd.Categorical(df[group], ordered=True)
+
+        return df.sort_values(["day", group], ignore_index=True)
+
+
+class AggregateStore:
+    """Persistent day totals of the consumption reports
+
+    Every report source is a folder under directory, named after a hash of
+    its key, with the day totals in totals.parquet and the days they cover
+    in coverage.json. A report then only fetches and adds up the days the
+    store does not cover yet, see TotalsWindow.
+
+    A day is finalized once it ended refresh_hours ago, so late data of
+    the latest days is picked up by later runs, and a stored day that is
+    fetched again, as the batch prefetch does, is replaced by the new
+    totals. invalidate_from drops the stored days from that date on, for
+    late data that arrives after refresh_hours. It is applied once per
+    folder: coverage.json records the date applied, and only a different
+    date drops the days again.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        refresh_hours: float = 48,
+        invalidate_from: str = None,
+    ):
+        self.directory = Path(directory)
+        self.refresh = timedelta(hours=refresh_hours)
+        self.invalidate_from = invalidate_from and day_number(
+            datetime.strptime(invalidate_from, "%Y-%m-%d")
+        )
+
+    def _folder(self, key: dict) -> Path:
+        text = json.dumps(key, sort_keys=True, default=str)
+        return self.directory / hashlib.sha1(text.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def read(folder: Path) -> tuple:
+        """Coverage, day totals and applied invalidate_from of a folder"""
+
+        if not (folder / "coverage.json").exists():
+            empty = pd.DataFrame({"day": pd.Series(dtype="int64")})
+            return [], empty, None
+
+        with open(folder / "coverage.json") as f:
+            coverage = json.load(f)
+
+        return (
+            coverage["days"],
+            pd.read_parquet(folder / "totals.parquet"),
+            coverage.get("invalidated"),
+        )
+
+    @staticmethod
+    def write(
+        folder: Path,
+        coverage: list,
+        totals: pd.DataFrame,
+        invalidated: int = None,
+    ):
+        """Replace the coverage and day totals of a source folder"""
+
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / "totals.parquet"
+        totals.to_parquet(path.with_suffix(".tmp"), index=False)
+        os.replace(path.with_suffix(".tmp"), path)
+
+        path = folder / "coverage.json"
+        with open(path.with_suffix(".tmp"), "w") as f:
+            json.dump({"days": coverage, "invalidated": invalidated}, f)
+        os.replace(path.with_suffix(".tmp"), path)
+
+    def window(
+        self,
+        key: dict,
+        ini_date: datetime,
+        end_date: datetime,
+        now: datetime = None,
+    ) -> TotalsWindow:
+        """Plan the days of a report source to fetch and to read back
+        Args:
+            key (dict): What the totals depend on exp(report, source,
+                company, sensor rules), JSON serializable.
+            ini_date (datetime): Start date of the report.
+            end_date (datetime): End date of the report.
+            now (datetime): Wall-clock time in the report timezone, the
+                host local time if None.
+        Returns:
+            TotalsWindow: Days to fetch and stored totals of the period.
+        """
+
+        folder = self._folder(key)
+        first = day_number(ini_date)
+        last = day_number(end_date - timedelta(microseconds=1)) + 1
+        final = day_number(
+            min(end_date, (now or datetime.now()) - self.refresh)
+        )
+
+        coverage, stored, invalidated = self.read(folder)
+        if self.invalidate_from not in (None, invalidated):
+            coverage = [
+                [start, min(end, self.invalidate_from)]
+                for start, end in coverage
+                if start < self.invalidate_from
+            ]
+            stored = stored[stored.day < self.invalidate_from]
+            self.write(folder, coverage, stored, self.invalidate_from)
+
+        missing = missing_intervals(first, last, coverage)
+        fetch = missing[0][0] if missing else last - 1
+
+        return TotalsWindow(self, folder, (first, last), fetch, final)
+
+
+def totals_window(
+    key: dict, ini_date: datetime, end_date: datetime, timezone: str = None
+) -> TotalsWindow:
+    """Stored day totals of a report source, if the store is enabled
+    Args:
+        key (dict): What the totals depend on, see AggregateStore.window.
+        ini_date (datetime): Start date of the report.
+        end_date (datetime): End date of the report.
+        timezone (str): Zone of the report times, host zone if None.
+    Returns:
+        TotalsWindow: Days to fetch and stored totals, None without store.
+    """
+
+    if AGGREGATES is None:
+        return None
+
+    now = None
+    if timezone is not None:
+        now = pd.Timestamp.now(tz=timezone).tz_localize(None).to_pydatetime()
+
+    return AGGREGATES.window(key, ini_date, end_date, now)
\ No newline at end of file
@@ -0,0 +1,130 @@
+# pH comfort band benchmark
+
+# Flags millions of pH readings of many sensors with the row-wise apply
+# and the zip list comprehension the report scripts used, and with
+# ph_bands.classify_ph on scalar and per-sensor limits, and fails when a
+# comfort flag differs from the old ones or classify_ph is not faster.
+
+# Python packages
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ph_bands import CONFORT, band_limits, classify_ph
+
+BAND = {
+    "min_standard": 5.5,
+    "max_standard": 6.5,
+    "min_alert": 5,
+    "max_alert": 7,
+}
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Band Benchmark",
+        description="Time classify_ph against the row-wise comfort flags",
+    )
+
+    config_parser.add_argument(
+        "-r",
+        "--rows",
+        type=int,
+        default=2_000_000,
+        help="pH readings classified",
+    )
+
+    config_parser.add_argument(
+        "-s",
+        "--sensors",
+        type=int,
+        default=50,
+        help="Sensors of the readings, half with their own comfort band",
+    )
+
+    return config_parser.parse_args()
+
+
+def readings(rows: int, sensors: int) -> pd.DataFrame:
+    """pH readings with the per-row limits process_data broadcast
+    Args:
+        rows (int): Readings.
+        sensors (int): Sensors, every other one with a 5.8 - 6.2 band.
+    Returns:
+        pd.DataFrame: sensors, pH, min_standard and max_standard.
+    """
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "sensors": pd.Categorical.from_codes(
+                rng.integers(0, sensors, rows),
+                [f"G{i:02} - pH" for i in range(sensors)],
+            ),
+            "pH": np.round(rng.normal(6, 0.6, rows), 3),
+        }
+    )
+    df.loc[rng.random(rows) < 0.01, "pH"] = np.nan
+    narrow = df["sensors"].cat.codes.to_numpy() % 2 == 1
+    df["min_standard"] = np.where(narrow, 5.8, BAND["min_standard"])
+    df["max_standard"] = np.where(narrow, 6.2, BAND["max_standard"])
+
+    return df
+
+
+def main():
+
+    args = parser_config()
+
+    df = readings(args.rows, args.sensors)
+    thresholds = {
+        name: {"min_standard": 5.8, "max_standard": 6.2}
+        for name in df["sensors"].cat.categories[1::2]
+    }
+
+    flags = {
+        "apply": lambda: df["pH"]
+        .apply(lambda x: BAND["min_standard"] <= x <= BAND["max_standard"])
+        .to_numpy(),
+        "classify": lambda: classify_ph(df["pH"], **BAND) == CONFORT,
+        "zip": lambda: np.array(
+            [
+                a <= x <= b
+                for a, x, b in zip(
+                    df["min_standard"], df["pH"], df["max_standard"]
+                )
+            ]
+        ),
+        "classify per sensor": lambda: classify_ph(
+            df["pH"], **band_limits(df["sensors"], thresholds, BAND)
+        )
+        == CONFORT,
+    }
+
+    print(f"{'flags':<22}{'rows':>10}{'seconds':>10}{'speedup':>10}")
+    problems = []
+    for name, flag in flags.items():
+        started = time.perf_counter()
+        confort = flag()
+        seconds = time.perf_counter() - started
+        if not name.startswith("classify"):
+            old, expected, reference = seconds, confort, name
+        elif not (np.asarray(confort) == expected).all():
+            problems.append(f"{name} flags other readings")
+        elif seconds >= old:
+            problems.append(f"{name} not faster than {reference}")
+        print(
+            f"{name:<22}{len(confort):>10}{seconds:>10.2f}"
+            f"{old / seconds:>10.1f}"
+        )
+
+    if problems:
+        print("; ".join(problems))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,114 @@
+# Value coercion benchmark of the sensor fetch
+
+# Converts millions of object sensor values, as ioa returns them, with the
+# pd.to_numeric call melt_values used to make and with frame_dtypes.to_values
+# in float64 and float32, clean and with bad readings. It fails when
+# to_values converts a value differently, miscounts the bad readings or
+# costs much more than the pd.to_numeric it replaced. Best of 3.
+
+# Python packages
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from frame_dtypes import configure_dtypes, to_values
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Coerce Benchmark",
+        description="Time to_values against pd.to_numeric",
+    )
+
+    config_parser.add_argument(
+        "-v",
+        "--values",
+        type=int,
+        default=10_000_000,
+        help="Object values converted",
+    )
+
+    config_parser.add_argument(
+        "-b",
+        "--bad",
+        type=int,
+        default=1000,
+        help="One value in bad is not a number",
+    )
+
+    config_parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=1.5,
+        help="Largest time ratio allowed against pd.to_numeric",
+    )
+
+    return config_parser.parse_args()
+
+
+def best(function, repeat: int = 3) -> tuple:
+    """Result and best time of a few runs"""
+
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - started)
+
+    return result, min(seconds)
+
+
+def main():
+
+    args = parser_config()
+
+    clean = np.round(np.random.default_rng(0).random(args.values) * 10, 3)
+    clean = clean.astype(object)
+    dirty = clean.copy()
+    dirty[:: args.bad] = "error"
+    good = np.ones(len(clean), dtype=bool)
+    good[:: args.bad] = False
+
+    expected, numeric = best(lambda: pd.to_numeric(pd.Series(clean)))
+    expected = expected.to_numpy()
+    print(
+        f"{'conversion':<24}{'values':>10}{'seconds':>10}{'coerced':>10}"
+        f"{'invalid':>9}"
+    )
+    print(f"{'pd.to_numeric':<24}{len(clean):>10}{numeric:>10.2f}")
+
+    cases = (
+        ("to_values float64", "float64", clean, 0),
+        ("to_values float64 bad", "float64", dirty, int(np.sum(~good))),
+        ("to_values float32", "float32", clean, 0),
+    )
+    problems = []
+    for name, dtype, values, invalid in cases:
+        configure_dtypes({"values": dtype})
+        (result, coerced, dropped), seconds = best(lambda: to_values(values))
+        rows = good if invalid else slice(None)
+        if not np.allclose(result[rows], expected[rows], rtol=1e-6) or (
+            invalid and not np.isnan(result[~good]).all()
+        ):
+            problems.append(f"{name} converts other values")
+        elif (coerced, dropped) != (len(values) - invalid, invalid):
+            problems.append(f"{name} miscounts the readings")
+        elif seconds > numeric * args.tolerance:
+            problems.append(f"{name} slower than pd.to_numeric")
+        print(
+            f"{name:<24}{len(values):>10}{seconds:>10.2f}{coerced:>10}"
+            f"{dropped:>9}"
+        )
+    configure_dtypes()
+
+    if problems:
+        print("; ".join(problems))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
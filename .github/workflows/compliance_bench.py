@@ -0,0 +1,180 @@
+# Daily pH compliance benchmark
+
+# Builds the per-sensor, per-day table of time inside the comfort band
+# from the hourly pH readings of the fake sensor API over longer and
+# longer ranges, once with the sensor x date loops of the original
+# nutriavicola plots and once with ph_bands.daily_compliance, and fails
+# when the tables differ or the grouped reduction is not faster.
+
+# Python packages
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from golden_check import FIXTURES, TIMEZONE
+
+DAYS = (30, 90, 365, 730)
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Compliance Benchmark",
+        description="Time daily_compliance against the sensor x date loops",
+    )
+
+    config_parser.add_argument(
+        "-s",
+        "--sensors",
+        type=int,
+        default=3,
+        help="pH sensors of the table",
+    )
+
+    config_parser.add_argument(
+        "-g",
+        "--gaps",
+        type=float,
+        default=0.1,
+        help="Share of the hourly readings missing",
+    )
+
+    return config_parser.parse_args()
+
+
+def readings(sensors: int, days: int, gaps: float):
+    """Hourly pH rows as prepare receives them
+    Args:
+        sensors (int): pH sensors.
+        days (int): Days of readings.
+        gaps (float): Share of the readings dropped.
+    Returns:
+        pd.DataFrame: sensors, date, programa and confortpH per reading,
+            programa changing at midnight halfway through.
+    """
+
+    import numpy as np
+    import pandas as pd
+    from funciones_ioa import ioa
+
+    from ph_bands import CONFORT, classify_ph
+    from report_time import add_calendar_columns, decode_time
+
+    ini_date = datetime(2021, 1, 1)
+    end_date = ini_date + pd.Timedelta(days=days)
+    df = pd.concat(
+        [
+            ioa.get_sensor_values(f"pH-{i}", ini_date, end_date).assign(
+                sensors=f"G{i:02} - pH"
+            )
+            for i in range(sensors)
+        ],
+        ignore_index=True,
+    )
+    df = df[np.random.default_rng(days).random(len(df)) >= gaps].copy()
+
+    df["time"] = decode_time(df["timestamp"])
+    df = add_calendar_columns(df, ["date"])
+    df["pH"] = df["value"].astype(float)
+    df["programa"] = np.where(
+        df["time"] < ini_date + pd.Timedelta(days=days // 2),
+        "Antes",
+        "Después",
+    )
+    df["confortpH"] = classify_ph(df["pH"], 5.5, 6.5) == CONFORT
+
+    return df
+
+
+def loop_compliance(df_ph):
+    """Compliance table as the nutriavicola plots built it
+    Args:
+        df_ph (pd.DataFrame): readings result.
+    Returns:
+        pd.DataFrame: sensors, confPorph, fecha and programa.
+    """
+
+    import numpy as np
+    import pandas as pd
+
+    comfortph = []
+    for i in df_ph.sensors.unique():
+        for w in df_ph.date.unique():
+            df_ph4WB = df_ph[(df_ph.date == w) & (df_ph.sensors == i)]
+
+            d = {
+                "sensors": i,
+                "confPorph": np.sum(
+                    df_ph4WB[df_ph4WB.sensors == i]["confortpH"]
+                )
+                * 100
+                / df_ph4WB[df_ph4WB.sensors == i].shape[0],
+                "fecha": str(w),
+                "programa": [
+                    (
+                        np.nan
+                        if len(df_ph4WB.sensors.unique()) == 0
+                        else df_ph4WB.programa.unique()[0]
+                    )
+                ][0],
+            }
+
+            comfortph.append(d)
+
+    return pd.DataFrame(comfortph).dropna()
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import numpy as np
+
+    from ph_bands import daily_compliance
+
+    failed = False
+    print(f"{'days':<8}{'rows':>10}{'loops s':>10}{'groupby s':>12}")
+    for days in DAYS:
+        df = readings(args.sensors, days, args.gaps)
+
+        started = time.perf_counter()
+        old = loop_compliance(df)
+        loops = time.perf_counter() - started
+
+        started = time.perf_counter()
+        new = daily_compliance(df)
+        groupby = time.perf_counter() - started
+
+        old = old.sort_values(["sensors", "fecha"], ignore_index=True)
+        new = new.sort_values(["sensors", "fecha"], ignore_index=True)
+        problems = []
+        if not (
+            len(old) == len(new)
+            and (
+                old[["sensors", "fecha", "programa"]]
+                == new[["sensors", "fecha", "programa"]].astype(str)
+            ).all(axis=None)
+            and np.allclose(old["confPorph"], new["confPorph"])
+        ):
+            problems.append("tables differ")
+        elif groupby >= loops:
+            problems.append("not faster than the loops")
+        failed = failed or bool(problems)
+        print(
+            f"{days:<8}{len(df):>10}{loops:>10.2f}{groupby:>12.3f}"
+            f"  {'; '.join(problems)}"
+        )
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,276 +1,40 @@
+from __future__ import annotations
+
 # Python packages
-import time
-import argparse
-import json
+from report_cli import parse_report_args
+
+# --help and parameter errors exit here, before pandas and plotly load
+PARAMETERS = parse_report_args() if __name__ == "__main__" else None
 
 # import boto3
 import numpy as np
 import pandas as pd
+from aggregate_store import TotalsWindow
 from typing import List
-from datetime import datetime
-from funciones_ioa import ioa as ioa
+from downsampling import thin_line
+from lazy_import import lazy_import
+from ph_bands import CONFORT, band_limits, classify_ph
+from plot_bands import band_line
+from report_engine import report_main
+from rollups import rollup
+from sensor_partitions import SensorPartitions
+from sensor_rules import apply_sensor_rules
 
 # Graphics packages
-import plotly.tools as tls
-import plotly.graph_objs as go
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from plotly.offline import plot
-
-
-def to_html(list_data: List, com_farm: str) -> str:
-
-    html_result = """
-<!DOCTYPE html>
-<html>
-    <head>
-        
-        <link rel="shortcut icon" href="http://www.iconj.com/ico/p/1/p14r1u145y.ico" type="image/x-icon" />
-        <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-        <link rel="stylesheet" href="https://maxcdn.bootstrapcdn.com/bootstrap/3.3.1/css/bootstrap.min.css">
-        <meta charset="UTF-8">
-        <style type="text/css">
-            h3 {text-align: left;font-family: Helvetica Neue;}
-            h4 {text-align: left;font-family: Helvetica Neue;}
-            h5 {text-align: left;font-family: Helvetica Neue; color: gray; }
-            h6 {text-align: center;font-family: Helvetica Neue; color: gray; }
-            table { margin-left: auto;margin-right: auto;width:'20%'}
-            table, th, td {border: 1px solid black;border-collapse: collapse;}
-            th, td {padding: 5px;text-align: center;font-family: Helvetica Neue;font-size: 90%;}
-            table tbody tr:hover {background-color: #dddddd;}
-            .wide {width: 90%; }
-            .text{margin-left: 5%;margin-right: 5%;}
-            .container{padding-bottom:3%;}
-            .title{text-align: center;font-family: Helvetica Neue;}
-            
-        </style>
-    </head>
-    <body style="margin-left:12%;margin-right:12%;margin-top:3%;margin-bottom:3%;padding-left:3%;padding-right:3%;padding-top:3%;
-    box-shadow: 0 5px 9px 0 rgba(0, 0, 0, 0.5), 0 6px 20px 0 rgba(0, 0, 0, 0.19);border-radius:10px">
-    """
-
-    html_result += '<img src="data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAXgAAACGCAMAAADgrGFJAAAAsVBMVEX///80NDQigHQmJiYiIiIrKyva2towMDC7u7spKSng4OBzc3Pz8/MgICAuLi6enp4bGxvp6enx8fH5+fmUlJQAd2p8fHxmZmaxsbHQ0NBDQ0NKSkoSEhLl5eWlpaVfX1+EhIQ7OztSUlKOjo7Hx8fR0dGamppvb29XV1diYmK/v7+5089TmI7i7uzr8/Kjo6ODsKo7joPH3Nmmx8JEkIbX5+SVvrioyMNspp4LCwt2q6NMT6YaAAAOJ0lEQVR4nO1daXuizBINNoioEAxxN4hrTCbLJLPlvv//h13Mql1LFwaGeQxn5qPprj4U1bV1c3JSoUKFChUqVKhQoUKFChXyRhRFZYvw9RA9fr95qD3cfH8sW5IvhehHrdutbdHt/vxWtjRfB79+vrD+gu7NbdkCfRE81vbRrf0qW6QvgdsaRKXzfwEPCPEPZQv1BfC7ixDf/V22WMcPjPeU+cqlLxjfCOL/lC3YseMJ5b1WuylbsGMHwXutVrZgxw7c0tQqj7Jg3FHEd6sgqljkqPGNS8cbtwbtAqQ8QpA2Pqs/ee3bgWW5ju3HhQh6bLgheM8auw4m1hvCpAhBjw1/CD8+Y+ja/OA9ZX5djKxHBWJ37WY08f3A2mX+rBhhjwrfUeafsg3S2VV4y1KVypsRoQp/l22QWO0R746KkfW48AhVPnOmZt/SWJZd+ZQCgDxZ90fWISwN9qoIQY8Oj7V96jOXu9ueTvyyCDmPD3dP79R3u0/ZY9YOIP66ACmPEre/bx663e7DzfdDcjRNpRPfyF3C48Xd7a/bjM7MG+oV8eWgIr4kVMSXhIr4klARXxIq4ktCRXxJqIgvCRXxJaEiviRUxJeEiviSUBFfEiriD0TUvlg2Gvf393GjsTprZ+6Nz0R81GzE8VJYG2wPB6eDa0HTwuq8NZ324o5sWF2kdnOVEtBoDFed7Ks/EGfDdWvshL5tqxS2HYazTTJoZiqaZiF+MArTmXxrIeCofW49/9hrNQ0CXIXKcQNH2YuMvEXNQTIdeeGWANv2w4k7vzxfHvb8MqBz3bJCFbj7tLmOHY4XK/kS5MRHPf91MjWrG6WbvY3rKNZ2LR3nbWa/n0FlouFi7NvO/vrdwPOd6drwqD+FemL5joXD9exxLO1LEhMf9e2PGdwLftRottO7EDLFxKa/w5zqC4U+6azHtqfp3LtwSm2K2qfqV55eKtUnt85lWi8lPpru/tC55Eft7YrnzmgtmO+3sckK7Z2eqwjWX2e0R0W037Z7fsBN+wIViB67kPhovP+kJ6wpvdh/Ge176oercJ+wuUTktUHrXqgf594tcR1SNkZDOBfYGxnx7bEj+NU71tLutHONwolZ4tVMl5igPrzM1cmJktA86SsCx/zURcRHG/1ZK/ZV1rvTyPdjrlkM3yjw6YQ1MrtwAqMPIMfZRva8XxGemgaUEB/1wbutBpyQI40csldHH9bmht1KcilXu1TpJ4bh5LiYC83MG8KFYUQB8dElfNgTrtGvM9N+TT2mtq693jkrbJRN7dI3yKh4MnRmGXlPp074IQXEt2wwKr8LNqWGCRDvsNK25+ZdVV++SfFEiMYCbwZMzSuRmfge5N2asLYYEk8oHiS+xY17lZn3dPmkR5UB5MRpxO3oMezH1KyhMxKP8a56rJwFEd+j7Ay//M/3gq59dFZ7ojaXSXI1moT4g7G5zd1E/AKZ1BnzjloxxA/Q5Qf2xJumy++PJj6+fN8QZRuxmiCjBva88e6rrdYWFtG5I4YnA/EY7wETiT6jEOJBd+3z79X0Y/nDhYv9xh3z0poQ6T7a84r6mjYPRshjVwk9LE/8KcK7OzMloQohfoPsb3ZfEyW2sOV/boO9R3wLJCsQ9RCuFG1sWOJjjHfLGJYUQfwAOvCBC813u4Uo/f8+Y2w6CAV4dhYRkclpccQPkH3VtcxHdQogPpqB990Zo2/eOWTelNJjsQDjuQ7xIBHm6VCcIb6B8B6Y9b0Q4uH77o6IPMQpFNsfmoUmcAY5CEnVg+4P/cxp4q8R3p2R5K0tgHho4F1yp0mAjgbiRD9ADFiwmWh4CuQMKTFJ4peIfffmohpR/sQ3gDBcdDKGZunQolSkp/H4oP0CPHOP2tkp4utINsq+kiVa8yceeHSsDteB432wYwOH4os1yA5DjYwTX0f03U6E0uZOPNQC/jRuTxfANYR8JPSCgeVu2N9DH4jaEQDxzjYd0EQicFt8y0HuxN/rQhqMdgfoKRu9MwCWxjfU9RJ97VTCFRBveevmEjpvlpJnm3InHixfGdwUvRJz6N0YHWhwDVH7UN+MqfIbJN5SoQ95z+IY5E38BUyGGyS41i1lcCUXfwfAo+bTpydYgmGCWzmEeBRZDnznTfwSLD8xLR88KlN+CQcw8aYSGbK/EEGElPgwg5HMm/i1LqO5NNvSbQ3pT7OY6gLaxmFAuE9UgcTEZ7jUI2/ir3QWzc0Ip8BZO6j8qrPgjoyBTF1/SRy8eCElnuIOQ97Eg4AoMIoAwj8ykOEQ6d6RYKsAOQYi4pISn6WekDPxoHYemJNeZ7o7QuidYSGHjAJ2Vxf9mZh4R+4X5Ew8GM7Qi7BFNNJXPxWL/wH43phnPtkA3xd1a8TEZ7CSORO/0pfPNvW8AORYBNYZAniTgplPLkEMge5IcuLdmbT1vGjiJYdWQAjlHuBPAg9FonzAn1SoJyQn3vKkZjJn4oHemb1JRO9MIScGSLwgmoHEo554BuLF15XlTPwAuPGCugbMmRxAfKzPLHGqCyCebVfYwT9JvKARGc58yLtWAPGWEmzqJ/8o8fgWx+MfsfEpJqLEQd7EA70TEN8C2ZoDiC/Hq3EcmKOUHdnImfhhaV4N9OMF2WXox6OOLEW8G/QWU9gdJOoBFRMP8r0y4v+aHw8qXwdFrniCgyA+eO7ZiSHzocCZFxMPfogSD9JOoshVJ356QPEP5mrMVYnP5Wqc16aVHmDeERREYIxPvKEy4kEdU5Kr0d8SYwUDBUi7jA/IThJ1ZLQXdPxqEJF2HsHGDvkk3tAVKPhiQsKizswowlA3EgdlJ2E+XhlThaAdiag6YsQ7H+0zsJ/HNbsHgHhKRYci4uF2NTHqHQh9+NNyFNagAmXc12EFCvf9EeKd+Y45hM1B5swBIJ5yhoB24MQDn1xQgdL/JEsFjRPQuHhAGBG5QeLd2a4+wY4e87IB8ZaD/xAoFE48WL5xd82r5grS+tbM8LIhfEp/qF36kID91dgdBIknKu1AL3FGm6CryGTklzphB3YZQCtnOvW/ALpEbC6AeL0PBAQ5qaEzKBwknog1wWtJqDLYXW1D7ArDdnTg6O7OoENZW6nOZmDpxJMCxIPtvwGbegx9WaBWR2xtF2BgwgOAasQ7h9BCwERV9Pj95qFWe3j6wX3toAlaGfnNAmzqRP0JIR6GhbD3ODA0EALi8Y5D2IBP+KqgFGJo/wUPClrHbz+7r1+a6Nb+Y+7eBw4lq/LQ/SZ3Y8EB4zrS6c86ZxF0hXzsucNiBVVogH3XCTM/bLzTu4XvnnY/rdJlPq0Czxpy1+/AgJN8QSR3GcDTKIbMAdiSUFsDtwIy7wjaZNiiDHxFtRfk7kH7mlD3OzUWNNqWTa4dWuWArLFLiG/DA4f0gFuA1CDaugl2QPp5toFTyyS9YNCnm4cH+Pks8gOJyBkoamoQLnNOkOjaFOQ0VMiFcKDlEHMrsCMnITUifEjOhti14OkRy9+v2P2HfKqP/PowkjVxpmhQgCyI0U/ZRUF9qJxcfhs7PqW0Z9/EjkKTm3YHLkrhd8c1oF3UFP4X+onEn9TU0MxZzgypvcIXjXV7ZcQj5pjLHNSRS0bc/VuLsBZ8rk8Q2We8EbJxIWf+rMl+ZusJ473WfSRmxk52uyrRjGK9j0zMciS7kww528MdDsBOobve6buw9QRpwU8tDT3kGfKgXHWuvXbDKfauJXu/uUV5r9VuqKlX2OVEatZbvb9xneu+h+kal6eQXgYH1x3M6agPpLVehLX6i8FgcNrbKPy+B64ZFTNf6fKTjzs2O40rGzl3r+/r4PuIbypPLmeBTW05anaVnMZxuhwLm9eQ1JJefwiyH+kvaWceHEh5Y9ZTtq2QYu4z+Jw5PL76/DfeqJ/EcXzfopav98LgX8FlbE3qHhP3MwXO9opbajk2uxzxhZ+gSZ1NlmG2xogJG45GxLVgLr/8UFcP3MSnxNNRVKRfQiiB4fpSMfHIOSwmhsMvl+Fhqs5hZt4IeEaU+sY890XWs1Fm5pWhIQN+ZJFiE/oLXNx+gMp7prLaBXkNE718WPsiNZ77BHEn63VoynTrJTgETsbiMAPDqShM65nAbBnvy896GZ6NSEjaePZbuO2rTJ1fvrFSFYGqIpn2BJEZm6mKs9wQmUJJ2gA682zXbmLbG+nV8N8HjbDLqgi4kkPB4HJO+qd6EMN7IetMzCtZ30sbuweJXD6aZKb8+AfT3NeO0NyokeSknpa75npW2pqxMRwvTzJYG3UlbfQaYKEKBntMvLv47kqnyd7RaUnu1w1C2UXmWjV7whXVtHYMx9BVFofSzTBsyfu8LvqSYR11Sg35iNsayZeIhyPT3M6kLz2lt+cee3yT1nrXs+HumHuV0xKZZCfjHcDLmXn5LUYpnrDsJOfT7M698akvBmyNm2/6MscOOu5HaGS6UfJk53rnwNTpsMXa56/Y384ZtjK3XlzP2eXbPVbrIoT3J/Hc9cXIQ8I117GD8TrTtXMXo1dyXHtq4jJ6v17RE9wKl6J9P/YY7l3lXB7UarRKRgp8IeV5+e7Y+IGdX4D3m0wtrfW4NbZ8X3nOM5TylTXvDTKf2o/OR9vv6thjQZtbu+/YTuDYdk/c9ly/nwa+h5LkbO4Pv5qwHl+OXdt+W76XLn+2SRqSAe9u9qyNYGMFuKgv7897SS/9v46X9QM/xrP9ZlM8FJ5wGiSXySCbmjaXyeXYCv30+XpbKDv0Z9Ok8dnv10TN+vXpIl17+u98kGX5P2rdD3Wn02PHgKjTXA7i00WK83gwbB7UU5cf7v481bopHv47btr/Rdxt8be+llahQoUKFSpUqFChQoUKFSrkhv8DTyjruv0fWwcAAAAASUVORK5CYII=" alt="asimetrix-full" alt="Asimetrix">'
-    html_result += '<div class="container">'
-    html_result += (
-        "<h2 class=title><strong> %s </strong></h2>\n" % "H2Okuo Reporting"
-    )
-    html_result += "<h3 class=title><strong> %s </strong></h3>\n" % com_farm
-    html_result += (
-        "<h4 class=title><strong> %s </strong></h4>\n"
-        % time.strftime("%d-%m-%Y")
-    )
-    html_result += '<div class="container">'
-    html_result += "</div>"
-
-    for i in list_data:
-
-        if i["title"] != None:
-            html_result += "<h3><strong> %s </strong></h3>\n" % i["title"]
-        if i["subtitle"] != None:
-            html_result += "<h4><strong> %s </strong></h4>\n" % i["subtitle"]
-        if i["text"] != None:
-            html_result += '<h5 class="text"> %s </h5>\n' % i["text"]
-
-        if i["type"] == "Table":
-            html_result += i["values"].to_html(
-                classes="wide", escape=False, index=False
-            )
-        elif i["type"] == "Graph":
-            aPlot = plot(
-                i["values"],
-                config={"displayModeBar": False},
-                show_link=False,
-                include_plotlyjs=False,
-                output_type="div",
-            )
-            html_result += aPlot
-        else:
-            html_result += (
-                "<h3><strong> %s </strong></h3>\n" % "Ningun tipo coincide"
-            )
-
-        html_result += '<div class="container">'
-        html_result += "</div>"
-
-    html_result += '<div style="text-align: center">'
-    html_result += "<h6>¿Quieres saber mas?</h6>"
-    html_result += (
-        '<a href="https://app.asimetrix.co/auth/login" rel="noopener" style="text-decoration:underline;color:#0068a5" target="_blank"><h6>%s</h6></a>\n'
-        % '<strong> <font color="#0068a5">www.asimetrix.co </font></strong>'
-    )
-    html_result += '<div class="container">'
-    html_result += """
-    </body>
-</html>
-"""
-    return html_result
-
-
-def get_sensors(company: str, farm: str, type_value: str) -> pd.DataFrame:
-    """Return sensors by type of value
-    Args:
-        company (str): Company Name
-        farm (str): Farm Name
-        type_value (str): Type of sensor value exp('pH','water')
-    Returns:
-        pd.DataFrame: Sensors info Dataframe.
-    """
-
-    df_sensors = ioa._get_devices_in_company_mongo(company, type_value)
-
-    if type_value == "pH":
-
-        df_sensors["noGalpon"] = df_sensors["barnName"].apply(
-            lambda x: x.split("|")[-1]
-        )
-
-        df_sensors = df_sensors[df_sensors.farmName == farm]
-
-        df_sensors["House"] = df_sensors["barnName"].apply(
-            lambda x: x.split("|")[-1]
-        )
-
-        df_sensors["sensor"] = df_sensors["kind"]
-
-    elif type_value == "water":
-
-        df_sensors = df_sensors[df_sensors.sensorName.str.contains("Min")]
-
-        df_sensors["noGalpon"] = df_sensors["barnName"].apply(
-            lambda x: x.split("|")[-1]
-        )
-
-        df_sensors["House"] = df_sensors["barnName"].apply(
-            lambda x: x.split("|")[-1]
-        )
-
-        df_sensors["sensor"] = df_sensors["sensorName"]
-
-    return df_sensors
-
-
-def get_sensor_data(
-    df_sensors: pd.DataFrame, ini_date: datetime, end_date: datetime
-) -> pd.DataFrame:
-
-    df = pd.DataFrame()
-
-    for _, row in df_sensors.iterrows():
-        temp = ioa.get_sensor_values(
-            row["raw_id"], ini_date, end_date, period="1H"
-        )
-        temp.rename(
-            columns={"value": row["sensor"].split("|")[-1]}, inplace=True
-        )
-        df = pd.concat([df, temp])
-
-    return df
-
-
-def process_data(
-    df: pd.DataFrame,
-    type_value: str,
-    min_standard: float = None,
-    max_standard: float = None,
-    min_alert: float = None,
-    max_alert: float = None,
-) -> pd.DataFrame:
-    """Proccess Sensors df and return Varieble Values df
-    Args:
-        df (pd.DataFrame): sensors Data Frame
-        type_value (str): Type if variable exp(pH, water)
-        min_standard (float): min_standard
-        max_standard (float): max_standa
-        min_alert (float): min_alert
-        max_alert (float): max_alert
-    Returns:
-        pd.DataFrame: Variable values Data Frame
-    """
-
-    df["time"] = df.timestamp.apply(lambda x: datetime.fromtimestamp(x / 1000))
-
-    df.set_index("time", inplace=True)
-
-    df = (
-        pd.DataFrame(df.drop(columns=["timestamp"]).stack())
-        .reset_index()
-        .rename(columns={0: type_value, "level_1": "Sensor"})
-    )
-
-    df[type_value] = pd.to_numeric(df[type_value])
-
-    df["date"] = df["time"].dt.date
-    df["hour"] = df["time"].dt.hour
-
-    if type_value == "pH":
-
-        df["Sensor"] = "pH tanque"
-        df["House"] = "La Loteria"
-        df["sensor"] = "pH tanque"
-        df["sensors"] = "La Loteria - pH tanque"
-        df["min_standard"] = min_standard
-        df["max_standard"] = max_standard
-        df["min_alert"] = min_alert
-        df["max_alert"] = max_alert
-
-        df["confort_pH"] = [
-            True if x <= y and y <= z else False
-            for x, y, z in zip(df["min_standard"], df.pH, df["max_standard"])
-        ]
-
-        df["programa"] = [
-            "Antes"
-            if x <= datetime.strptime("2021-07-08", "%Y-%m-%d")
-            else "Después"
-            for x in df["time"]
-        ]
-
-    elif type_value == "water":
-
-        df["litros"] = [
-            x * 3.785411784
-            if y == "Consumo Agua - Total Minuto Galones"
-            else x / 1000
-            for x, y in zip(df.water, df.Sensor)
-        ]
-
-        df["m3"] = [
-            x * 0.00378541
-            if y == "Consumo Agua - Total Minuto Galones"
-            else x / 1000000
-            for x, y in zip(df.water, df.Sensor)
-        ]
-
-        df["House"] = "Planta de producción"
-        df["sensors"] = [
-            "Citroquim"
-            if x == "Citroquim - Total Minuto mL"
-            else "Consumo de agua"
-            for x in df.Sensor
-        ]
-        df["semana"] = df["time"].dt.weekofyear
-        df["semana"] = [0 if x == 52 else x for x in df.semana]
-        df["mes"] = df["time"].dt.month
-        df["monthName"] = df["time"].dt.month_name(locale="Spanish")
-        df["year"] = df["time"].dt.year
-        df["yearMonth"] = [
-            str(x) + "-" + str(y) for x, y in zip(df["monthName"], df["year"])
-        ]
-
-        df = (
-            df.groupby(
-                ["date", "mes", "yearMonth", "monthName", "semana", "sensors"]
-            )
-            .sum()
-            .reset_index()
-        )
-
-    return df
+go = lazy_import("plotly.graph_objects")
+tls = lazy_import("plotly.subplots")
 
 
-def plot_daily_ph(df_ph_average: pd.DataFrame, sensor_list: List) -> go.Figure:
+def plot_daily_ph(
+    partitions: SensorPartitions,
+    sensor_list: List,
+    min_standard: float,
+    max_standard: float,
+    min_alert: float,
+    max_alert: float,
+) -> go.Figure:
 
-    df_ph_farm = df_ph_average.sort_values(["time"])
+    df_ph_farm = partitions.frame
 
     fig = tls.make_subplots(
         rows=1, cols=1, shared_xaxes=True, print_grid=False
@@ -279,8 +43,7 @@ def plot_daily_ph(df_ph_average: pd.DataFrame, sensor_list: List) -> go.Figure:
     for i in sensor_list:
         fig.add_trace(
             go.Scatter(
-                x=df_ph_farm[df_ph_farm["sensors"] == i].time,
-                y=df_ph_farm[df_ph_farm["sensors"] == i]["pH"],
+                **thin_line(partitions[i].time, partitions[i]["pH"]),
                 mode="lines",
                 connectgaps=False,
                 legendgroup="H" + i,
@@ -289,12 +52,9 @@ def plot_daily_ph(df_ph_average: pd.DataFrame, sensor_list: List) -> go.Figure:
             )
         )
 
-    layout = go.Layout(xaxis={"type": "category"})
-
     fig.add_trace(
         go.Scatter(
-            x=df_ph_farm["time"],
-            y=df_ph_farm["min_alert"],
+            **band_line(df_ph_farm["time"], min_alert),
             mode="lines",
             name="pH alerta",
             opacity=1,
@@ -307,8 +67,7 @@ def plot_daily_ph(df_ph_average: pd.DataFrame, sensor_list: List) -> go.Figure:
     )
     fig.add_trace(
         go.Scatter(
-            x=df_ph_farm["time"],
-            y=df_ph_farm["max_alert"],
+            **band_line(df_ph_farm["time"], max_alert),
             mode="lines",
             name="pH alerta",
             opacity=1,
@@ -323,8 +82,7 @@ def plot_daily_ph(df_ph_average: pd.DataFrame, sensor_list: List) -> go.Figure:
 
     fig.add_trace(
         go.Scatter(
-            x=df_ph_farm["time"],
-            y=df_ph_farm["min_standard"],
+            **band_line(df_ph_farm["time"], min_standard),
             mode="lines",
             name="pH óptimo",
             opacity=1,
@@ -337,8 +95,7 @@ def plot_daily_ph(df_ph_average: pd.DataFrame, sensor_list: List) -> go.Figure:
     )
     fig.add_trace(
         go.Scatter(
-            x=df_ph_farm["time"],
-            y=df_ph_farm["max_standard"],
+            **band_line(df_ph_farm["time"], max_standard),
             mode="lines",
             name="pH óptimo",
             opacity=1,
@@ -366,17 +123,12 @@ def plot_daily_ph(df_ph_average: pd.DataFrame, sensor_list: List) -> go.Figure:
 
 
 def plot_flat_daily_ph(
-    df_ph_average: pd.DataFrame, df_daily_ph: pd.DataFrame, sensor_list: List
+    partitions: SensorPartitions, df_daily_ph: pd.DataFrame, sensor_list: List
 ) -> go.Figure:
 
     data = [
         go.Scatter(
-            x=df_ph_average[df_ph_average["sensors"] == i]
-            .sort_values("time")
-            .time,
-            y=df_ph_average[df_ph_average["sensors"] == i]
-            .sort_values("time")
-            .pH.diff(),
+            **thin_line(partitions[i].time, partitions[i].pH.diff()),
             mode="lines",
             name=i,
             hovertemplate="Variación de pH: %{y:.2f}"
@@ -398,11 +150,9 @@ def plot_flat_daily_ph(
 
     fig.add_trace(
         go.Scatter(
-            x=df_ph_average[df_ph_average["sensors"] == sensor_list[0]]
-            .sort_values("time")
-            .time,
-            y=[-2 * df_daily_ph.pH_std.mean()]
-            * df_ph_average[df_ph_average.sensors == sensor_list[0]].shape[0],
+            **band_line(
+                partitions[sensor_list[0]].time, -2 * df_daily_ph.pH_std.mean()
+            ),
             mode="lines",
             name="2 desviaciones estandar",
             legendgroup="optimo",
@@ -415,11 +165,9 @@ def plot_flat_daily_ph(
 
     fig.add_trace(
         go.Scatter(
-            x=df_ph_average[df_ph_average["sensors"] == sensor_list[0]]
-            .sort_values("time")
-            .time,
-            y=[2 * df_daily_ph.pH_std.mean()]
-            * df_ph_average[df_ph_average.sensors == sensor_list[0]].shape[0],
+            **band_line(
+                partitions[sensor_list[0]].time, 2 * df_daily_ph.pH_std.mean()
+            ),
             mode="lines",
             name="2 desviaciones estandar",
             opacity=0.4,
@@ -441,7 +189,7 @@ def plot_hourly_ph(
 ) -> go.Figure:
 
     df_ph3 = (
-        df_ph_average.groupby(["hour", "sensors"])
+        df_ph_average.groupby(["hour", "sensors"], observed=True)
         .agg({"pH": ["mean", "std"]})
         .reset_index()
     )
@@ -455,12 +203,13 @@ def plot_hourly_ph(
     )
 
     df_ph3 = df_ph3.sort_values(["hour"])
+    partitions = SensorPartitions(df_ph3, sort_by="hour")
 
     for i in sensor_list:
         fig.add_trace(
             go.Scatter(
-                x=df_ph3[df_ph3["sensors"] == i].hour,
-                y=df_ph3[df_ph3["sensors"] == i]["mean"],
+                x=partitions[i].hour,
+                y=partitions[i]["mean"],
                 mode="lines",
                 legendgroup="H" + i,
                 name="" + i,
@@ -517,7 +266,7 @@ def plot_hourly_ph(
 def plot_average_ph(df_ph_average: pd.DataFrame) -> go.Figure:
 
     df_ph4 = (
-        df_ph_average.groupby(["date", "year", "sensors"])
+        df_ph_average.groupby(["date", "year", "sensors"], observed=True)
         .agg({"pH": ["mean", "std", "max", "mean"]})
         .reset_index()
     )
@@ -528,7 +277,7 @@ def plot_average_ph(df_ph_average: pd.DataFrame) -> go.Figure:
     )
     dias = df_ph4.year.count()
     df_ph4 = (
-        df_ph_average.groupby(["year", "sensors"])
+        df_ph_average.groupby(["year", "sensors"], observed=True)
         .agg({"pH": ["mean", "std", "max", "mean"]})
         .reset_index()
     )
@@ -568,7 +317,7 @@ def plot_ideal_ph(df_ph: pd.DataFrame, houses_list: List) -> go.Figure:
             / df_ph[df_ph.House == i].shape[0]
         )
 
-    fig = make_subplots(
+    fig = tls.make_subplots(
         rows=1,
         cols=1,
         specs=[[{"type": "domain"}]],
@@ -581,7 +330,7 @@ def plot_ideal_ph(df_ph: pd.DataFrame, houses_list: List) -> go.Figure:
             mode="gauge+number",
             number={"suffix": "%"},
             # Porcentaje del tiempo en el rango ideal
-            value=idealpH["pH_idealLa Loteria"],
+            value=idealpH["pH_ideal" + str(houses_list[0])],
             domain={"x": [0, 1], "y": [0, 1]},
             title={
                 "text": "Porcentaje dentro del pH óptimo",
@@ -606,14 +355,33 @@ def plot_ideal_ph(df_ph: pd.DataFrame, houses_list: List) -> go.Figure:
     return fig
 
 
+def process_water(
+    df: pd.DataFrame, sensor_rules: dict, stored: TotalsWindow = None
+) -> dict:
+    """Daily, weekly and monthly Citroquim and water consumption
+    Args:
+        df (pd.DataFrame): water rows from melt_values.
+        sensor_rules (dict): litros and m3 factors and sensors label per
+            Sensor, see sensor_rules.apply_sensor_rules.
+        stored (TotalsWindow): Stored day totals, None to add up df only.
+    Returns:
+        dict: day, week and month litros and m3 per sensors, see
+            rollups.rollup.
+    """
+
+    apply_sensor_rules(df, sensor_rules, label_column="sensors")
+
+    return rollup(df, "sensors", ["litros", "m3"], stored=stored)
+
+
 def plot_daily_water_consumption(df_water: pd.DataFrame) -> go.Figure:
 
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig = tls.make_subplots(specs=[[{"secondary_y": True}]])
 
     ###########
 
     inhiProm = (
-        df_water.groupby(["date"])
+        df_water.groupby(["date"], observed=True)
         .agg({"litros": ["sum", "max", "min", "std", "median", "mean"]})
         .reset_index()
     )
@@ -630,10 +398,15 @@ def plot_daily_water_consumption(df_water: pd.DataFrame) -> go.Figure:
 
     ###########
 
+    # Days come ordered by date from rollups
+    partitions = SensorPartitions(df_water, key="sensors", sort_by=None)
+    citroquim = partitions["Citroquim"]
+    water = partitions["Consumo de agua"]
+
     fig.add_trace(
         go.Scatter(
-            x=df_water[df_water["sensors"] == "Citroquim"].date,
-            y=df_water[df_water["sensors"] == "Citroquim"]["litros"],
+            x=citroquim.date,
+            y=citroquim["litros"],
             mode="lines",
             visible=True,
             legendgroup="H" + "Citroquim",
@@ -641,9 +414,9 @@ def plot_daily_water_consumption(df_water: pd.DataFrame) -> go.Figure:
             hovertext=[
                 "Fecha: {} <br>Litros: {:0.2f} <br>Sensor: {}".format(w, x, y)
                 for w, x, y in zip(
-                    df_water[df_water["sensors"] == "Citroquim"]["date"],
-                    df_water[df_water["sensors"] == "Citroquim"]["litros"],
-                    df_water[df_water["sensors"] == "Citroquim"]["sensors"],
+                    citroquim["date"],
+                    citroquim["litros"],
+                    citroquim["sensors"],
                 )
             ],
         ),
@@ -652,8 +425,8 @@ def plot_daily_water_consumption(df_water: pd.DataFrame) -> go.Figure:
 
     fig.add_trace(
         go.Scatter(
-            x=df_water[df_water["sensors"] == "Consumo de agua"].date,
-            y=df_water[df_water["sensors"] == "Consumo de agua"]["m3"],
+            x=water.date,
+            y=water["m3"],
             mode="lines",
             visible=True,
             legendgroup="H" + "Consumo de agua",
@@ -661,13 +434,7 @@ def plot_daily_water_consumption(df_water: pd.DataFrame) -> go.Figure:
             hovertext=[
                 "Fecha: {} <br>Litros: {:0.2f} <br>Sensor: {}".format(w, x, y)
                 for w, x, y in zip(
-                    df_water[df_water["sensors"] == "Consumo de agua"]["date"],
-                    df_water[df_water["sensors"] == "Consumo de agua"][
-                        "litros"
-                    ],
-                    df_water[df_water["sensors"] == "Consumo de agua"][
-                        "sensors"
-                    ],
+                    water["date"], water["litros"], water["sensors"]
                 )
             ],
         ),
@@ -699,32 +466,18 @@ def plot_daily_water_consumption(df_water: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def get_weekly_df_water(df_water: pd.DataFrame) -> pd.DataFrame:
-
-    df_week_water = (
-        df_water.groupby(
-            ["sensors", "yearMonth", "monthName", "mes", "semana"]
-        )
-        .agg({"litros": ["sum"], "m3": ["sum"]})
-        .reset_index()
-    )
-
-    df_week_water.columns = [
-        "_".join(x) for x in df_week_water.columns.ravel()
-    ]
+def get_weekly_df_water(df_week: pd.DataFrame) -> pd.DataFrame:
 
-    df_week_water.rename(
+    df_week_water = df_week.rename(
         columns={
-            "monthName_": "Mes del año",
-            "mes_": "Mes",
-            "sensors_": "sensors",
-            "semana_": "semana",
-            "yearMonth_": "yearMonth",
-        },
-        inplace=True,
+            "monthName": "Mes del año",
+            "mes": "Mes",
+            "litros": "litros_sum",
+            "m3": "m3_sum",
+        }
     )
 
-    df_week_water = df_week_water.sort_values(["semana"])
+    df_week_water = df_week_water.sort_values(["week"], kind="stable")
 
     return df_week_water
 
@@ -732,7 +485,7 @@ def get_weekly_df_water(df_water: pd.DataFrame) -> pd.DataFrame:
 def plot_weekly_water_consumption(df_week_water: pd.DataFrame) -> go.Figure:
 
     inhiPromSem = (
-        df_week_water.groupby(["semana"])
+        df_week_water.groupby(["week"], observed=True)
         .agg(
             {
                 "litros_sum": ["sum", "max", "min", "std", "median", "mean"],
@@ -747,7 +500,7 @@ def plot_weekly_water_consumption(df_week_water: pd.DataFrame) -> go.Figure:
     inhiPromSem.rename(
         columns={
             "Sensor_": "Sensor",
-            "semana_": "semana",
+            "week_": "week",
             "litros_sum_sum": "litros_sum",
             "litros_sum_max": "litros_max",
             "litros_sum_min": "litros_min",
@@ -763,18 +516,17 @@ def plot_weekly_water_consumption(df_week_water: pd.DataFrame) -> go.Figure:
         },
         inplace=True,
     )
-    inhiPromSem = inhiPromSem.sort_values(["semana"])
+    inhiPromSem = inhiPromSem.sort_values(["week"])
 
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig = tls.make_subplots(specs=[[{"secondary_y": True}]])
 
-    df_week_water = df_week_water.sort_values(["semana"])
+    df_week_water = df_week_water.sort_values(["week"])
+    partitions = SensorPartitions(df_week_water, key="sensors", sort_by="week")
 
     fig.add_trace(
         go.Scatter(
-            x=df_week_water[df_week_water["sensors"] == "Citroquim"].semana,
-            y=df_week_water[df_week_water["sensors"] == "Citroquim"][
-                "litros_sum"
-            ],
+            x=partitions["Citroquim"].week,
+            y=partitions["Citroquim"]["litros_sum"],
             mode="lines",
             visible=True,
             legendgroup="H" + "Citroquim",
@@ -786,12 +538,8 @@ def plot_weekly_water_consumption(df_week_water: pd.DataFrame) -> go.Figure:
 
     fig.add_trace(
         go.Scatter(
-            x=df_week_water[
-                df_week_water["sensors"] == "Consumo de agua"
-            ].semana,
-            y=df_week_water[df_week_water["sensors"] == "Consumo de agua"][
-                "m3_sum"
-            ],
+            x=partitions["Consumo de agua"].week,
+            y=partitions["Consumo de agua"]["m3_sum"],
             mode="lines",
             visible=True,
             legendgroup="H" + "Consumo de agua",
@@ -806,6 +554,7 @@ def plot_weekly_water_consumption(df_week_water: pd.DataFrame) -> go.Figure:
         title="Consumo semanal en litros",
         xaxis_title="Semana",
         legend_title="Líneas",
+        xaxis=dict(categoryorder="category ascending"),
     )
 
     fig.update_yaxes(
@@ -819,32 +568,13 @@ def plot_weekly_water_consumption(df_week_water: pd.DataFrame) -> go.Figure:
     return fig
 
 
-def get_monthly_df_water(df_week_water: pd.DataFrame) -> pd.DataFrame:
-
-    df_month_water = (
-        df_week_water.groupby(["sensors", "Mes", "yearMonth", "Mes del año"])
-        .agg({"litros_sum": ["sum"], "m3_sum": ["sum"]})
-        .reset_index()
-    )
+def get_monthly_df_water(df_month: pd.DataFrame) -> pd.DataFrame:
 
-    df_month_water.columns = [
-        "_".join(x) for x in df_month_water.columns.ravel()
-    ]
-
-    df_month_water.rename(
-        columns={
-            "litros_sum_": "litros",
-            "Mes_": "Mes",
-            "Mes del año_": "Mes del año",
-            "sensors_": "sensors",
-            "litros_sum_sum": "litros",
-            "m3_sum_sum": "m3",
-            "yearMonth_": "yearMonth",
-        },
-        inplace=True,
+    df_month_water = df_month.rename(
+        columns={"monthName": "Mes del año", "mes": "Mes"}
     )
 
-    df_month_water = df_month_water.sort_values(["Mes"])
+    df_month_water = df_month_water.sort_values(["Mes"], kind="stable")
 
     return df_month_water
 
@@ -854,7 +584,7 @@ def plot_monthly_citroquim_consumption(
 ) -> go.Figure:
 
     inhiProm = (
-        df_month_water.groupby(["Mes"])
+        df_month_water.groupby(["Mes"], observed=True)
         .agg({"litros": ["sum"], "m3": ["sum"]})
         .reset_index()
     )
@@ -872,17 +602,16 @@ def plot_monthly_citroquim_consumption(
     inhiProm = inhiProm.sort_values(["Mes"])
 
     df_month_water = pd.merge(df_month_water, inhiProm, on="Mes", how="left")
+    citroquim = SensorPartitions(df_month_water, key="sensors", sort_by=None)[
+        "Citroquim"
+    ]
 
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig = tls.make_subplots(specs=[[{"secondary_y": True}]])
 
     fig.add_trace(
         go.Bar(
-            x=df_month_water[df_month_water["sensors"] == "Citroquim"][
-                "yearMonth"
-            ],
-            y=df_month_water[df_month_water["sensors"] == "Citroquim"][
-                "litros"
-            ],
+            x=citroquim["yearMonth"],
+            y=citroquim["litros"],
             legendgroup="H" + "Citroquim",
             showlegend=True,
             hovertemplate="Litros: %{y:.2f}" + "<br>Mes: %{x}",
@@ -942,16 +671,15 @@ def plot_monthly_citroquim_consumption(
 
 def plot_monthly_water_consumption(df_month_water: pd.DataFrame) -> go.Figure:
 
-    fig = make_subplots(specs=[[{"secondary_y": True}]])
+    fig = tls.make_subplots(specs=[[{"secondary_y": True}]])
+    water = SensorPartitions(df_month_water, key="sensors", sort_by=None)[
+        "Consumo de agua"
+    ]
 
     fig.add_trace(
         go.Bar(
-            x=df_month_water[df_month_water["sensors"] == "Consumo de agua"][
-                "yearMonth"
-            ],
-            y=df_month_water[df_month_water["sensors"] == "Consumo de agua"][
-                "m3"
-            ],
+            x=water["yearMonth"],
+            y=water["m3"],
             legendgroup="H" + "Consumo de agua",
             showlegend=True,
             hovertemplate="Metros cúbicos: %{y:.2f}" + "<br>Mes: %{x}",
@@ -1005,109 +733,35 @@ def plot_monthly_water_consumption(df_month_water: pd.DataFrame) -> go.Figure:
     )
     return fig
 
-def parser_config()-> dict:
-
-    config_parser = argparse.ArgumentParser(
-        prog="Report Generator",
-        description="Generate the report pass the parameter values from lambda script",
-    )
-
-    config_parser.add_argument(
-        "-pf",
-        "--parameters_file",
-        help="File with the report parameters",
-        required=True,
-    )
-
-    args = config_parser.parse_args()
-
-    return args
 
-def main():
-
-    args = parser_config()
-
-    json_file_name = ""
-    if args.parameters_file is not None:
-        if ".json" in args.parameters_file:
-            json_file_name = args.parameters_file
-
-    json_dict = json.load(open(json_file_name))
-
-    company = json_dict["company"]
-    farm = json_dict["farm"]
-    report_name =  json_dict["report_name"][0]
-    
-    ini_date = json_dict["start_date"]
-    ini_date = datetime.strptime(ini_date, "%Y-%m-%d")
-    
-    end_date = json_dict["end_date"]
-    
-    min_standard = json_dict["params"]["min_standard"]
-    max_standard = json_dict["params"]["max_standard"]
-    min_alert = json_dict["params"]["min_alert"]
-    max_alert = json_dict["params"]["max_alert"]
-
-    if end_date is None:
-        end_date = datetime.now()
-    else:
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-
-    com_farm = company + " - " + farm
-
-    # Graphs Data List
-    list_data = list()
-
-    current_date = time.strftime("%d-%m-%y")
-
-    # ------------- pH -------------
-
-    df_sensors_ph = get_sensors(company, farm, "pH")
-
-    df_ph = get_sensor_data(df_sensors_ph, ini_date, end_date)
+def prepare(frames: dict, params: dict) -> dict:
+    """Frames shared by the don_pollo sections
+    Args:
+        frames (dict): pH and water rows of the report.
+        params (dict): Report parameters.
+    Returns:
+        dict: pH averages and partitions, water consumption per day, week
+            and month.
+    """
 
-    df_ph = process_data(
-        df_ph, "pH", min_standard, max_standard, min_alert, max_alert
-    )
+    df_ph = frames["pH"]
 
     # ------- df_ph_average -----
 
     df_ph_average = (
-        df_ph.groupby(["time", "date", "sensors"]).mean().reset_index()
+        df_ph.groupby(["time", "date", "sensors"], observed=True)
+        .mean()
+        .reset_index()
     )
     df_ph_average["year"] = df_ph_average["time"].dt.year
-    df_ph_average["month"] = df_ph_average["time"].dt.month_name(
-        locale="Spanish"
-    )
-    df_ph_average["yearMonth"] = [
-        str(x) + "-" + str(y)
-        for x, y in zip(df_ph_average["month"], df_ph_average["year"])
-    ]
-
-    sensor_list = df_ph_average.sensors.unique()
-
-    houses_list = df_ph.House.unique()
-
-    houses_list.sort()
-
-    # ----------------------- Daily pH -----------------------
-
-    fig = plot_daily_ph(df_ph_average, sensor_list)
-
-    text = "Muestra los valores de pH"
-
-    data = {
-        "values": fig,
-        "title": "Niveles de pH",
-        "subtitle": None,
-        "text": text,
-        "type": "Graph",
-    }
+    df_ph_average["month"] = df_ph_average["time"].dt.month
 
-    list_data.append(data)
+    houses_list = sorted(df_ph.House.unique())
 
     df_daily_ph = (
-        df_ph.groupby(["sensors"]).agg({"pH": ["mean", "std"]}).reset_index()
+        df_ph.groupby(["sensors"], observed=True)
+        .agg({"pH": ["mean", "std"]})
+        .reset_index()
     )
 
     df_daily_ph.columns = ["_".join(x) for x in df_daily_ph.columns.ravel()]
@@ -1116,166 +770,160 @@ def main():
         columns={"sensors_": "sensors", "time_": "time"}, inplace=True
     )
 
-    # ----------------------- Daily flat pH -----------------------
-
-    fig = plot_flat_daily_ph(df_ph_average, df_daily_ph, sensor_list)
-
-    text = "Muestra la variación del pH. Ideal no variar más de 2 desviaciones estandard."
-
-    data = {
-        "values": fig,
-        "title": None,
-        "subtitle": "Variación de pH",
-        "text": text,
-        "type": "Graph",
-    }
-
-    list_data.append(data)
-
-    # ----------------------- Hourly pH -----------------------
-
-    fig = plot_hourly_ph(df_ph_average, sensor_list)
-
-    text = "Muestra cuantos puntos varía el pH cada hora, no debe superar 2 desviaciones estandar."
-
-    data = {
-        "values": fig,
-        "title": None,
-        "subtitle": "Variación de pH cada hora",
-        "text": text,
-        "type": "Graph",
-    }
-
-    list_data.append(data)
-
-    # ----------------------- Average pH -----------------------
-
-    df_ph_average["year"] = df_ph_average["time"].dt.year
-
-    df_ph_average["month"] = df_ph_average["time"].dt.month
-
-    fig = plot_average_ph(df_ph_average)
-
-    text = "Este es el valor promedio de pH durante todo el tiempo medido."
-
-    data = {
-        "values": fig,
-        "title": None,
-        "subtitle": "Promedio de pH general",
-        "text": text,
-        "type": "Graph",
-    }
-
-    list_data.append(data)
-
     # ----------------------- Confort pH processings-----------------------
 
-    df_ph["confortpH"] = [
-        True if x <= y and y <= z else False
-        for x, y, z in zip(
-            df_ph["min_standard"], df_ph.pH, df_ph["max_standard"]
+    df_ph["confortpH"] = (
+        classify_ph(
+            df_ph.pH,
+            **band_limits(df_ph.sensors, params["thresholds"], params),
         )
-    ]
-
-    fig = plot_ideal_ph(df_ph, houses_list)
-
-    text = "El pH está entre 4 y 5 más del 88% del tiempo."
-
-    data = {
-        "values": fig,
-        "title": None,
-        "subtitle": "Tiempo (%) del pH dentro de los niveles optimos",
-        "text": text,
-        "type": "Graph",
-    }
-
-    list_data.append(data)
-
-    # Water Flow
-
-    df_sensors_water = get_sensors(company, farm, "water")
-
-    df_water = get_sensor_data(df_sensors_water, ini_date, end_date)
-
-    df_water = process_data(df_water, "water")
-
-    df_water = df_water.sort_values(["date"])
-
-    # ------------- General Average - Daily Consumption -------------
-
-    fig = plot_daily_water_consumption(df_water)
-
-    text = "Entrega los valores de consumo de Citroquim cada día en Litros"
-
-    data = {
-        "values": fig,
-        "title": "Consumo de Citroquim y Agua",
-        "subtitle": "Diario",
-        "text": text,
-        "type": "Graph",
-    }
-
-    list_data.append(data)
-
-    # ----------------------- Weekly Consumption -----------------------
-
-    df_week_water = get_weekly_df_water(df_water)
-
-    fig = plot_weekly_water_consumption(df_week_water)
-
-    text = "Entrega los valores de consumo de Citroquim cada semana en litros"
-
-    data = {
-        "values": fig,
-        "title": None,
-        "subtitle": "Semanal",
-        "text": text,
-        "type": "Graph",
-    }
-
-    list_data.append(data)
-
-    # ----------------------- Monthly Consumption -----------------------
-
-    df_month_water = get_monthly_df_water(df_week_water)
-
-    fig = plot_monthly_citroquim_consumption(df_month_water)
-
-    text = (
-        "La gráfica muestra el consumo total de Citroquim en litros mes a mes."
+        == CONFORT
     )
 
-    data = {
-        "values": fig,
-        "title": None,
-        "subtitle": "Mensual",
-        "text": text,
-        "type": "Graph",
-    }
-
-    list_data.append(data)
-
-    fig = plot_monthly_water_consumption(df_month_water)
-
-    text = "La gráfica muestra el consumo total de agua en litros mes a mes."
+    # Water Flow
 
-    data = {
-        "values": fig,
-        "title": None,
-        "subtitle": None,
-        "text": text,
-        "type": "Graph",
+    water = process_water(
+        frames["water"],
+        params["sensor_rules"],
+        params["stored_totals"].get("water"),
+    )
+
+    return {
+        "df_ph": df_ph,
+        "df_ph_average": df_ph_average,
+        "df_daily_ph": df_daily_ph,
+        "sensor_list": df_ph_average.sensors.unique(),
+        "partitions": SensorPartitions(df_ph_average),
+        "houses_list": houses_list,
+        "df_water": water["day"],
+        "df_week_water": get_weekly_df_water(water["week"]),
+        "df_month_water": get_monthly_df_water(water["month"]),
     }
 
-    list_data.append(data)
 
-    html_doc = to_html(list_data, com_farm)
-
-    with open(
-        report_name + " " + current_date + ".html", "w"
-    ) as f:
-        f.write(html_doc)
+REPORT = {
+    "template": "plotly",
+    "sources": {
+        "pH": {
+            "type_value": "pH",
+            "by_farm": True,
+            "house": "La Loteria",
+            "sensor": "pH tanque",
+            "programa": "2021-07-08",
+        },
+        "water": {
+            "type_value": "water",
+            "name_contains": "Min",
+            "aggregates": True,
+        },
+    },
+    "sensor_rules": {
+        "Consumo Agua - Total Minuto Galones": {
+            "label": "Consumo de agua",
+            "units": {"litros": 3.785411784, "m3": 0.00378541},
+        },
+        "Citroquim - Total Minuto mL": {
+            "label": "Citroquim",
+            "units": {"litros": 0.001, "m3": 0.000001},
+        },
+        "*": {
+            "label": "Consumo de agua",
+            "units": {"litros": 0.001, "m3": 0.000001},
+        },
+    },
+    "prepare": prepare,
+    "sections": [
+        {
+            "plot": plot_daily_ph,
+            "args": (
+                "partitions",
+                "sensor_list",
+                "min_standard",
+                "max_standard",
+                "min_alert",
+                "max_alert",
+            ),
+            "title": "Niveles de pH",
+            "subtitle": None,
+            "text": "Muestra los valores de pH",
+            "type": "Graph",
+            "resolution": {"pH": "1H"},
+        },
+        {
+            "plot": plot_flat_daily_ph,
+            "args": ("partitions", "df_daily_ph", "sensor_list"),
+            "title": None,
+            "subtitle": "Variación de pH",
+            "text": "Muestra la variación del pH. Ideal no variar más de 2 desviaciones estandard.",
+            "type": "Graph",
+            "resolution": {"pH": "1H"},
+        },
+        {
+            "plot": plot_hourly_ph,
+            "args": ("df_ph_average", "sensor_list"),
+            "title": None,
+            "subtitle": "Variación de pH cada hora",
+            "text": "Muestra cuantos puntos varía el pH cada hora, no debe superar 2 desviaciones estandar.",
+            "type": "Graph",
+            "resolution": {"pH": "1H"},
+        },
+        {
+            "plot": plot_average_ph,
+            "args": ("df_ph_average",),
+            "title": None,
+            "subtitle": "Promedio de pH general",
+            "text": "Este es el valor promedio de pH durante todo el tiempo medido.",
+            "type": "Graph",
+            "resolution": {"pH": "1H"},
+        },
+        {
+            "plot": plot_ideal_ph,
+            "args": ("df_ph", "houses_list"),
+            "title": None,
+            "subtitle": "Tiempo (%) del pH dentro de los niveles optimos",
+            "text": "El pH está entre 4 y 5 más del 88% del tiempo.",
+            "type": "Graph",
+            "resolution": {"pH": "1H"},
+        },
+        {
+            "plot": plot_daily_water_consumption,
+            "args": ("df_water",),
+            "title": "Consumo de Citroquim y Agua",
+            "subtitle": "Diario",
+            "text": "Entrega los valores de consumo de Citroquim cada día en Litros",
+            "type": "Graph",
+            "resolution": {"water": "1D"},
+        },
+        {
+            "plot": plot_weekly_water_consumption,
+            "args": ("df_week_water",),
+            "title": None,
+            "subtitle": "Semanal",
+            "text": "Entrega los valores de consumo de Citroquim cada semana en litros",
+            "type": "Graph",
+            "resolution": {"water": "1D"},
+        },
+        {
+            "plot": plot_monthly_citroquim_consumption,
+            "args": ("df_month_water",),
+            "title": None,
+            "subtitle": "Mensual",
+            "text": "La gráfica muestra el consumo total de Citroquim en litros mes a mes.",
+            "type": "Graph",
+            "resolution": {"water": "1D"},
+        },
+        {
+            "plot": plot_monthly_water_consumption,
+            "args": ("df_month_water",),
+            "title": None,
+            "subtitle": None,
+            "text": "La gráfica muestra el consumo total de agua en litros mes a mes.",
+            "type": "Graph",
+            "resolution": {"water": "1D"},
+        },
+    ],
+}
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    report_main(REPORT, PARAMETERS)
\ No newline at end of file
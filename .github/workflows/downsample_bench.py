@@ -0,0 +1,121 @@
+# Downsampling benchmark of the plot traces
+
+# Draws three months of minute readings of a sensor with more and more
+# outages, each one a gap that splits the trace in runs, and compares the
+# points and HTML size of the figure before and after downsampling. It
+# fails when a downsampled trace keeps more than its budget of points
+# beyond the first and last point of each run and the NaN that breaks each
+# gap.
+
+# Python packages
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from downsampling import MODES, downsample_indices
+
+# Outages of the benchmark traces
+GAPS = (0, 10, 100, 1000)
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Downsample Benchmark",
+        description="Compare the trace size before and after downsampling",
+    )
+
+    config_parser.add_argument(
+        "-p",
+        "--points",
+        type=int,
+        default=1000,
+        help="Downsampling points per trace",
+    )
+
+    config_parser.add_argument(
+        "-d",
+        "--days",
+        type=int,
+        default=90,
+        help="Days of minute readings of the trace",
+    )
+
+    return config_parser.parse_args()
+
+
+def trace(days: int, gaps: int) -> pd.Series:
+    """Minute readings with outages of a random hour to a day
+    Args:
+        days (int): Days of readings.
+        gaps (int): Outages, set to NaN.
+    Returns:
+        pd.Series: Values indexed by time.
+    """
+
+    rng = np.random.default_rng(gaps)
+    times = pd.date_range("2021-01-01", periods=days * 1440, freq="T")
+    values = 6 + np.sin(np.arange(len(times)) * 2 * np.pi / 1440)
+    values += rng.normal(0, 0.1, len(times))
+    for start in rng.integers(0, len(times), gaps):
+        values[start : start + rng.integers(60, 1440)] = np.nan
+
+    return pd.Series(values, index=times)
+
+
+def html_bytes(x, y) -> int:
+    """Size of a one trace figure in a report
+    Args:
+        x (array-like): x values.
+        y (array-like): y values.
+    Returns:
+        int: HTML bytes without plotly.js.
+    """
+
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Scatter(x=x, y=y, mode="lines", connectgaps=False))
+
+    return len(fig.to_html(include_plotlyjs=False, full_html=False))
+
+
+def main():
+
+    args = parser_config()
+
+    failed = False
+    print(
+        f"{'mode':<8}{'gaps':>6}{'runs':>6}{'points':>10}{'kept':>8}"
+        f"{'MB before':>11}{'MB after':>10}{'ms':>8}"
+    )
+    for gaps in GAPS:
+        values = trace(args.days, gaps)
+        y = values.to_numpy()
+        x = values.index.to_numpy().view("int64").astype(float)
+        valid = ~np.isnan(y)
+        runs = np.count_nonzero(valid & ~np.concatenate([[False], valid[:-1]]))
+        before = html_bytes(values.index, y)
+
+        for mode in MODES:
+            started = time.perf_counter()
+            kept = downsample_indices(x, y, args.points, mode)
+            ms = (time.perf_counter() - started) * 1000
+            after = html_bytes(values.index[kept], y[kept])
+
+            # First and last point of every run, and the NaN of every gap
+            allowed = max(args.points, 3 * runs)
+            failed = failed or len(kept) > allowed
+            print(
+                f"{mode:<8}{gaps:>6}{runs:>6}{len(y):>10}{len(kept):>8}"
+                f"{before / 2**20:>11.2f}{after / 2**20:>10.2f}{ms:>8.0f}"
+                f"  {'over the budget' if len(kept) > allowed else ''}"
+            )
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,173 @@
+# Optional downsampling of long plot traces
+
+# Python packages
+import numpy as np
+import pandas as pd
+
+MODES = ("lttb", "minmax")
+
+# Set by configure_downsampling from the report parameters
+DOWNSAMPLE = None
+
+
+def configure_downsampling(params: dict = None):
+    """Enable trace downsampling from the "downsample" report parameters
+    Args:
+        params (dict): mode exp('lttb', 'minmax') and points per trace.
+    """
+
+    global DOWNSAMPLE
+
+    if params and params.get("mode", "lttb") not in MODES:
+        raise ValueError(f"Unknown downsample mode: {params['mode']}")
+
+    DOWNSAMPLE = (
+        {"mode": params.get("mode", "lttb"), "points": int(params["points"])}
+        if params
+        else None
+    )
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """Largest triangle three buckets selection
+    Args:
+        x (np.ndarray): float x values, increasing.
+        y (np.ndarray): float y values without NaN.
+        points (int): Points to keep.
+    Returns:
+        np.ndarray: Positions of the kept points.
+    """
+
+    size = len(x)
+    if points >= size:
+        return np.arange(size)
+    if points < 3:
+        return np.array([0, size - 1])
+
+    # points - 2 buckets between the first and the last point
+    edges = np.linspace(1, size - 1, points - 1).astype(int)
+    kept = np.empty(points, dtype=int)
+    kept[0], kept[-1] = 0, size - 1
+
+    a = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else size
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        kept[i + 1] = a
+
+    return kept
+
+
+def minmax_indices(y: np.ndarray, points: int) -> np.ndarray:
+    """Minimum and maximum of each bucket, keeps every spike
+    Args:
+        y (np.ndarray): float y values without NaN.
+        points (int): Points to keep.
+    Returns:
+        np.ndarray: Positions of the kept points.
+    """
+
+    size = len(y)
+    if points >= size:
+        return np.arange(size)
+    if points < 4:
+        return np.array([0, size - 1])
+
+    edges = np.linspace(0, size, (points - 2) // 2 + 1).astype(int)
+    kept = [[0, size - 1]]
+    for start, end in zip(edges[:-1], edges[1:]):
+        kept.append(
+            start + np.array([y[start:end].argmin(), y[start:end].argmax()])
+        )
+
+    return np.unique(np.concatenate(kept))
+
+
+def downsample_indices(
+    x: np.ndarray, y: np.ndarray, points: int, mode: str = "lttb"
+) -> np.ndarray:
+    """Positions to keep so the trace has about points points
+
+    Runs of valid values are downsampled separately. Each run keeps its
+    first and last point and the first NaN of the gap after it, so
+    connectgaps=False still breaks the line there, and the rest of the
+    points are split between the runs in proportion to their length. Only
+    a trace with more runs than points keeps more than points, and one
+    whose valid values fit in points only loses the rest of each gap.
+    Args:
+        x (np.ndarray): float x values, increasing.
+        y (np.ndarray): float y values.
+        points (int): Target number of points.
+        mode (str): Downsampling mode exp('lttb', 'minmax')
+    Returns:
+        np.ndarray: Sorted positions of the kept points.
+    """
+
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(y) <= points or not len(valid):
+        return np.arange(len(y))
+
+    breaks = np.flatnonzero(np.diff(valid) > 1)
+    starts = np.concatenate([[valid[0]], valid[breaks + 1]])
+    ends = np.concatenate([valid[breaks], [valid[-1]]]) + 1
+    gaps = ends[ends < len(y)]
+    if len(valid) + len(gaps) <= points:
+        return np.union1d(valid, gaps)
+
+    # Largest remainder split of the points left after the reserved ones
+    reserved = np.minimum(ends - starts, 2)
+    inner = ends - starts - reserved
+    spare = max(points - reserved.sum() - len(gaps), 0)
+    quota = spare * inner / max(inner.sum(), 1)
+    shares = np.floor(quota).astype(int)
+    shares[np.argsort(shares - quota)[: spare - shares.sum()]] += 1
+    shares = reserved + np.minimum(shares, inner)
+
+    kept = []
+    for start, end, share in zip(starts, ends, shares):
+        if mode == "minmax":
+            positions = minmax_indices(y[start:end], share)
+        else:
+            positions = lttb_indices(x[start:end], y[start:end], share)
+        kept.append(start + positions)
+        if end < len(y):
+            kept.append([end])
+
+    return np.concatenate(kept)
+
+
+def thin_line(x, y) -> dict:
+    """x and y of a trace, downsampled if configure_downsampling enabled it
+
+    The result is meant to be unpacked in go.Scatter(**thin_line(x, y)).
+    Args:
+        x (pd.Series): x values in plot order.
+        y (pd.Series): y values.
+    Returns:
+        dict: x and y of the trace.
+    """
+
+    if DOWNSAMPLE is None or len(x) <= DOWNSAMPLE["points"]:
+        return {"x": x, "y": y}
+
+    x, y = pd.Series(x), pd.Series(y)
+    x_values = x.to_numpy()
+    if np.issubdtype(x_values.dtype, np.datetime64):
+        x_values = x_values.view("int64")
+
+    positions = downsample_indices(
+        x_values.astype(float),
+        y.to_numpy(dtype=float),
+        DOWNSAMPLE["points"],
+        DOWNSAMPLE["mode"],
+    )
+
+    return {"x": x.iloc[positions], "y": y.iloc[positions]}
\ No newline at end of file
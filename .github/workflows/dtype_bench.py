@@ -0,0 +1,143 @@
+# Memory benchmark of the compact report frame
+
+# Builds the processed pH frame of many sensors over a year of hourly
+# readings with report_engine.load_source, as it is stored now and with
+# float32 values, and compares its memory with the same rows laid out as
+# process_data did before: object labels, int64 calendar columns and the
+# four thresholds copied onto every row. It fails when the compact frame
+# is not smaller or holds other values.
+
+# Python packages
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from golden_check import FIXTURES, TIMEZONE
+
+SOURCE = {"type_value": "pH", "house": "G05", "sensor": "pH"}
+
+PARAMS = {
+    "thresholds": {},
+    "min_standard": 5.5,
+    "max_standard": 6.5,
+    "min_alert": 5,
+    "max_alert": 7,
+}
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Dtype Benchmark",
+        description="Compare the memory of the compact pH frame",
+    )
+
+    config_parser.add_argument(
+        "-s",
+        "--sensors",
+        type=int,
+        default=100,
+        help="pH sensors of the frame",
+    )
+
+    config_parser.add_argument(
+        "-d",
+        "--days",
+        type=int,
+        default=365,
+        help="Days of hourly readings per sensor",
+    )
+
+    return config_parser.parse_args()
+
+
+def old_layout(df):
+    """The compact frame with the dtypes process_data used to give it
+    Args:
+        df (pd.DataFrame): load_source result.
+    Returns:
+        pd.DataFrame: Same rows with object labels, int64 calendar columns
+            and the thresholds as columns.
+    """
+
+    from frame_dtypes import LABELS
+
+    df = df.copy()
+    for column in LABELS:
+        if column in df:
+            df[column] = df[column].astype(object)
+    for column in ("hour", "semana", "mes", "year"):
+        if column in df:
+            df[column] = df[column].astype("int64")
+    for limit, value in PARAMS.items():
+        if limit != "thresholds":
+            df[limit] = float(value)
+
+    return df
+
+
+def mib(df, deep: bool) -> float:
+    return df.memory_usage(deep=deep).sum() / 2**20
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import numpy as np
+    import pandas as pd
+    from funciones_ioa import ioa
+
+    from frame_dtypes import configure_dtypes
+    from report_engine import load_source
+    from sensor_fetch import to_long_frame
+
+    ini_date = datetime(2021, 1, 1)
+    end_date = ini_date + pd.Timedelta(days=args.days)
+    frames = [
+        ioa.get_sensor_values(f"pH-{i}", ini_date, end_date)
+        for i in range(args.sensors)
+    ]
+    columns = [f"pH {i}" for i in range(args.sensors)]
+
+    layouts = {}
+    for values in ("float64", "float32"):
+        configure_dtypes({"values": values})
+        layouts[values] = load_source(
+            SOURCE,
+            PARAMS,
+            ini_date,
+            end_date,
+            df=to_long_frame(frames, columns),
+        )
+    configure_dtypes()
+    layouts = {"before": old_layout(layouts["float64"]), **layouts}
+
+    print(f"{'layout':<10}{'rows':>10}{'shallow MiB':>13}{'deep MiB':>10}")
+    problems = []
+    for name, df in layouts.items():
+        if name == "before":
+            before = mib(df, True)
+        elif not np.allclose(df["pH"], layouts["before"]["pH"], rtol=1e-6):
+            problems.append(f"{name} holds other values")
+        elif mib(df, True) >= before:
+            problems.append(f"{name} not smaller")
+        print(
+            f"{name:<10}{len(df):>10}{mib(df, False):>13.1f}"
+            f"{mib(df, True):>10.1f}"
+        )
+
+    if problems:
+        print("; ".join(problems))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,118 @@
+# Fetch benchmark of the sensor engine
+
+# Fetches many sensors from the fake sensor API with a fixed latency per
+# call, once one call at a time, once over the pool of sensor_fetch and
+# once with its asyncio variant, and fails when the concurrent fetches do
+# not return the same readings or are not at least speedup times faster,
+# so a change that serializes the calls again shows up here instead of in
+# the run time of the reports.
+
+# Python packages
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+from golden_check import FIXTURES, TIMEZONE
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Fetch Benchmark",
+        description="Time the concurrent sensor fetch against a serial one",
+    )
+
+    config_parser.add_argument(
+        "-s",
+        "--sensors",
+        type=int,
+        default=40,
+        help="Sensors fetched",
+    )
+
+    config_parser.add_argument(
+        "-l",
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Seconds of each fake get_sensor_values call",
+    )
+
+    config_parser.add_argument(
+        "-x",
+        "--speedup",
+        type=float,
+        default=3,
+        help="Smallest speedup of the pool over one call at a time",
+    )
+
+    return config_parser.parse_args()
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures, before
+    # sensor_fetch imports funciones_ioa
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import pandas as pd
+    from funciones_ioa import ioa
+
+    import sensor_fetch
+
+    ioa.LATENCY = args.latency
+    df_sensors = pd.DataFrame(
+        {
+            "raw_id": [f"water-{i}" for i in range(args.sensors)],
+            "sensor": [f"Planta|Sensor {i}" for i in range(args.sensors)],
+        }
+    )
+    ini_date, end_date = datetime(2021, 7, 1), datetime(2021, 7, 15)
+    calls = args.sensors * len(
+        sensor_fetch.split_range(ini_date, end_date, sensor_fetch.CHUNK)
+    )
+
+    fetches = {
+        "serial": lambda: sensor_fetch.fetch_sensor_data(
+            df_sensors, ini_date, end_date, max_workers=1
+        ),
+        "pool": lambda: sensor_fetch.fetch_sensor_data(
+            df_sensors, ini_date, end_date
+        ),
+        "asyncio": lambda: asyncio.run(
+            sensor_fetch.fetch_sensor_data_async(
+                df_sensors, ini_date, end_date
+            )
+        ),
+    }
+
+    print(f"{'fetch':<10}{'calls':>8}{'seconds':>10}{'speedup':>10}")
+    problems = []
+    for name, fetch in fetches.items():
+        started = time.perf_counter()
+        df = fetch()
+        seconds = time.perf_counter() - started
+        if name == "serial":
+            serial, expected = seconds, df
+        elif not df.equals(expected):
+            problems.append(f"{name} returns other readings")
+        elif serial / seconds < args.speedup:
+            problems.append(
+                f"{name} less than {args.speedup:.1f} times faster"
+            )
+        print(f"{name:<10}{calls:>8}{seconds:>10.2f}{serial / seconds:>10.1f}")
+
+    if problems:
+        print("; ".join(problems))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
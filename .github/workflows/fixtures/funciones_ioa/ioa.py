@@ -0,0 +1,142 @@
+# Fake sensor API for the report checks
+
+# Stands in for the private funciones_ioa package so the checks run
+# without access to the platform. The devices cover the sources of the
+# six client reports and every value only depends on the sensor and its
+# bucket, so a window fetched whole, in chunks or twice returns the same
+# rows. Buckets are local wall-clock times in the TZ zone, returned as
+# epoch milliseconds like the API does.
+
+# Python packages
+import os
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Seconds every get_sensor_values call waits, see fetch_bench
+LATENCY = float(os.environ.get("FAKE_IOA_LATENCY", "0"))
+
+FREQUENCIES = {"": "T", "1H": "H", "1D": "D"}
+
+# sensorName, barnName, farmName and kind of the devices by type_value
+DEVICES = {
+    "water": [
+        ("Planta|Inhisalm-Pluma-Total Hora", "Planta|1", "Planta", "water"),
+        (
+            "Planta|Inhisalm salida prensa carne y hueso Total Hora",
+            "Planta|2",
+            "Planta",
+            "water",
+        ),
+        (
+            "Planta|Consumo Agua - Total Minuto Galones",
+            "Planta|La Loteria",
+            "La Loteria",
+            "water",
+        ),
+        (
+            "Planta|Citroquim - Total Minuto mL",
+            "Planta|La Loteria",
+            "La Loteria",
+            "water",
+        ),
+    ],
+    "pH": [
+        ("pH1", "Granja|La Loteria", "La Loteria", "pH tanque"),
+        ("pH2", "Granja|G05", "FARM", "pH"),
+        ("pH3", "Granja|Planta", "Huevos Oro", "pH"),
+    ],
+}
+
+
+def _get_devices_in_company_mongo(company: str, kind: str) -> pd.DataFrame:
+
+    rows = DEVICES[kind]
+
+    return pd.DataFrame(
+        {
+            "sensorName": [row[0] for row in rows],
+            "barnName": [row[1] for row in rows],
+            "farmName": [row[2] for row in rows],
+            "kind": [row[3] for row in rows],
+            "raw_id": [f"{kind}-{i}" for i in range(len(rows))],
+        }
+    )
+
+
+def uniform(raw_id: str, buckets: pd.DatetimeIndex) -> np.ndarray:
+    """Pseudo random numbers in [0, 1) keyed by sensor and bucket
+    Args:
+        raw_id (str): Sensor id.
+        buckets (pd.DatetimeIndex): Local bucket starts.
+    Returns:
+        np.ndarray: One number per bucket.
+    """
+
+    seed = np.uint64(zlib.crc32(raw_id.encode()) << 32)
+    x = (buckets.asi8 // 60_000_000_000).astype(np.uint64) + seed
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    x = x ^ (x >> np.uint64(31))
+
+    return (x >> np.uint64(11)) / float(2**53)
+
+
+def bucket_values(raw_id: str, buckets: pd.DatetimeIndex) -> np.ndarray:
+    """Values of the hourly or minute buckets of a sensor
+    Args:
+        raw_id (str): Sensor id, pH ones get pH values.
+        buckets (pd.DatetimeIndex): Local bucket starts.
+    Returns:
+        np.ndarray: Values rounded to the sensor precision.
+    """
+
+    u = uniform(raw_id, buckets)
+    daily = np.sin(2 * np.pi * buckets.hour.to_numpy() / 24)
+
+    if raw_id.startswith("pH"):
+        return np.round(5.75 + 0.35 * daily + 0.8 * (u - 0.5), 3)
+
+    # Exponential consumption with a rare spike above the outlier rules
+    values = -8 * np.log1p(-u) * (1.2 + daily)
+    values[u > 0.995] *= 30
+
+    return np.round(values, 3)
+
+
+def get_sensor_values(
+    raw_id: str, ini_date, end_date, period: str = "1H"
+) -> pd.DataFrame:
+
+    if LATENCY:
+        time.sleep(LATENCY)
+
+    freq = FREQUENCIES[period]
+    end_date = pd.Timestamp(end_date)
+    buckets = pd.date_range(
+        pd.Timestamp(ini_date).ceil(freq), end_date, freq=freq
+    )
+    buckets = buckets[buckets < end_date]
+
+    if period == "1D" and len(buckets):
+        # Day buckets aggregate the hourly ones of each local day, the
+        # last one only up to end_date
+        hours = pd.date_range(buckets[0], end_date, freq="H")
+        hours = hours[hours < end_date]
+        hourly = pd.Series(bucket_values(raw_id, hours), index=hours)
+        daily = hourly.groupby(hours.floor("D"))
+        how = "mean" if raw_id.startswith("pH") else "sum"
+        values = np.round(daily.agg(how).reindex(buckets).to_numpy(), 3)
+    else:
+        values = bucket_values(raw_id, buckets)
+
+    stamps = buckets.tz_localize(os.environ.get("TZ", "America/Bogota"))
+
+    return pd.DataFrame(
+        {
+            "timestamp": stamps.asi8 // 1_000_000,
+            "value": values.astype(object),
+        }
+    )
\ No newline at end of file
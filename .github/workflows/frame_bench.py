@@ -0,0 +1,137 @@
+# Frame builder benchmark of the sensor fetch
+
+# Builds the readings of more and more sensors over a year of hourly
+# values from the fake sensor API, once with the per-sensor pd.concat loop
+# the report scripts had in get_sensor_data and once with the single pass
+# of sensor_fetch.to_long_frame, and compares wall time and tracemalloc
+# peak. It fails when the single pass loses a reading, or is not faster
+# and smaller than the loop for the most sensors.
+
+# Python packages
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from golden_check import FIXTURES, TIMEZONE
+
+SENSORS = (1, 10, 100)
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Frame Benchmark",
+        description="Compare the single pass frame builder with pd.concat",
+    )
+
+    config_parser.add_argument(
+        "-d",
+        "--days",
+        type=int,
+        default=365,
+        help="Days of hourly readings per sensor",
+    )
+
+    return config_parser.parse_args()
+
+
+def concat_frame(frames: list, columns: list):
+    """Readings as the get_sensor_data loop accumulated them
+    Args:
+        frames (list): get_sensor_values result per sensor.
+        columns (list): Sensor name per frame.
+    Returns:
+        pd.DataFrame: timestamp and one value column per sensor.
+    """
+
+    import pandas as pd
+
+    df = pd.DataFrame()
+    for frame, column in zip(frames, columns):
+        df = pd.concat([df, frame.rename(columns={"value": column})])
+
+    return df
+
+
+def measure(build, *args) -> tuple:
+    """Time a build, then run it again to trace its memory
+    Args:
+        build (Callable): Frame builder.
+        args: Its arguments.
+    Returns:
+        tuple: Result, seconds and peak MiB.
+    """
+
+    started = time.perf_counter()
+    build(*args)
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    result = build(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+
+    return result, seconds, peak
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures, before
+    # sensor_fetch imports funciones_ioa
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import pandas as pd
+    from funciones_ioa import ioa
+
+    from sensor_fetch import to_long_frame
+
+    ini_date = datetime(2021, 1, 1)
+    end_date = ini_date + pd.Timedelta(days=args.days)
+
+    failed = False
+    print(
+        f"{'sensors':<10}{'rows':>10}{'concat s':>10}{'MiB':>8}"
+        f"{'single s':>10}{'MiB':>8}"
+    )
+    for sensors in SENSORS:
+        columns = [f"Sensor {i}" for i in range(sensors)]
+        frames = [
+            ioa.get_sensor_values(f"water-{i}", ini_date, end_date)
+            for i in range(sensors)
+        ]
+
+        old, old_seconds, old_peak = measure(concat_frame, frames, columns)
+        new, new_seconds, new_peak = measure(to_long_frame, frames, columns)
+
+        problems = []
+        for column in columns:
+            if not (
+                old[column].dropna().astype(float).to_numpy()
+                == new.loc[new["Sensor"] == column, "value"].to_numpy()
+            ).all():
+                problems.append(f"{column} readings differ")
+                break
+        if sensors == SENSORS[-1] and (
+            new_seconds >= old_seconds or new_peak >= old_peak
+        ):
+            problems.append("not faster and smaller than pd.concat")
+        failed = failed or bool(problems)
+        print(
+            f"{sensors:<10}{len(new):>10}{old_seconds:>10.2f}"
+            f"{old_peak:>8.1f}{new_seconds:>10.2f}{new_peak:>8.1f}"
+            f"  {'; '.join(problems)}"
+        )
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,83 @@
+# Compact dtypes of the long-format report frames
+
+# Python packages
+import numpy as np
+import pandas as pd
+
+# Label columns repeated on every row, stored as ordered categoricals.
+# Group by them with observed=True, or unobserved label combinations
+# become groups; being ordered keeps those groups sorted by label.
+LABELS = (
+    "Sensor",
+    "House",
+    "sensor",
+    "sensors",
+    "programa",
+    "month",
+    "date",
+)
+
+VALUE_DTYPES = ("float64", "float32")
+
+# Set by configure_dtypes from the report parameters
+VALUES = "float64"
+
+
+def configure_dtypes(params: dict = None):
+    """Select the dtype of the sensor values from the "dtypes" parameters
+
+    float32 halves the value column, at about 7 significant digits, which
+    is enough for pH and flow readings but changes the last digits shown
+    in the hover text.
+    Args:
+        params (dict): values exp('float64', 'float32')
+    """
+
+    global VALUES
+
+    values = (params or {}).get("values", "float64")
+    if values not in VALUE_DTYPES:
+        raise ValueError(f"Unknown values dtype: {values}")
+
+    VALUES = values
+
+
+def to_values(values: np.ndarray) -> tuple:
+    """Coerce raw sensor values to the VALUES dtype
+
+    ioa returns the values as objects. They are converted in one
+    pd.to_numeric call, and values that are not numbers become NaN instead
+    of failing the report.
+    Args:
+        values (np.ndarray): Raw values of the readings.
+    Returns:
+        tuple: VALUES array, count of readings converted from another dtype
+            and count of readings that were not numbers.
+    """
+
+    if values.dtype.kind in "fiub":
+        return values.astype(VALUES, copy=False), 0, 0
+
+    numeric = pd.to_numeric(values, errors="coerce").astype(VALUES, copy=False)
+    missing = np.isnan(numeric)
+    invalid = int(np.count_nonzero(pd.notna(values[missing])))
+
+    return numeric, len(values) - int(np.count_nonzero(missing)), invalid
+
+
+def compact_frame(df: pd.DataFrame, value_column: str) -> pd.DataFrame:
+    """Store the label columns as categoricals and the values as VALUES
+    Args:
+        df (pd.DataFrame): Long frame from melt_values or process_ph.
+        value_column (str): Name of the value column exp(pH, water)
+    Returns:
+        pd.DataFrame: df with compact columns.
+    """
+
+    for column in LABELS:
+        if column in df and df[column].dtype == object:
+            df[column] = pd.Categorical(df[column], ordered=True)
+
+    df[value_column] = df[value_column].astype(VALUES)
+
+    return df
\ No newline at end of file
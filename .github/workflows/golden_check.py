@@ -0,0 +1,225 @@
+# Regression check of the client reports
+
+# Builds every client report from the fixture parameters against the fake
+# sensor API in fixtures/funciones_ioa, with the host zone fixed, and
+# compares the sections of each HTML report (titles, texts, tables and
+# figure JSON) with fixtures/golden. The golden files were generated from
+# the report scripts before they moved to report_engine; --update rewrites
+# them after an intended change of the output.
+
+# Python packages
+import argparse
+import hashlib
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+FIXTURES = os.path.join(DIRECTORY, "fixtures")
+
+CLIENTS = (
+    "don_pollo",
+    "acondesa",
+    "agrinsa",
+    "nutriavicola",
+    "refinal",
+    "CERVALLE_informe",
+)
+
+# Host zone of the report runs, see report_time.decode_time
+TIMEZONE = "America/Bogota"
+
+# Relative tolerance of the figure numbers, sums may be reordered
+TOLERANCE = 1e-9
+
+SECTION = re.compile(
+    r"<h3><strong> (?P<title>.*?) </strong></h3>"
+    r"|<h4><strong> (?P<subtitle>.*?) </strong></h4>"
+    r'|<h5 class="text"> (?P<text>.*?) </h5>'
+    r"|(?P<table><table.*?</table>)"
+    r'|Plotly\.newPlot\(\s*"[^"]+",\s*(?P<figure>)',
+    re.S,
+)
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Golden Check",
+        description="Compare the client reports with their golden output",
+    )
+
+    config_parser.add_argument(
+        "clients",
+        nargs="*",
+        default=CLIENTS,
+        help="Client reports to check, all by default",
+    )
+
+    config_parser.add_argument(
+        "-u",
+        "--update",
+        action="store_true",
+        help="Rewrite the golden files with the current output",
+    )
+
+    return config_parser.parse_args()
+
+
+def fixture_env() -> dict:
+    """Environment of a report run on the fixtures
+    Returns:
+        dict: os.environ with the fake API first on the path and TZ set.
+    """
+
+    env = dict(os.environ, TZ=TIMEZONE)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [FIXTURES, DIRECTORY] + env.get("PYTHONPATH", "").split(os.pathsep)
+    ).rstrip(os.pathsep)
+
+    return env
+
+
+def report_sections(html: str) -> list:
+    """Sections of a report in the order they are written
+    Args:
+        html (str): Report HTML from report_writer.ReportWriter.
+    Returns:
+        list: (kind, value) pairs, kind exp(title, subtitle, text, table,
+            figure). Figures are the data, layout and config JSON with the
+            template replaced by its digest.
+    """
+
+    decoder = json.JSONDecoder()
+    sections = []
+    for match in SECTION.finditer(html):
+        kind = match.lastgroup
+        if kind != "figure":
+            sections.append([kind, match.group(kind)])
+            continue
+
+        figure, end = {}, match.end()
+        for key in ("data", "layout", "config"):
+            figure[key], end = decoder.raw_decode(html, end)
+            end = re.compile(r"\s*,?\s*").match(html, end).end()
+        template = figure["layout"].pop("template", None)
+        if template is not None:
+            figure["layout"]["template"] = hashlib.sha1(
+                json.dumps(template, sort_keys=True).encode()
+            ).hexdigest()
+        sections.append([kind, figure])
+
+    return sections
+
+
+def build_sections(client: str) -> list:
+    """Run a client report on the fixtures
+    Args:
+        client (str): Report script name.
+    Returns:
+        list: report_sections of the report.
+    """
+
+    parameters = os.path.join(FIXTURES, "parameters", client + ".json")
+    with tempfile.TemporaryDirectory() as output:
+        run = subprocess.run(
+            [
+                sys.executable,
+                os.path.join(DIRECTORY, client + ".py"),
+                "-pf",
+                parameters,
+            ],
+            cwd=output,
+            env=fixture_env(),
+            capture_output=True,
+            text=True,
+        )
+        if run.returncode != 0:
+            raise RuntimeError(f"{client} failed:\n{run.stderr}")
+
+        reports = [
+            name for name in os.listdir(output) if name.endswith(".html")
+        ]
+        with open(os.path.join(output, reports[0]), encoding="utf-8") as file:
+            return report_sections(file.read())
+
+
+def write_golden(path: str, sections: list):
+    """Write the sections of a report one per line
+    Args:
+        path (str): Golden file.
+        sections (list): report_sections of the report.
+    """
+
+    lines = [json.dumps(section, ensure_ascii=False) for section in sections]
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[\n" + ",\n".join(lines) + "\n]\n")
+
+
+def differences(golden, current, path: str = "") -> list:
+    """Paths where the current output leaves the golden one
+    Args:
+        golden: Golden JSON value.
+        current: Current JSON value.
+        path (str): Path of the values, for the messages.
+    Returns:
+        list: One message per difference.
+    """
+
+    numbers = (int, float)
+    if isinstance(golden, float) or isinstance(current, float):
+        if isinstance(golden, numbers) and isinstance(current, numbers):
+            if math.isclose(golden, current, rel_tol=TOLERANCE):
+                return []
+    if isinstance(golden, dict) and isinstance(current, dict):
+        messages = [
+            f"{path}.{key}: missing or added"
+            for key in golden.keys() ^ current.keys()
+        ]
+        for key in golden.keys() & current.keys():
+            messages += differences(golden[key], current[key], f"{path}.{key}")
+        return messages
+    if isinstance(golden, list) and isinstance(current, list):
+        if len(golden) != len(current):
+            return [f"{path}: {len(golden)} items, now {len(current)}"]
+        messages = []
+        for i, (old, new) in enumerate(zip(golden, current)):
+            messages += differences(old, new, f"{path}[{i}]")
+        return messages
+    if golden != current:
+        return [f"{path}: {str(golden)[:60]!r}, now {str(current)[:60]!r}"]
+
+    return []
+
+
+def main():
+
+    args = parser_config()
+
+    failed = False
+    print(f"{'report':<20}{'sections':>9}  result")
+    for client in args.clients:
+        golden_file = os.path.join(FIXTURES, "golden", client + ".json")
+        sections = build_sections(client)
+        if args.update:
+            write_golden(golden_file, sections)
+            print(f"{client:<20}{len(sections):>9}  updated")
+            continue
+
+        with open(golden_file, encoding="utf-8") as file:
+            messages = differences(json.load(file), sections)
+        failed = failed or bool(messages)
+        print(f"{client:<20}{len(sections):>9}  {len(messages)} differences")
+        for message in messages[:10]:
+            print(f"    {message}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+# Headless check of the batch reports
+
+# Runs report_batch over the fixture parameters of the six clients with
+# plotly.io.show replaced by a function that raises, so a fig.show() left
+# in a plot builder fails the batch here instead of opening a browser, or
+# failing for want of a renderer, on the machine that schedules the
+# reports.
+
+# Python packages
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from golden_check import CLIENTS, FIXTURES, TIMEZONE
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Headless Check",
+        description="Build the client reports in a batch with no renderer",
+    )
+
+    config_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=2,
+        help="Reports built at the same time",
+    )
+
+    return config_parser.parse_args()
+
+
+def no_show(*args, **kwargs):
+    raise RuntimeError("fig.show() called while building a report")
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures, before the
+    # report modules import funciones_ioa
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import plotly.io
+
+    from report_batch import print_summary, run_batch
+
+    # Workers are forked so they inherit the stub
+    plotly.io.show = no_show
+    multiprocessing.set_start_method("fork", force=True)
+
+    parameters_files = [
+        os.path.join(FIXTURES, "parameters", client + ".json")
+        for client in CLIENTS
+    ]
+    started = time.perf_counter()
+    directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as output:
+        os.chdir(output)
+        try:
+            reports, stats = run_batch(parameters_files, args.workers)
+        finally:
+            os.chdir(directory)
+    print_summary(reports, stats, time.perf_counter() - started)
+
+    if any("error" in report for report in reports):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
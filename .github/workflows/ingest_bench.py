@@ -0,0 +1,197 @@
+# Ingestion memory benchmark of the sensor readings
+
+# Turns the hourly readings of many sensors over a year of the fake sensor
+# API into report rows, once through the wide frame with one column per
+# sensor that melt_values used to stack and once through the long frame of
+# sensor_fetch.to_long_frame. Each way runs in its own process, so its peak
+# RSS is not hidden by the other one. It fails when the rows differ or the
+# long ingestion does not use less memory.
+
+# Python packages
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+from golden_check import FIXTURES, TIMEZONE
+
+METHODS = ("wide", "long")
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Ingest Benchmark",
+        description="Compare the peak RSS of wide and long ingestion",
+    )
+
+    config_parser.add_argument(
+        "-s",
+        "--sensors",
+        type=int,
+        default=100,
+        help="Sensors fetched",
+    )
+
+    config_parser.add_argument(
+        "-d",
+        "--days",
+        type=int,
+        default=365,
+        help="Days of hourly readings per sensor",
+    )
+
+    config_parser.add_argument(
+        "-m",
+        "--method",
+        choices=METHODS,
+        help="Run one ingestion and print its figures, both if missing",
+    )
+
+    return config_parser.parse_args()
+
+
+def wide_rows(frames: list, columns: list):
+    """Report rows through the wide frame, as before the long ingestion
+    Args:
+        frames (list): get_sensor_values result per sensor.
+        columns (list): Sensor name per frame.
+    Returns:
+        pd.DataFrame: time, Sensor and water per reading.
+    """
+
+    import numpy as np
+    import pandas as pd
+
+    from report_time import add_calendar_columns, decode_time
+
+    # to_wide_frame
+    arrays = [frame["value"].to_numpy() for frame in frames]
+    bounds = np.concatenate([[0], np.cumsum([len(x) for x in arrays])])
+    values = np.full((bounds[-1], len(columns)), np.nan, dtype=object)
+    for i, array in enumerate(arrays):
+        values[bounds[i] : bounds[i + 1], i] = array
+    df = pd.DataFrame(values, columns=columns)
+    df.insert(
+        0,
+        "timestamp",
+        np.concatenate([frame["timestamp"].to_numpy() for frame in frames]),
+    )
+
+    # melt_values
+    df["time"] = decode_time(df.timestamp)
+    df.set_index("time", inplace=True)
+    df = (
+        pd.DataFrame(df.drop(columns=["timestamp"]).stack())
+        .reset_index()
+        .rename(columns={0: "water", "level_1": "Sensor"})
+    )
+    df["water"] = pd.to_numeric(df["water"])
+    add_calendar_columns(df, ["date", "hour"])
+
+    return df
+
+
+def long_rows(frames: list, columns: list):
+    """Report rows through to_long_frame, as load_source builds them"""
+
+    from report_engine import melt_values
+    from sensor_fetch import to_long_frame
+
+    return melt_values(to_long_frame(frames, columns), "water")
+
+
+def ingest(method: str, sensors: int, days: int) -> dict:
+    """Fetch the readings and build the rows one way
+    Args:
+        method (str): One of METHODS.
+        sensors (int): Sensors fetched.
+        days (int): Days of hourly readings.
+    Returns:
+        dict: rows, a hash of their values, seconds and the MiB the peak
+            RSS grew while building them.
+    """
+
+    # The fake sensor API and the host zone of the fixtures
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import pandas as pd
+    from funciones_ioa import ioa
+
+    ini_date = datetime(2021, 1, 1)
+    end_date = ini_date + pd.Timedelta(days=days)
+    frames = [
+        ioa.get_sensor_values(f"water-{i}", ini_date, end_date)
+        for i in range(sensors)
+    ]
+    columns = [f"Sensor {i}" for i in range(sensors)]
+    build = wide_rows if method == "wide" else long_rows
+
+    # ru_maxrss is in KiB on Linux
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    df = build(frames, columns)
+    seconds = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    rows = df[["time", "Sensor", "water"]].astype({"Sensor": str})
+
+    return {
+        "rows": len(df),
+        "hash": int(
+            pd.util.hash_pandas_object(rows, index=False).sum() % 2**63
+        ),
+        "seconds": seconds,
+        "rss": (peak - before) / 1024,
+    }
+
+
+def main():
+
+    args = parser_config()
+
+    if args.method is not None:
+        print(json.dumps(ingest(args.method, args.sensors, args.days)))
+        return
+
+    print(f"{'ingestion':<12}{'rows':>10}{'seconds':>10}{'RSS MiB':>10}")
+    results = {}
+    for method in METHODS:
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                f"--sensors={args.sensors}",
+                f"--days={args.days}",
+                f"--method={method}",
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        results[method] = json.loads(output.splitlines()[-1])
+        print(
+            f"{method:<12}{results[method]['rows']:>10}"
+            f"{results[method]['seconds']:>10.2f}"
+            f"{results[method]['rss']:>10.0f}"
+        )
+
+    problems = []
+    wide, long = results["wide"], results["long"]
+    if (wide["rows"], wide["hash"]) != (long["rows"], long["hash"]):
+        problems.append("the long rows differ")
+    elif long["rss"] >= wide["rss"]:
+        problems.append("the long ingestion does not use less memory")
+    if problems:
+        print("; ".join(problems))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
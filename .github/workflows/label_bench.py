@@ -0,0 +1,154 @@
+# Spanish label benchmark
+
+# Formats date, month and month-year labels with the row-wise code the
+# report scripts used, the date_to_spanish_month apply of CERVALLE, the
+# English month_name mapped to Spanish and the zip loop of don_pollo, and
+# with report_labels, and fails when a label differs or report_labels is
+# not faster.
+
+# Python packages
+import argparse
+import calendar
+import time
+
+import numpy as np
+import pandas as pd
+
+from report_labels import MONTHS, date_labels, month_labels, month_year_labels
+
+# Daily water rows of a small, a large and a very large CERVALLE report
+DATE_ROWS = (960, 14_600, 365_000)
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Label Benchmark",
+        description="Time report_labels against the row-wise labels",
+    )
+
+    config_parser.add_argument(
+        "-r",
+        "--rows",
+        type=int,
+        default=1_000_000,
+        help="Hourly rows of the month and month-year labels",
+    )
+
+    return config_parser.parse_args()
+
+
+def date_to_spanish_month(date):
+    """
+    Convert a date to spanish month.
+    """
+    months = {
+        1: "En",
+        2: "Feb",
+        3: "Mar",
+        4: "Abr",
+        5: "May",
+        6: "Jun",
+        7: "Jul",
+        8: "Ago",
+        9: "Sept",
+        10: "Oct",
+        11: "Nov",
+        12: "Dic",
+    }
+
+    return "{}-{}-{}".format(date.day, months[date.month], date.year)
+
+
+def cases(rows: int) -> list:
+    """Old and new way of every label
+    Args:
+        rows (int): Hourly rows of the month labels.
+    Returns:
+        list: (name, rows, old, new) with old and new functions.
+    """
+
+    english = dict(zip(calendar.month_name[1:], MONTHS))
+    days = pd.date_range("2021-01-01", periods=730).date
+    hours = pd.Series(pd.date_range("2021-01-01", periods=rows, freq="H"))
+
+    result = []
+    for date_rows in DATE_ROWS:
+        df = pd.DataFrame({"date": np.resize(days, date_rows)})
+        result.append(
+            (
+                "date",
+                date_rows,
+                lambda df=df: df.apply(
+                    lambda x: date_to_spanish_month(x["date"]), axis=1
+                ),
+                lambda df=df: date_labels(df["date"]),
+            )
+        )
+
+    result.append(
+        (
+            "month",
+            rows,
+            lambda: hours.dt.month_name().map(english),
+            lambda: month_labels(hours),
+        )
+    )
+    result.append(
+        (
+            "month-year",
+            rows,
+            lambda: pd.Series(
+                [
+                    str(x) + "-" + str(y)
+                    for x, y in zip(
+                        hours.dt.month_name().map(english), hours.dt.year
+                    )
+                ]
+            ),
+            lambda: month_year_labels(hours),
+        )
+    )
+
+    return result
+
+
+def best(function, repeat: int = 3) -> tuple:
+    """Result and best time of a few runs"""
+
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        seconds.append(time.perf_counter() - started)
+
+    return result, min(seconds)
+
+
+def main():
+
+    args = parser_config()
+
+    failed = False
+    print(f"{'labels':<12}{'rows':>10}{'old ms':>10}{'new ms':>10}")
+    for name, rows, old, new in cases(args.rows):
+        expected, old_seconds = best(old)
+        labels, new_seconds = best(new)
+
+        problems = []
+        if not (labels.to_numpy() == expected.to_numpy()).all():
+            problems.append("labels differ")
+        elif new_seconds >= old_seconds:
+            problems.append("not faster")
+        failed = failed or bool(problems)
+        print(
+            f"{name:<12}{rows:>10}{old_seconds * 1000:>10.1f}"
+            f"{new_seconds * 1000:>10.1f}  {'; '.join(problems)}"
+        )
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
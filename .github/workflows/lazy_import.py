@@ -0,0 +1,39 @@
+# Deferred imports of the heavy plotting modules
+
+# Python packages
+import importlib
+
+
+class LazyModule:
+    """Module imported the first time one of its attributes is read
+
+    Lets a report script keep its usual go.Figure(), px.bar(...) calls while
+    plotly only loads when a section actually builds a figure, so --help
+    and parameter errors return without paying for it.
+    Args:
+        name (str): Dotted module name exp('plotly.graph_objects')
+    """
+
+    def __init__(self, name: str):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def __getattr__(self, attribute: str):
+        if self._module is None:
+            self.__dict__["_module"] = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Module that is imported on first use
+    Args:
+        name (str): Dotted module name exp('plotly.express')
+    Returns:
+        LazyModule: Stand-in for the module.
+    """
+
+    return LazyModule(name)
\ No newline at end of file
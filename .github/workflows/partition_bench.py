@@ -0,0 +1,183 @@
+# Sensor partition benchmark of the plot builders
+
+# Builds the daily pH and pH variation figures of agrinsa for a farm of
+# many sensors, once with the frames split by SensorPartitions and once
+# filtering the whole frame with df[df["sensors"] == i] on every access,
+# as the plot builders did before. It prints the build time and the part
+# of it spent taking the sensor slices, and fails when the figures differ
+# or the partitions do not slice faster.
+
+# Python packages
+import argparse
+import json
+import os
+import sys
+import time
+
+from golden_check import FIXTURES, TIMEZONE
+
+
+class FilteredFrame:
+    """The old access of the plot builders, one filter per request"""
+
+    def __init__(self, df, key: str = "sensors"):
+        self.frame = df
+        self.key = key
+
+    def __getitem__(self, sensor):
+        return self.frame[self.frame[self.key] == sensor]
+
+
+def timed(split: type) -> type:
+    """split that adds up the seconds spent splitting and slicing
+    Args:
+        split (type): SensorPartitions or FilteredFrame.
+    Returns:
+        type: Subclass with the total in its seconds attribute.
+    """
+
+    class Timed(split):
+        seconds = 0.0
+
+        def __init__(self, *args, **kwargs):
+            started = time.perf_counter()
+            super().__init__(*args, **kwargs)
+            Timed.seconds += time.perf_counter() - started
+
+        def __getitem__(self, sensor):
+            started = time.perf_counter()
+            partition = super().__getitem__(sensor)
+            Timed.seconds += time.perf_counter() - started
+            return partition
+
+    Timed.__name__ = split.__name__
+
+    return Timed
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Partition Benchmark",
+        description="Time the plot builders with and without partitions",
+    )
+
+    config_parser.add_argument(
+        "-s",
+        "--sensors",
+        type=int,
+        default=50,
+        help="pH sensors of the farm",
+    )
+
+    config_parser.add_argument(
+        "-d",
+        "--days",
+        type=int,
+        default=243,
+        help="Days of hourly readings per sensor",
+    )
+
+    return config_parser.parse_args()
+
+
+def readings(sensors: int, days: int):
+    """Hourly pH rows of a farm, as agrinsa.prepare receives them
+    Args:
+        sensors (int): pH sensors.
+        days (int): Days of readings.
+    Returns:
+        pd.DataFrame: time, date, sensors and pH, sorted by time.
+    """
+
+    import numpy as np
+    import pandas as pd
+    from funciones_ioa import ioa
+
+    times = pd.date_range("2021-01-01", periods=days * 24, freq="H")
+    names = [f"G{i:02} - pH" for i in range(sensors)]
+
+    return pd.DataFrame(
+        {
+            "time": times.repeat(sensors),
+            "date": times.date.repeat(sensors),
+            "sensors": pd.Categorical(names * len(times), names, ordered=True),
+            "pH": np.column_stack(
+                [ioa.bucket_values(f"pH-{i}", times) for i in range(sensors)]
+            ).ravel(),
+        }
+    )
+
+
+def build(df, df_mean, split) -> list:
+    """Build the two figures of agrinsa that read per-sensor slices
+    Args:
+        df (pd.DataFrame): readings result.
+        df_mean (pd.DataFrame): Its hourly means, as agrinsa.prepare.
+        split (type): SensorPartitions or FilteredFrame.
+    Returns:
+        list: The figures.
+    """
+
+    from agrinsa import plot_daily_ph, plot_daily_ph_variation
+
+    sensor_list = df_mean.sensors.unique()
+
+    return [
+        plot_daily_ph(split(df), sensor_list),
+        plot_daily_ph_variation(df, split(df_mean), sensor_list, "Granja"),
+    ]
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import plotly.utils
+
+    from sensor_partitions import SensorPartitions
+
+    df = readings(args.sensors, args.days)
+    df_mean = (
+        df.groupby(["time", "date", "sensors"], observed=True)
+        .mean()
+        .reset_index()
+    )
+
+    print(
+        f"{'slices':<18}{'rows':>10}{'build s':>10}{'slicing s':>11}"
+        f"{'speedup':>9}"
+    )
+    problems = []
+    for split in (FilteredFrame, SensorPartitions):
+        split = timed(split)
+        started = time.perf_counter()
+        figures = build(df, df_mean, split)
+        seconds = time.perf_counter() - started
+        data = json.dumps(
+            [fig.to_plotly_json()["data"] for fig in figures],
+            cls=plotly.utils.PlotlyJSONEncoder,
+        )
+        if split.__name__ == "FilteredFrame":
+            filtered, expected = split.seconds, data
+        elif data != expected:
+            problems.append("the partitions draw other traces")
+        elif split.seconds >= filtered:
+            problems.append("the partitions do not slice faster")
+        print(
+            f"{split.__name__:<18}{len(df):>10}{seconds:>10.2f}"
+            f"{split.seconds:>11.2f}{filtered / split.seconds:>9.1f}"
+        )
+
+    if problems:
+        print("; ".join(problems))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
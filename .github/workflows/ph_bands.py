@@ -0,0 +1,130 @@
+# Vectorized pH comfort band classification
+
+# Python packages
+import numpy as np
+import pandas as pd
+
+CONFORT = "confort"
+ALERTA = "alerta"
+FUERA = "fuera de rango"
+BANDS = [CONFORT, ALERTA, FUERA]
+
+LIMITS = ("min_standard", "max_standard", "min_alert", "max_alert")
+
+
+def sensor_thresholds(
+    sensors: pd.Series, thresholds: dict, default: float = np.nan
+) -> np.ndarray:
+    """Expand per-sensor thresholds to one value per row
+    Args:
+        sensors (pd.Series): Sensor of each row.
+        thresholds (dict): Threshold per sensor.
+        default (float): Threshold of the sensors missing from thresholds.
+    Returns:
+        np.ndarray: float threshold per row.
+    """
+
+    return sensors.map(thresholds).fillna(default).to_numpy(dtype=float)
+
+
+def band_limits(sensors: pd.Series, thresholds: dict, band: dict) -> dict:
+    """Limits of classify_ph with the per-sensor thresholds applied
+
+    thresholds, the "thresholds" report parameter, maps sensor labels to
+    the limits that replace the band ones for that sensor. A limit no
+    sensor replaces stays a scalar, so without thresholds the band is
+    used as it is. A sensor without an alert limit of the band or its own
+    has no alert band.
+    Args:
+        sensors (pd.Series): Sensor of each row.
+        thresholds (dict): Limits by sensor, exp({"G05 - pH":
+            {"min_standard": 5.8}}).
+        band (dict): Report limits, exp(report parameters).
+    Returns:
+        dict: min_standard, max_standard, min_alert and max_alert of
+            classify_ph, scalars or one value per row.
+    """
+
+    limits = {}
+    for limit in LIMITS:
+        per_sensor = {
+            sensor: values[limit]
+            for sensor, values in thresholds.items()
+            if limit in values
+        }
+        limits[limit] = band.get(limit)
+        if per_sensor:
+            limits[limit] = sensor_thresholds(
+                sensors,
+                per_sensor,
+                np.nan if limits[limit] is None else limits[limit],
+            )
+
+    return limits
+
+
+def classify_ph(
+    ph,
+    min_standard,
+    max_standard,
+    min_alert=None,
+    max_alert=None,
+) -> pd.Categorical:
+    """Classify pH values in comfort, alert and out of range bands
+
+    Thresholds are scalars or arrays aligned with ph, so per-sensor
+    (see band_limits) and time-varying limits are handled in the
+    same single numpy pass. Without alert limits everything outside the
+    comfort band is out of range. Missing pH values have no band.
+    Args:
+        ph (array-like): pH values.
+        min_standard (float or array-like): Comfort band lower limit.
+        max_standard (float or array-like): Comfort band upper limit.
+        min_alert (float or array-like): Alert band lower limit.
+        max_alert (float or array-like): Alert band upper limit.
+    Returns:
+        pd.Categorical: Ordered band per value, one of BANDS.
+    """
+
+    values = np.asarray(ph, dtype=float)
+    codes = np.full(values.shape, BANDS.index(FUERA), dtype="int8")
+
+    if min_alert is not None or max_alert is not None:
+        low = -np.inf if min_alert is None else np.asarray(min_alert, float)
+        high = np.inf if max_alert is None else np.asarray(max_alert, float)
+        codes[(low <= values) & (values <= high)] = BANDS.index(ALERTA)
+
+    low = np.asarray(min_standard, dtype=float)
+    high = np.asarray(max_standard, dtype=float)
+    codes[(low <= values) & (values <= high)] = BANDS.index(CONFORT)
+    codes[np.isnan(values)] = -1
+
+    return pd.Categorical.from_codes(codes, categories=BANDS, ordered=True)
+
+
+def daily_compliance(
+    df: pd.DataFrame, flag: str = "confortpH"
+) -> pd.DataFrame:
+    """Percentage of time inside the comfort band per sensor and day
+
+    A day across the programa start gives a row for each programa, so the
+    lecturas weights add up to the readings of each programa.
+    Args:
+        df (pd.DataFrame): pH values with sensors, date, programa and flag.
+        flag (str): Boolean comfort column.
+    Returns:
+        pd.DataFrame: sensors, confPorph, fecha, programa and the number
+            of lecturas per day.
+    """
+
+    comfortph = (
+        df.groupby(["sensors", "date", "programa"], observed=True)
+        .agg(confPorph=(flag, "mean"), lecturas=(flag, "size"))
+        .reset_index()
+    )
+    comfortph["confPorph"] *= 100
+    comfortph["fecha"] = comfortph.pop("date").astype(str)
+
+    return comfortph[
+        ["sensors", "confPorph", "fecha", "programa", "lecturas"]
+    ].dropna()
\ No newline at end of file
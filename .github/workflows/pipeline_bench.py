@@ -0,0 +1,186 @@
+# Pipeline benchmark of the sensor fetch
+
+# Fetches many sensors from the fake sensor API with a latency per call and
+# per row, once melting all of them after the last call returns and once
+# with fetch_sensor_data(process=melt_values), which melts each sensor on
+# the thread waiting for the pool while the pool fetches the others. It
+# prints when each stage was busy and fails when the rows differ, the
+# processing leaves the calling thread or the work left after the last
+# call does not shrink.
+
+# Python packages
+import argparse
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from golden_check import FIXTURES, TIMEZONE
+
+WIDTH = 64
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Pipeline Benchmark",
+        description="Trace the overlap of the fetch and the processing",
+    )
+
+    config_parser.add_argument(
+        "-s",
+        "--sensors",
+        type=int,
+        default=64,
+        help="Sensors fetched",
+    )
+
+    config_parser.add_argument(
+        "-d",
+        "--days",
+        type=int,
+        default=365,
+        help="Days of hourly readings per sensor",
+    )
+
+    config_parser.add_argument(
+        "-l",
+        "--latency",
+        type=float,
+        default=0.06,
+        help="Seconds of each fake get_sensor_values call",
+    )
+
+    config_parser.add_argument(
+        "-r",
+        "--row-latency",
+        type=float,
+        default=1e-5,
+        help="Extra seconds per row returned by a call",
+    )
+
+    config_parser.add_argument(
+        "-c",
+        "--chunk",
+        default="MS",
+        help="Chunk frequency of the fetch, see sensor_fetch.configure_fetch",
+    )
+
+    return config_parser.parse_args()
+
+
+def timeline(spans: list, started: float, seconds: float) -> str:
+    """# where a stage was busy, in WIDTH slots of the run
+    Args:
+        spans (list): (start, end) monotonic times of the stage.
+        started (float): Monotonic start of the run.
+        seconds (float): Length of the run.
+    Returns:
+        str: WIDTH characters.
+    """
+
+    slot = seconds / WIDTH
+    busy = [" "] * WIDTH
+    for start, end in spans:
+        first = int((start - started) / slot)
+        last = min(int((end - started) / slot), WIDTH - 1)
+        for i in range(first, last + 1):
+            busy[i] = "#"
+
+    return "".join(busy)
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures, before
+    # sensor_fetch imports funciones_ioa
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import pandas as pd
+    from funciones_ioa import ioa
+
+    import sensor_fetch
+    from report_engine import melt_values
+
+    lock = threading.Lock()
+    fetches, processes, threads = [], [], set()
+    get_sensor_values = ioa.get_sensor_values
+
+    def traced_fetch(*args_, **kwargs):
+        start = time.monotonic()
+        df = get_sensor_values(*args_, **kwargs)
+        time.sleep(args.row_latency * len(df))
+        with lock:
+            fetches.append((start, time.monotonic()))
+        return df
+
+    def melt(df: pd.DataFrame) -> pd.DataFrame:
+        start = time.monotonic()
+        df = melt_values(df, "water")
+        processes.append((start, time.monotonic()))
+        threads.add(threading.get_ident())
+        return df
+
+    df_sensors = pd.DataFrame(
+        {
+            "raw_id": [f"water-{i}" for i in range(args.sensors)],
+            "sensor": [f"Planta|Sensor {i}" for i in range(args.sensors)],
+        }
+    )
+    ini_date = datetime(2021, 1, 1)
+    end_date = ini_date + pd.Timedelta(days=args.days)
+
+    runs = {
+        "sequential": lambda: melt(
+            sensor_fetch.fetch_sensor_data(df_sensors, ini_date, end_date)
+        ),
+        "pipelined": lambda: sensor_fetch.fetch_sensor_data(
+            df_sensors, ini_date, end_date, process=melt
+        ),
+    }
+
+    ioa.LATENCY = args.latency
+    ioa.get_sensor_values = traced_fetch
+    sensor_fetch.configure_fetch({"chunk": args.chunk})
+    tails, problems = {}, []
+    try:
+        for name, run in runs.items():
+            fetches.clear()
+            processes.clear()
+            threads.clear()
+            started = time.monotonic()
+            df = run()
+            finished = time.monotonic()
+            seconds = finished - started
+            tails[name] = finished - max(end for _, end in fetches)
+
+            if name == "sequential":
+                expected = df
+            elif not df.equals(expected):
+                problems.append(f"{name} returns other rows")
+            if threads != {threading.get_ident()}:
+                problems.append(f"{name} processes off the calling thread")
+            print(
+                f"{args.sensors} sensors, {name} {seconds:.2f} s, "
+                f"{tails[name]:.2f} s after the last fetch"
+            )
+            print(f"  fetch   |{timeline(fetches, started, seconds)}|")
+            print(f"  process |{timeline(processes, started, seconds)}|")
+    finally:
+        ioa.get_sensor_values = get_sensor_values
+        sensor_fetch.configure_fetch()
+
+    if tails["pipelined"] >= tails["sequential"]:
+        problems.append("the pipelined run leaves no less work at the end")
+    if problems:
+        print("; ".join(problems))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,154 @@
+# Fetch plan benchmark of the water reports
+
+# Runs the water reports on the fake sensor API twice, once with the
+# fetch periods report_engine.plan_sources picks from their sections and
+# once with every section reading hourly, as all the scripts did, and
+# counts the rows get_sensor_values returns per source. It fails when the
+# planned report does not transfer fewer rows or its figures leave the
+# hourly ones beyond the golden tolerance.
+
+# Python packages
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+from golden_check import FIXTURES, TIMEZONE, differences, report_sections
+
+CLIENTS = ("refinal", "CERVALLE_informe", "don_pollo")
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Plan Benchmark",
+        description="Count the rows fetched with and without the plan",
+    )
+
+    config_parser.add_argument(
+        "-c",
+        "--clients",
+        nargs="+",
+        choices=CLIENTS,
+        default=CLIENTS,
+        help="Water reports to run",
+    )
+
+    config_parser.add_argument(
+        "-d",
+        "--days",
+        type=int,
+        help="Days up to the fixture end date, its own period if missing",
+    )
+
+    return config_parser.parse_args()
+
+
+def hourly(spec: dict) -> dict:
+    """spec with no section resolution, so every source is fetched hourly
+    Args:
+        spec (dict): Report spec, see report_engine.run_report.
+    Returns:
+        dict: Copy of spec.
+    """
+
+    return dict(
+        spec,
+        sections=[
+            {
+                key: value
+                for key, value in section.items()
+                if key != "resolution"
+            }
+            for section in spec["sections"]
+        ],
+    )
+
+
+def run(client: str, spec: dict, days, rows: dict) -> list:
+    """Run a report and count the rows fetched per period
+    Args:
+        client (str): Report script name.
+        spec (dict): Report spec to run.
+        days (int | None): Days of the report, the fixture period if None.
+        rows (dict): period -> rows, updated by the fetch.
+    Returns:
+        list: report_sections of the report.
+    """
+
+    from funciones_ioa import ioa
+
+    import report_engine
+
+    get_sensor_values = ioa.get_sensor_values
+
+    def counted(*args, period: str = "1H", **kwargs):
+        df = get_sensor_values(*args, period=period, **kwargs)
+        rows[period] = rows.get(period, 0) + len(df)
+        return df
+
+    json_dict = report_engine.read_parameters(
+        os.path.join(FIXTURES, "parameters", client + ".json")
+    )
+    if days is not None:
+        end_date = date.fromisoformat(json_dict["end_date"])
+        json_dict["start_date"] = str(end_date - timedelta(days=days))
+    report_engine.configure_report(json_dict)
+
+    ioa.get_sensor_values = counted
+    try:
+        path = report_engine.run_report(spec, json_dict)
+    finally:
+        ioa.get_sensor_values = get_sensor_values
+    with open(path, encoding="utf-8") as file:
+        html = file.read()
+    os.remove(path)
+
+    return report_sections(html)
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures, before the
+    # report modules import funciones_ioa
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    failed = False
+    print(f"{'report':<18}{'period':>8}{'1H rows':>10}{'planned rows':>14}")
+    directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as output:
+        os.chdir(output)
+        try:
+            for client in args.clients:
+                spec = importlib.import_module(client).REPORT
+                before, after = {}, {}
+                expected = run(client, hourly(spec), args.days, before)
+                sections = run(client, spec, args.days, after)
+
+                problems = []
+                if differences(expected, sections):
+                    problems.append("figures differ")
+                if sum(after.values()) >= sum(before.values()):
+                    problems.append("not fewer rows")
+                failed = failed or bool(problems)
+                print(
+                    f"{client:<18}{'+'.join(sorted(after)):>8}"
+                    f"{sum(before.values()):>10}{sum(after.values()):>14}"
+                    f"  {'; '.join(problems)}"
+                )
+        finally:
+            os.chdir(directory)
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
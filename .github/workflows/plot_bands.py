@@ -0,0 +1,34 @@
+# Reference band lines for the report plots
+
+# Python packages
+import numpy as np
+import pandas as pd
+
+
+def band_line(x, y) -> dict:
+    """x and y of a threshold line with only the points it needs
+
+    A constant threshold becomes a two point line from the first to the
+    last time. A threshold given per row keeps only the first and last
+    point of each run of equal values, which draws the same steps. The
+    result is meant to be unpacked in go.Scatter(**band_line(x, y)).
+    Args:
+        x (array-like): Time of each row, in plot order.
+        y (float or array-like): Threshold value or value per row.
+    Returns:
+        dict: x and y of the line.
+    """
+
+    # A Series keeps plotly's datetime formatting in the hover text
+    x = pd.Series(x).reset_index(drop=True)
+    if x.empty:
+        return {"x": x, "y": np.asarray([], dtype=float)}
+
+    if np.ndim(y) == 0:
+        return {"x": x.iloc[[0, -1]], "y": np.array([y, y], dtype=float)}
+
+    y = np.asarray(y, dtype=float)
+    change = y[1:] != y[:-1]
+    keep = np.concatenate([[True], change]) | np.concatenate([change, [True]])
+
+    return {"x": x[keep], "y": y[keep]}
\ No newline at end of file
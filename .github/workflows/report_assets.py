@@ -0,0 +1,203 @@
+# Static assets of the HTML reports
+
+# Python packages
+import os
+import base64
+import shutil
+from pathlib import Path
+
+from lazy_import import lazy_import
+
+offline = lazy_import("plotly.offline")
+
+MODES = ("cdn", "inline", "directory")
+
+FAVICON = "http://www.iconj.com/ico/p/1/p14r1u145y.ico"
+BOOTSTRAP_CDN = (
+    "https://maxcdn.bootstrapcdn.com/bootstrap/3.3.1/css/bootstrap.min.css"
+)
+
+# Asimetrix logo shown at the top of every report
+LOGO_PNG = (
+    "iVBORw0KGgoAAAANSUhEUgAAAXgAAACGCAMAAADgrGFJAAAAsVBMVEX///80NDQigHQmJiYi"
+    "IiIrKyva2towMDC7u7spKSng4OBzc3Pz8/MgICAuLi6enp4bGxvp6enx8fH5+fmUlJQAd2p8"
+    "fHxmZmaxsbHQ0NBDQ0NKSkoSEhLl5eWlpaVfX1+EhIQ7OztSUlKOjo7Hx8fR0dGamppvb29X"
+    "V1diYmK/v7+5089TmI7i7uzr8/Kjo6ODsKo7joPH3Nmmx8JEkIbX5+SVvrioyMNspp4LCwt2"
+    "q6NMT6YaAAAOJ0lEQVR4nO1daXuizBINNoioEAxxN4hrTCbLJLPlvv//h13Mql1LFwaGeQxn"
+    "5qPprj4U1bV1c3JSoUKFChUqVKhQoUKFChXyRhRFZYvw9RA9fr95qD3cfH8sW5IvhehHrdut"
+    "bdHt/vxWtjRfB79+vrD+gu7NbdkCfRE81vbRrf0qW6QvgdsaRKXzfwEPCPEPZQv1BfC7ixDf"
+    "/V22WMcPjPeU+cqlLxjfCOL/lC3YseMJ5b1WuylbsGMHwXutVrZgxw7c0tQqj7Jg3FHEd6sg"
+    "qljkqPGNS8cbtwbtAqQ8QpA2Pqs/ee3bgWW5ju3HhQh6bLgheM8auw4m1hvCpAhBjw1/CD8+"
+    "Y+ja/OA9ZX5djKxHBWJ37WY08f3A2mX+rBhhjwrfUeafsg3S2VV4y1KVypsRoQp/l22QWO0R"
+    "746KkfW48AhVPnOmZt/SWJZd+ZQCgDxZ90fWISwN9qoIQY8Oj7V96jOXu9ueTvyyCDmPD3dP"
+    "79R3u0/ZY9YOIP66ACmPEre/bx663e7DzfdDcjRNpRPfyF3C48Xd7a/bjM7MG+oV8eWgIr4k"
+    "VMSXhIr4klARXxIq4ktCRXxJqIgvCRXxJaEiviRUxJeEiviSUBFfEiriD0TUvlg2Gvf393Gj"
+    "sTprZ+6Nz0R81GzE8VJYG2wPB6eDa0HTwuq8NZ324o5sWF2kdnOVEtBoDFed7Ks/EGfDdWvs"
+    "hL5tqxS2HYazTTJoZiqaZiF+MArTmXxrIeCofW49/9hrNQ0CXIXKcQNH2YuMvEXNQTIdeeGW"
+    "ANv2w4k7vzxfHvb8MqBz3bJCFbj7tLmOHY4XK/kS5MRHPf91MjWrG6WbvY3rKNZ2LR3nbWa/"
+    "n0FlouFi7NvO/vrdwPOd6drwqD+FemL5joXD9exxLO1LEhMf9e2PGdwLftRottO7EDLFxKa/"
+    "w5zqC4U+6azHtqfp3LtwSm2K2qfqV55eKtUnt85lWi8lPpru/tC55Eft7YrnzmgtmO+3sckK"
+    "7Z2eqwjWX2e0R0W037Z7fsBN+wIViB67kPhovP+kJ6wpvdh/Ge176oercJ+wuUTktUHrXqgf"
+    "594tcR1SNkZDOBfYGxnx7bEj+NU71tLutHONwolZ4tVMl5igPrzM1cmJktA86SsCx/zURcRH"
+    "G/1ZK/ZV1rvTyPdjrlkM3yjw6YQ1MrtwAqMPIMfZRva8XxGemgaUEB/1wbutBpyQI40csldH"
+    "H9bmht1KcilXu1TpJ4bh5LiYC83MG8KFYUQB8dElfNgTrtGvM9N+TT2mtq693jkrbJRN7dI3"
+    "yKh4MnRmGXlPp074IQXEt2wwKr8LNqWGCRDvsNK25+ZdVV++SfFEiMYCbwZMzSuRmfge5N2a"
+    "sLYYEk8oHiS+xY17lZn3dPmkR5UB5MRpxO3oMezH1KyhMxKP8a56rJwFEd+j7Ay//M/3gq59"
+    "dFZ7ojaXSXI1moT4g7G5zd1E/AKZ1BnzjloxxA/Q5Qf2xJumy++PJj6+fN8QZRuxmiCjBva8"
+    "8e6rrdYWFtG5I4YnA/EY7wETiT6jEOJBd+3z79X0Y/nDhYv9xh3z0poQ6T7a84r6mjYPRshj"
+    "Vwk9LE/8KcK7OzMloQohfoPsb3ZfEyW2sOV/boO9R3wLJCsQ9RCuFG1sWOJjjHfLGJYUQfwA"
+    "OvCBC813u4Uo/f8+Y2w6CAV4dhYRkclpccQPkH3VtcxHdQogPpqB990Zo2/eOWTelNJjsQDj"
+    "uQ7xIBHm6VCcIb6B8B6Y9b0Q4uH77o6IPMQpFNsfmoUmcAY5CEnVg+4P/cxp4q8R3p2R5K0t"
+    "gHho4F1yp0mAjgbiRD9ADFiwmWh4CuQMKTFJ4peIfffmohpR/sQ3gDBcdDKGZunQolSkp/H4"
+    "oP0CPHOP2tkp4utINsq+kiVa8yceeHSsDteB432wYwOH4os1yA5DjYwTX0f03U6E0uZOPNQC"
+    "/jRuTxfANYR8JPSCgeVu2N9DH4jaEQDxzjYd0EQicFt8y0HuxN/rQhqMdgfoKRu9MwCWxjfU"
+    "9RJ97VTCFRBveevmEjpvlpJnm3InHixfGdwUvRJz6N0YHWhwDVH7UN+MqfIbJN5SoQ95z+IY"
+    "5E38BUyGGyS41i1lcCUXfwfAo+bTpydYgmGCWzmEeBRZDnznTfwSLD8xLR88KlN+CQcw8aYS"
+    "GbK/EEGElPgwg5HMm/i1LqO5NNvSbQ3pT7OY6gLaxmFAuE9UgcTEZ7jUI2/ir3QWzc0Ip8BZ"
+    "O6j8qrPgjoyBTF1/SRy8eCElnuIOQ97Eg4AoMIoAwj8ykOEQ6d6RYKsAOQYi4pISn6WekDPx"
+    "oHYemJNeZ7o7QuidYSGHjAJ2Vxf9mZh4R+4X5Ew8GM7Qi7BFNNJXPxWL/wH43phnPtkA3xd1"
+    "a8TEZ7CSORO/0pfPNvW8AORYBNYZAniTgplPLkEMge5IcuLdmbT1vGjiJYdWQAjlHuBPAg9F"
+    "onzAn1SoJyQn3vKkZjJn4oHemb1JRO9MIScGSLwgmoHEo554BuLF15XlTPwAuPGCugbMmRxA"
+    "fKzPLHGqCyCebVfYwT9JvKARGc58yLtWAPGWEmzqJ/8o8fgWx+MfsfEpJqLEQd7EA70TEN8C"
+    "2ZoDiC/Hq3EcmKOUHdnImfhhaV4N9OMF2WXox6OOLEW8G/QWU9gdJOoBFRMP8r0y4v+aHw8q"
+    "XwdFrniCgyA+eO7ZiSHzocCZFxMPfogSD9JOoshVJ356QPEP5mrMVYnP5Wqc16aVHmDeERRE"
+    "YIxPvKEy4kEdU5Kr0d8SYwUDBUi7jA/IThJ1ZLQXdPxqEJF2HsHGDvkk3tAVKPhiQsKizswo"
+    "wlA3EgdlJ2E+XhlThaAdiag6YsQ7H+0zsJ/HNbsHgHhKRYci4uF2NTHqHQh9+NNyFNagAmXc"
+    "12EFCvf9EeKd+Y45hM1B5swBIJ5yhoB24MQDn1xQgdL/JEsFjRPQuHhAGBG5QeLd2a4+wY4e"
+    "87IB8ZaD/xAoFE48WL5xd82r5grS+tbM8LIhfEp/qF36kID91dgdBIknKu1AL3FGm6CryGTk"
+    "lzphB3YZQCtnOvW/ALpEbC6AeL0PBAQ5qaEzKBwknog1wWtJqDLYXW1D7ArDdnTg6O7OoENZ"
+    "W6nOZmDpxJMCxIPtvwGbegx9WaBWR2xtF2BgwgOAasQ7h9BCwERV9Pj95qFWe3j6wX3toAla"
+    "GfnNAmzqRP0JIR6GhbD3ODA0EALi8Y5D2IBP+KqgFGJo/wUPClrHbz+7r1+a6Nb+Y+7eBw4l"
+    "q/LQ/SZ3Y8EB4zrS6c86ZxF0hXzsucNiBVVogH3XCTM/bLzTu4XvnnY/rdJlPq0Czxpy1+/A"
+    "gJN8QSR3GcDTKIbMAdiSUFsDtwIy7wjaZNiiDHxFtRfk7kH7mlD3OzUWNNqWTa4dWuWArLFL"
+    "iG/DA4f0gFuA1CDaugl2QPp5toFTyyS9YNCnm4cH+Pks8gOJyBkoamoQLnNOkOjaFOQ0VMiF"
+    "cKDlEHMrsCMnITUifEjOhti14OkRy9+v2P2HfKqP/PowkjVxpmhQgCyI0U/ZRUF9qJxcfhs7"
+    "PqW0Z9/EjkKTm3YHLkrhd8c1oF3UFP4X+onEn9TU0MxZzgypvcIXjXV7ZcQj5pjLHNSRS0bc"
+    "/VuLsBZ8rk8Q2We8EbJxIWf+rMl+ZusJ473WfSRmxk52uyrRjGK9j0zMciS7kww528MdDsBO"
+    "obve6buw9QRpwU8tDT3kGfKgXHWuvXbDKfauJXu/uUV5r9VuqKlX2OVEatZbvb9xneu+h+ka"
+    "l6eQXgYH1x3M6agPpLVehLX6i8FgcNrbKPy+B64ZFTNf6fKTjzs2O40rGzl3r+/r4PuIbypP"
+    "LmeBTW05anaVnMZxuhwLm9eQ1JJefwiyH+kvaWceHEh5Y9ZTtq2QYu4z+Jw5PL76/DfeqJ/E"
+    "cXzfopav98LgX8FlbE3qHhP3MwXO9opbajk2uxzxhZ+gSZ1NlmG2xogJG45GxLVgLr/8UFcP"
+    "3MSnxNNRVKRfQiiB4fpSMfHIOSwmhsMvl+Fhqs5hZt4IeEaU+sY890XWs1Fm5pWhIQN+ZJFi"
+    "E/oLXNx+gMp7prLaBXkNE718WPsiNZ77BHEn63VoynTrJTgETsbiMAPDqShM65nAbBnvy896"
+    "GZ6NSEjaePZbuO2rTJ1fvrFSFYGqIpn2BJEZm6mKs9wQmUJJ2gA682zXbmLbG+nV8N8HjbDL"
+    "qgi4kkPB4HJO+qd6EMN7IetMzCtZ30sbuweJXD6aZKb8+AfT3NeO0NyokeSknpa75npW2pqx"
+    "MRwvTzJYG3UlbfQaYKEKBntMvLv47kqnyd7RaUnu1w1C2UXmWjV7whXVtHYMx9BVFofSzTBs"
+    "yfu8LvqSYR11Sg35iNsayZeIhyPT3M6kLz2lt+cee3yT1nrXs+HumHuV0xKZZCfjHcDLmXn5"
+    "LUYpnrDsJOfT7M698akvBmyNm2/6MscOOu5HaGS6UfJk53rnwNTpsMXa56/Y384ZtjK3XlzP"
+    "2eXbPVbrIoT3J/Hc9cXIQ8I117GD8TrTtXMXo1dyXHtq4jJ6v17RE9wKl6J9P/YY7l3lXB7U"
+    "arRKRgp8IeV5+e7Y+IGdX4D3m0wtrfW4NbZ8X3nOM5TylTXvDTKf2o/OR9vv6thjQZtbu+/Y"
+    "TuDYdk/c9ly/nwa+h5LkbO4Pv5qwHl+OXdt+W76XLn+2SRqSAe9u9qyNYGMFuKgv7897SS/9"
+    "v46X9QM/xrP9ZlM8FJ5wGiSXySCbmjaXyeXYCv30+XpbKDv0Z9Ok8dnv10TN+vXpIl17+u98"
+    "kGX5P2rdD3Wn02PHgKjTXA7i00WK83gwbB7UU5cf7v481bopHv47btr/Rdxt8be+llahQoUK"
+    "FSpUqFChQoUKFSrkhv8DTyjruv0fWwcAAAAASUVORK5CYII="
+)
+
+# Set by configure_assets from the report parameters
+ASSETS = {"mode": "cdn", "directory": None, "bootstrap_css": None}
+
+
+def configure_assets(params: dict = None):
+    """Select how the reports load plotly.js, Bootstrap and the logo
+
+    cdn links plotly.js pinned to the version of the installed plotly,
+    inline embeds it in the report, and directory writes the bundle and
+    the logo once to a shared directory that every report of a batch
+    links to. inline and directory reports open without network access;
+    Bootstrap is only included in them when bootstrap_css points to a
+    local copy.
+    Args:
+        params (dict): mode exp('cdn', 'inline', 'directory'), directory
+            and bootstrap_css.
+    """
+
+    global ASSETS
+
+    params = params or {}
+    mode = params.get("mode", "cdn")
+    if mode not in MODES:
+        raise ValueError(f"Unknown assets mode: {mode}")
+    if mode == "directory" and not params.get("directory"):
+        raise ValueError("The directory assets mode needs a directory")
+
+    ASSETS = {
+        "mode": mode,
+        "directory": params.get("directory"),
+        "bootstrap_css": params.get("bootstrap_css"),
+    }
+
+
+def _shared_file(name: str, write, report_path: str = None) -> str:
+    # Written once per directory, then reused by every report. The link is
+    # relative to the folder of the report, which need not be the cwd.
+    directory = Path(ASSETS["directory"])
+    path = directory / name
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        write(tmp)
+        os.replace(tmp, path)
+    start = os.path.dirname(os.path.abspath(report_path or "report.html"))
+    return Path(os.path.relpath(path, start=start)).as_posix()
+
+
+def head_tags(report_path: str = None) -> str:
+    """Favicon, plotly.js and Bootstrap tags of the report head
+    Args:
+        report_path (str): Path of the report the shared assets are linked
+            from, a report in the cwd if None.
+    Returns:
+        str: HTML tags for the configured mode.
+    """
+
+    mode = ASSETS["mode"]
+    css = ASSETS["bootstrap_css"]
+    version = offline.get_plotlyjs_version()
+
+    if mode == "cdn":
+        return (
+            f'<link rel="shortcut icon" href="{FAVICON}" type="image/x-icon" />\n'
+            f'<script src="https://cdn.plot.ly/plotly-{version}.min.js"></script>\n'
+            f'<link rel="stylesheet" href="{BOOTSTRAP_CDN}">\n'
+        )
+
+    if mode == "inline":
+        tags = f'<script type="text/javascript">{offline.get_plotlyjs()}</script>\n'
+        if css:
+            tags += f"<style>{Path(css).read_text()}</style>\n"
+        return tags
+
+    plotly_js = _shared_file(
+        f"plotly-{version}.min.js",
+        lambda path: path.write_text(offline.get_plotlyjs(), encoding="utf-8"),
+        report_path,
+    )
+    tags = f'<script src="{plotly_js}"></script>\n'
+    if css:
+        bootstrap = _shared_file(
+            "bootstrap.min.css",
+            lambda path: shutil.copyfile(css, path),
+            report_path,
+        )
+        tags += f'<link rel="stylesheet" href="{bootstrap}">\n'
+    return tags
+
+
+def logo_tag(report_path: str = None) -> str:
+    """Report logo, inline or from the shared asset directory
+    Args:
+        report_path (str): Path of the report, see head_tags.
+    Returns:
+        str: img tag of the logo.
+    """
+
+    if ASSETS["mode"] == "directory":
+        src = _shared_file(
+            "logo.png",
+            lambda path: path.write_bytes(base64.b64decode(LOGO_PNG)),
+            report_path,
+        )
+    else:
+        src = "data:image/png;base64," + LOGO_PNG
+
+    return f'<img src="{src}" alt="asimetrix-full" alt="Asimetrix">'
\ No newline at end of file
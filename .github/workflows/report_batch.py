@@ -0,0 +1,284 @@
+# Batch generation of the client reports
+
+from report_cli import parse_batch_args, read_parameters
+
+# --help and usage errors exit here, before pandas and plotly load
+ARGS = parse_batch_args() if __name__ == "__main__" else None
+
+# Python packages
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List
+
+from funciones_ioa import ioa as ioa
+from report_engine import (
+    configure_report,
+    plan_sources,
+    report_params,
+    report_period,
+    run_report,
+    select_sensors,
+)
+from report_render import configure_render
+from sensor_fetch import (
+    configure_cache,
+    configure_fetch,
+    fetch_sensor_frames,
+    get_sensor_columns,
+    to_long_frame,
+)
+
+
+def find_parameter_files(
+    parameters_files: List[str], directory: str = None
+) -> List[str]:
+    """Parameter files of the batch
+    Args:
+        parameters_files (List[str]): Files given one by one.
+        directory (str): Directory whose .json files are added, sorted.
+    Returns:
+        List[str]: Parameter file paths.
+    """
+
+    files = list(parameters_files)
+    if directory is not None:
+        files += [
+            os.path.join(directory, name)
+            for name in sorted(os.listdir(directory))
+            if name.endswith(".json")
+        ]
+
+    return files
+
+
+def load_report(parameters_file: str) -> dict:
+    """Read a parameters file and find its client report
+
+    The client module is the "report" parameter, or the file name without
+    extension, exp(acondesa.json runs acondesa.REPORT). Invalid parameters
+    give a report with an "error" instead.
+    Args:
+        parameters_file (str): JSON file with the report parameters.
+    Returns:
+        dict: file, module and json_dict of the report.
+    """
+
+    module = os.path.splitext(os.path.basename(parameters_file))[0]
+    try:
+        json_dict = read_parameters(parameters_file)
+    except ValueError as error:
+        return {"file": parameters_file, "module": module, "error": str(error)}
+
+    return {
+        "file": parameters_file,
+        "module": json_dict.get("report", module),
+        "json_dict": json_dict,
+    }
+
+
+def prefetch(reports: List[dict], now: datetime = None) -> dict:
+    """Fetch the sensors of all the reports, each series only once
+
+    Device lookups are shared by company and type of value, and a sensor
+    requested by several reports over the same period, cache and fetch
+    settings is fetched once. Reports that cannot be planned or fetched
+    get an "error" instead.
+    Args:
+        reports (List[dict]): load_report results, updated in place.
+        now (datetime): End of the reports without end_date.
+    Returns:
+        dict: requested and fetched series counts and fetch seconds.
+    """
+
+    devices = {}
+    windows = {}
+    requested = 0
+    started = time.perf_counter()
+
+    for report in reports:
+        if "error" in report:
+            continue
+        try:
+            spec = importlib.import_module(report["module"]).REPORT
+            params = report_params(spec, report["json_dict"])
+            ini_date, end_date = report_period(report["json_dict"], now)
+            settings = {
+                "cache": report["json_dict"].get("cache"),
+                "fetch": report["json_dict"].get("fetch"),
+            }
+
+            plan = {}
+            for name, source in plan_sources(spec).items():
+                key = (params["company"], source["type_value"])
+                if key not in devices:
+                    devices[key] = ioa._get_devices_in_company_mongo(*key)
+
+                df_sensors = select_sensors(
+                    devices[key],
+                    source["type_value"],
+                    farm=params["farm"] if source.get("by_farm") else None,
+                    name_contains=source.get("name_contains"),
+                )
+                if df_sensors.empty:
+                    raise ValueError("No sensors found")
+
+                window = (
+                    json.dumps(settings, sort_keys=True),
+                    ini_date,
+                    end_date,
+                    source["period"],
+                )
+                columns = get_sensor_columns(df_sensors)
+                windows.setdefault(window, {}).update(
+                    dict.fromkeys(raw_id for raw_id, _ in columns)
+                )
+                requested += len(columns)
+                plan[name] = (window, columns)
+
+            report["plan"] = plan
+        except Exception as error:
+            report["error"] = repr(error)
+
+    series = {}
+    failed = {}
+    for window, raw_ids in windows.items():
+        settings, ini_date, end_date, period = window
+        settings = json.loads(settings)
+        configure_cache(settings["cache"])
+        configure_fetch(settings["fetch"])
+        try:
+            frames = fetch_sensor_frames(
+                list(raw_ids), ini_date, end_date, period=period
+            )
+        except Exception as error:
+            failed[window] = repr(error)
+            continue
+        series.update(
+            ((window, raw_id), frame) for raw_id, frame in zip(raw_ids, frames)
+        )
+
+    for report in reports:
+        plan = report.pop("plan", {})
+        errors = [failed[w] for w, _ in plan.values() if w in failed]
+        if errors:
+            report["error"] = errors[0]
+            continue
+
+        report["fetched"] = {
+            name: to_long_frame(
+                [series[(window, raw_id)] for raw_id, _ in columns],
+                [column for _, column in columns],
+            )
+            for name, (window, columns) in plan.items()
+        }
+
+    return {
+        "requested": requested,
+        "fetched": len(series),
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def build_report(module: str, json_dict: dict, fetched: dict) -> tuple:
+    """Build one report in a pool worker
+
+    Workers always render headless, whatever render mode the parameters
+    ask for, since nobody is there to look at a preview.
+    Args:
+        module (str): Client report module.
+        json_dict (dict): Report parameters.
+        fetched (dict): Long frame per source name from prefetch.
+    Returns:
+        tuple: Report path and build seconds.
+    """
+
+    started = time.perf_counter()
+
+    configure_report(json_dict)
+    configure_render(None)
+    report_path = run_report(
+        importlib.import_module(module).REPORT, json_dict, fetched
+    )
+
+    return report_path, time.perf_counter() - started
+
+
+def run_batch(parameters_files: List[str], workers: int = None) -> tuple:
+    """Build many reports sharing the sensor fetches
+    Args:
+        parameters_files (List[str]): Files with the report parameters.
+        workers (int): Reports built at the same time.
+    Returns:
+        tuple: file, module, path, seconds or error of every report and
+            the prefetch stats.
+    """
+
+    reports = [load_report(path) for path in parameters_files]
+    stats = prefetch(reports, now=datetime.now())
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                build_report,
+                report["module"],
+                report["json_dict"],
+                report.pop("fetched"),
+            ): report
+            for report in reports
+            if "error" not in report
+        }
+
+        for future, report in futures.items():
+            try:
+                report["path"], report["seconds"] = future.result()
+            except Exception as error:
+                report["error"] = repr(error)
+
+    return reports, stats
+
+
+def print_summary(reports: List[dict], stats: dict, seconds: float):
+    """Per report timing summary
+    Args:
+        reports (List[dict]): run_batch results.
+        stats (dict): prefetch counts and seconds.
+        seconds (float): Batch wall time.
+    """
+
+    print(f"{'report':<32}{'seconds':>9}  result")
+    for report in reports:
+        name = os.path.basename(report["file"])
+        if "error" in report:
+            print(f"{name:<32}{'-':>9}  {report['error']}")
+        else:
+            print(f"{name:<32}{report['seconds']:>9.2f}  {report['path']}")
+
+    print(
+        f"fetch: {stats['fetched']} series for {stats['requested']} "
+        f"requested in {stats['seconds']:.2f} s"
+    )
+    print(f"total: {seconds:.2f} s")
+
+
+def main(args=None):
+
+    if args is None:
+        args = parse_batch_args()
+
+    started = time.perf_counter()
+    reports, stats = run_batch(
+        find_parameter_files(args.parameters_files, args.directory),
+        workers=args.workers,
+    )
+    print_summary(reports, stats, time.perf_counter() - started)
+
+    if any("error" in report for report in reports):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main(ARGS)
\ No newline at end of file
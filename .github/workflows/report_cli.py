@@ -0,0 +1,161 @@
+# Command line and parameter checks of the report scripts
+
+# Only the standard library is imported here, so --help and parameter
+# errors are answered before pandas, plotly or the sensor API load.
+
+# Python packages
+import argparse
+import json
+import os
+from datetime import datetime
+
+REQUIRED = ("company", "farm", "report_name", "start_date", "end_date")
+
+
+def parser_config() -> argparse.ArgumentParser:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Report Generator",
+        description="Generate the report pass the parameter values from lambda script",
+    )
+
+    config_parser.add_argument(
+        "-pf",
+        "--parameters_file",
+        help="File with the report parameters",
+        required=True,
+    )
+
+    return config_parser
+
+
+def check_parameters(json_dict: dict) -> list:
+    """Problems of the report parameters, empty if they are valid
+    Args:
+        json_dict (dict): Report parameters.
+    Returns:
+        list: One message per problem.
+    """
+
+    if not isinstance(json_dict, dict):
+        return ["the parameters must be a JSON object"]
+
+    problems = [
+        f"missing parameter {key!r}"
+        for key in REQUIRED
+        if key not in json_dict
+    ]
+
+    report_name = json_dict.get("report_name")
+    if "report_name" in json_dict and not (
+        isinstance(report_name, list)
+        and report_name
+        and isinstance(report_name[0], str)
+    ):
+        problems.append("report_name must be a list with the report name")
+
+    # A null end_date means up to now
+    for key in ("start_date", "end_date"):
+        value = json_dict.get(key)
+        if key not in json_dict or (key == "end_date" and value is None):
+            continue
+        try:
+            datetime.strptime(value, "%Y-%m-%d")
+        except (TypeError, ValueError):
+            problems.append(f"{key} must be a YYYY-MM-DD date, got {value!r}")
+
+    return problems
+
+
+def read_parameters(parameters_file: str) -> dict:
+    """Read and check a parameters file
+    Args:
+        parameters_file (str): JSON file with the report parameters.
+    Returns:
+        dict: Report parameters.
+    """
+
+    if not parameters_file.endswith(".json"):
+        raise ValueError(f"{parameters_file}: not a .json file")
+    if not os.path.isfile(parameters_file):
+        raise ValueError(f"{parameters_file}: file not found")
+
+    with open(parameters_file) as f:
+        try:
+            json_dict = json.load(f)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"{parameters_file}: {error}") from None
+
+    problems = check_parameters(json_dict)
+    if problems:
+        raise ValueError(f"{parameters_file}: " + "; ".join(problems))
+
+    return json_dict
+
+
+def batch_parser_config() -> argparse.ArgumentParser:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Batch Report Generator",
+        description="Generate many reports in one run sharing the sensor fetches",
+    )
+
+    config_parser.add_argument(
+        "-pf",
+        "--parameters_files",
+        nargs="*",
+        default=[],
+        help="Files with the report parameters",
+    )
+
+    config_parser.add_argument(
+        "-d",
+        "--directory",
+        help="Directory with one .json parameters file per report",
+    )
+
+    config_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Reports built at the same time",
+    )
+
+    return config_parser
+
+
+def parse_batch_args() -> argparse.Namespace:
+    """Parse the command line of the batch report script
+
+    Exits with the usage message on --help or when no report is given.
+    Returns:
+        argparse.Namespace: parameters_files, directory and workers.
+    """
+
+    config_parser = batch_parser_config()
+    args = config_parser.parse_args()
+
+    if not args.parameters_files and args.directory is None:
+        config_parser.error("pass --parameters_files or --directory")
+    if args.directory is not None and not os.path.isdir(args.directory):
+        config_parser.error(f"{args.directory}: directory not found")
+
+    return args
+
+
+def parse_report_args() -> dict:
+    """Parse the command line of a report script and read its parameters
+
+    Exits with the usage message on --help or invalid parameters.
+    Returns:
+        dict: Report parameters.
+    """
+
+    config_parser = parser_config()
+    args = config_parser.parse_args()
+
+    try:
+        return read_parameters(args.parameters_file)
+    except ValueError as error:
+        config_parser.error(str(error))
\ No newline at end of file
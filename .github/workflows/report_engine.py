@@ -0,0 +1,478 @@
+# Shared stages of the client reports
+
+# Python packages
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from aggregate_store import configure_aggregates, totals_window
+from downsampling import configure_downsampling
+from frame_dtypes import compact_frame, configure_dtypes
+from funciones_ioa import ioa as ioa
+from lazy_import import lazy_import
+from ph_bands import CONFORT, band_limits, classify_ph
+from report_assets import configure_assets
+from report_cli import parse_report_args, read_parameters
+from report_labels import month_labels
+from report_render import configure_render, preview_section, writes_report
+from report_time import add_calendar_columns, decode_time
+from report_writer import ReportWriter
+from sensor_fetch import (
+    configure_cache,
+    configure_fetch,
+    fetch_sensor_data,
+    get_sensor_columns,
+)
+
+pio = lazy_import("plotly.io")
+
+# Fetch periods of ioa, from the finest to the coarsest
+PERIODS = ("", "1H", "1D")
+
+
+def load_parameters(parameters_file: str) -> dict:
+    """Read the report parameters and apply the shared settings
+    Args:
+        parameters_file (str): JSON file with the report parameters.
+    Returns:
+        dict: Report parameters.
+    """
+
+    json_dict = read_parameters(parameters_file)
+
+    configure_report(json_dict)
+
+    return json_dict
+
+
+def configure_report(json_dict: dict):
+    """Apply the cache, fetch, downsampling, assets, render, dtypes and
+    aggregates settings
+    Args:
+        json_dict (dict): Report parameters.
+    """
+
+    configure_cache(json_dict.get("cache"))
+
+    configure_fetch(json_dict.get("fetch"))
+
+    configure_downsampling(json_dict.get("downsample"))
+
+    configure_assets(json_dict.get("assets"))
+
+    configure_render(json_dict.get("render"))
+
+    configure_dtypes(json_dict.get("dtypes"))
+
+    configure_aggregates(json_dict.get("aggregates"))
+
+
+def report_params(spec: dict, json_dict: dict) -> dict:
+    """Parameters the report stages and sections read
+    Args:
+        spec (dict): Report spec, see run_report.
+        json_dict (dict): Report parameters.
+    Returns:
+        dict: Band thresholds and their per-sensor thresholds, see
+            ph_bands.band_limits, plus company, farm, timezone and the
+            sensor_rules of the spec, updated by the parameters' ones.
+    """
+
+    params = json_dict.get("params", {})
+
+    return dict(
+        params,
+        company=spec.get("company", json_dict["company"]),
+        farm=spec.get("farm", json_dict["farm"]),
+        timezone=json_dict.get("timezone"),
+        thresholds=params.get("thresholds", {}),
+        sensor_rules=dict(
+            spec.get("sensor_rules", {}), **params.get("sensor_rules", {})
+        ),
+    )
+
+
+def plan_sources(spec: dict) -> dict:
+    """Sources of a report with the coarsest fetch period its sections allow
+
+    A section lists in resolution the period it needs of each source it
+    reads, exp({"water": "1D"}) for day, week and month totals. A section
+    without resolution needs every source at the source period, so a
+    source is only fetched coarser when all its sections allow it.
+
+    Day totals fetched at 1D are only the ones computed from 1H when the
+    ioa day buckets start at local midnight of the report timezone, the
+    days rollups groups the hours by, so the timezone of the parameters
+    has to be the zone ioa buckets the days of the company in.
+    Args:
+        spec (dict): Report spec, see run_report.
+    Returns:
+        dict: name -> source, with the planned period.
+    """
+
+    sources = {}
+    for name, source in spec["sources"].items():
+        finest = source.get("period", "1H")
+        needed = [
+            section.get("resolution", {name: finest}).get(name)
+            for section in spec["sections"]
+        ]
+        period = min(
+            (x for x in needed if x is not None),
+            key=PERIODS.index,
+            default=finest,
+        )
+        sources[name] = dict(source, period=period)
+
+    return sources
+
+
+def report_period(json_dict: dict, now: datetime = None) -> tuple:
+    """Start and end dates of a report
+    Args:
+        json_dict (dict): Report parameters.
+        now (datetime): End of the reports without end_date, now if None.
+    Returns:
+        tuple: ini_date and end_date.
+    """
+
+    ini_date = datetime.strptime(json_dict["start_date"], "%Y-%m-%d")
+    end_date = json_dict["end_date"]
+    if end_date is None:
+        end_date = now or datetime.now()
+    else:
+        end_date = datetime.strptime(end_date, "%Y-%m-%d")
+
+    return ini_date, end_date
+
+
+def select_sensors(
+    df_sensors: pd.DataFrame,
+    type_value: str,
+    farm: str = None,
+    name_contains: str = None,
+) -> pd.DataFrame:
+    """Filter the devices of a company
+    Args:
+        df_sensors (pd.DataFrame): Devices of a company and type of value.
+        type_value (str): Type of sensor value exp('pH','water')
+        farm (str): Keep only the sensors of this farm, all if None.
+        name_contains (str): Keep only the sensors whose name has it.
+    Returns:
+        pd.DataFrame: Sensors info Dataframe.
+    """
+
+    if name_contains is not None:
+        df_sensors = df_sensors[
+            df_sensors.sensorName.str.contains(name_contains)
+        ]
+    if farm is not None:
+        df_sensors = df_sensors[df_sensors.farmName == farm]
+
+    df_sensors = df_sensors.copy()
+    df_sensors["noGalpon"] = df_sensors["barnName"].str.split("|").str[-1]
+    df_sensors["House"] = df_sensors["noGalpon"]
+    df_sensors["sensor"] = df_sensors[
+        "kind" if type_value == "pH" else "sensorName"
+    ]
+
+    return df_sensors
+
+
+def get_sensors(
+    company: str,
+    type_value: str,
+    farm: str = None,
+    name_contains: str = None,
+) -> pd.DataFrame:
+    """Return sensors by type of value
+    Args:
+        company (str): Company Name
+        type_value (str): Type of sensor value exp('pH','water')
+        farm (str): Keep only the sensors of this farm, all if None.
+        name_contains (str): Keep only the sensors whose name has it.
+    Returns:
+        pd.DataFrame: Sensors info Dataframe.
+    """
+
+    return select_sensors(
+        ioa._get_devices_in_company_mongo(company, type_value),
+        type_value,
+        farm=farm,
+        name_contains=name_contains,
+    )
+
+
+def source_sensors(source: dict, params: dict) -> pd.DataFrame:
+    """Sensors of a report source
+    Args:
+        source (dict): Source of the report spec, see run_report.
+        params (dict): Report parameters with the company and farm.
+    Returns:
+        pd.DataFrame: Sensors info Dataframe.
+    """
+
+    return get_sensors(
+        params["company"],
+        source["type_value"],
+        farm=params["farm"] if source.get("by_farm") else None,
+        name_contains=source.get("name_contains"),
+    )
+
+
+def melt_values(
+    df: pd.DataFrame, type_value: str, timezone: str = None
+) -> pd.DataFrame:
+    """Long sensor frame to the report rows
+    Args:
+        df (pd.DataFrame): timestamp, Sensor and value per reading, see
+            sensor_fetch.to_long_frame.
+        type_value (str): Name of the value column exp(pH, water)
+        timezone (str): Zone of the timestamps, host zone if None
+    Returns:
+        pd.DataFrame: time, Sensor, value, date and hour columns, with the
+            attrs of df.
+    """
+
+    rows = pd.DataFrame(
+        {
+            "time": decode_time(df.timestamp, timezone).to_numpy(),
+            "Sensor": df["Sensor"].array,
+            type_value: df["value"].to_numpy(),
+        }
+    )
+    rows.attrs.update(df.attrs)
+
+    add_calendar_columns(rows, ["date", "hour"])
+
+    return rows
+
+
+def process_ph(df: pd.DataFrame, source: dict, params: dict) -> pd.DataFrame:
+    """Label and classify the pH values of a report source
+    Args:
+        df (pd.DataFrame): pH rows from melt_values.
+        source (dict): pH source of the report spec, see run_report.
+        params (dict): Report parameters with the band thresholds.
+    Returns:
+        pd.DataFrame: pH values with labels, bands and calendar columns.
+    """
+
+    if source.get("until") is not None:
+        df = df[df.time <= np.datetime64(source["until"])].copy()
+
+    df["Sensor"] = source["sensor"]
+    df["House"] = source["house"]
+    df["sensor"] = source["sensor"]
+    df["sensors"] = source["house"] + " - " + source["sensor"]
+
+    df["banda_pH"] = classify_ph(
+        df.pH, **band_limits(df["sensors"], params["thresholds"], params)
+    )
+    df["confort_pH"] = df["banda_pH"] == CONFORT
+
+    if source.get("programa") is not None:
+        df["programa"] = np.where(
+            df["time"] <= pd.Timestamp(source["programa"]), "Antes", "Después"
+        )
+
+    df.sort_values(["time"], inplace=True)
+
+    df["month"] = month_labels(df["time"])
+    df["month_year"] = df["time"].dt.to_period("M")
+
+    if source.get("hours") is not None:
+        first, last = source["hours"]
+        df = df[(df.hour >= first) & (df.hour < last)]
+
+    return df
+
+
+def load_source(
+    source: dict,
+    params: dict,
+    ini_date: datetime,
+    end_date: datetime,
+    df: pd.DataFrame = None,
+    df_sensors: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """Fetch and process the sensors of a report source
+
+    Fetched sensors go through melt_values one by one while the rest are
+    still being fetched, see sensor_fetch.fetch_sensor_data.
+    Args:
+        source (dict): Source of the report spec, see run_report.
+        params (dict): Report parameters.
+        ini_date (datetime): Start date.
+        end_date (datetime): End date.
+        df (pd.DataFrame): Already fetched long frame, fetched if None.
+        df_sensors (pd.DataFrame): Sensors to fetch, see source_sensors,
+            looked up if None.
+    Returns:
+        pd.DataFrame: pH rows from process_ph for pH sources, melt_values
+            rows otherwise, with the compact_frame dtypes.
+    """
+
+    def melt(df: pd.DataFrame) -> pd.DataFrame:
+        return melt_values(df, source["type_value"], params.get("timezone"))
+
+    if df is None:
+        if df_sensors is None:
+            df_sensors = source_sensors(source, params)
+
+        if df_sensors.empty:
+            raise ValueError("No sensors found")
+
+        # Period '' (no agg) , '1H' , '1D'
+        df = fetch_sensor_data(
+            df_sensors,
+            ini_date,
+            end_date,
+            period=source.get("period", "1H"),
+            process=melt,
+        )
+    else:
+        df = melt(df)
+
+    if df.attrs.get("coerced") or df.attrs.get("invalid"):
+        print(
+            f"{source['type_value']}: {df.attrs['coerced']} readings "
+            f"coerced to float, {df.attrs['invalid']} invalid dropped"
+        )
+
+    if df.empty:
+        raise ValueError("No data found")
+
+    if source["type_value"] == "pH":
+        df = process_ph(df, source, params)
+
+    return compact_frame(df, source["type_value"])
+
+
+def run_report(spec: dict, json_dict: dict, fetched: dict = None) -> str:
+    """Build a client report from its spec
+
+    The spec is a dict with:
+        sources: name -> source. A source has the type_value of its
+            sensors, by_farm to keep only the report farm, name_contains
+            and the finest fetch period, 1H by default, and aggregates to
+            keep the day totals of prepare in the aggregate store. pH
+            sources also have the house and sensor labels and optionally
+            the programa start date, an until cutoff and the (first,
+            last) hours kept.
+        sensor_rules: Unit and outlier rule per sensor name, see
+            sensor_rules.apply_sensor_rules. A "sensor_rules" report
+            parameter adds or replaces rules.
+        prepare: Function of (frames, params) returning the frames and
+            values the sections use, by name.
+        sections: Report sections, each with the plot function, the
+            names of its args, title, subtitle, text and type, and the
+            resolution it needs of each source, see plan_sources. Graph
+            sections may have a plotly config for the figure.
+        company, farm: Fixed names, the parameter file ones if missing.
+        heading, date_format, file_date_format: Report heading and dates.
+        template: Plotly template of the figures.
+    Args:
+        spec (dict): Report spec.
+        json_dict (dict): Report parameters from load_parameters.
+        fetched (dict): Long frame per source name fetched beforehand,
+            see report_batch.
+    Returns:
+        str: Path of the report, None when the render mode only previews.
+    """
+
+    params = report_params(spec, json_dict)
+    ini_date, end_date = report_period(json_dict)
+    sources = plan_sources(spec)
+    fetched = fetched or {}
+
+    pio.templates.default = spec.get("template", "plotly_white")
+
+    # Sources kept in the aggregate store only fetch the days it lacks.
+    # The store key has the sensor names, so adding or removing a sensor
+    # starts new totals instead of mixing with the stored ones.
+    params["stored_totals"] = {}
+    frames = {}
+    for name, source in sources.items():
+        df, df_sensors, stored = fetched.get(name), None, None
+        if source.get("aggregates"):
+            if df is None:
+                df_sensors = source_sensors(source, params)
+                columns = get_sensor_columns(df_sensors)
+                sensors = [column for _, column in columns]
+            else:
+                sensors = df["Sensor"].cat.categories.tolist()
+            stored = totals_window(
+                {
+                    "report": json_dict["report_name"][0],
+                    "source": dict(source, name=name),
+                    "sensors": sorted(sensors),
+                    "company": params["company"],
+                    "farm": params["farm"],
+                    "timezone": params["timezone"],
+                    "sensor_rules": params["sensor_rules"],
+                },
+                ini_date,
+                end_date,
+                params["timezone"],
+            )
+            params["stored_totals"][name] = stored
+
+        frames[name] = load_source(
+            source,
+            params,
+            ini_date if stored is None else stored.fetch_start,
+            end_date,
+            df,
+            df_sensors,
+        )
+    context = dict(params, **spec["prepare"](frames, params))
+
+    current_date = time.strftime(spec.get("file_date_format", "%d-%m-%y"))
+    report_path = json_dict["report_name"][0] + " " + current_date + ".html"
+
+    if writes_report():
+        writer = ReportWriter(
+            report_path,
+            com_farm=params["company"] + " - " + params["farm"],
+            heading=spec.get("heading", "H2Okuo Reporting"),
+            date_format=spec.get("date_format", "%d-%m-%Y"),
+        )
+    else:
+        writer, report_path = nullcontext(), None
+
+    with writer as report:
+        for section in spec["sections"]:
+            data = {
+                "values": section["plot"](
+                    *[context[name] for name in section["args"]]
+                ),
+                "title": section["title"],
+                "subtitle": section["subtitle"],
+                "text": section["text"],
+                "type": section["type"],
+                "config": section.get("config"),
+            }
+            preview_section(data["values"], data["type"], data["config"])
+            if report is not None:
+                report.write_section(data)
+
+    return report_path
+
+
+def report_main(spec: dict, json_dict: dict = None):
+    """Command line entry point of a client report
+    Args:
+        spec (dict): Report spec, see run_report.
+        json_dict (dict): Parameters from report_cli.parse_report_args, read
+            from the command line if None.
+    """
+
+    if json_dict is None:
+        json_dict = parse_report_args()
+
+    configure_report(json_dict)
+
+    run_report(spec, json_dict)
\ No newline at end of file
@@ -0,0 +1,115 @@
+# Spanish calendar labels for the report plots
+
+# Month names are looked up by month code in fixed tables, so the labels
+# do not depend on the host having a Spanish locale installed, which
+# dt.month_name(locale="Spanish") needs.
+
+# Python packages
+import numpy as np
+import pandas as pd
+
+MONTHS = (
+    "Enero",
+    "Febrero",
+    "Marzo",
+    "Abril",
+    "Mayo",
+    "Junio",
+    "Julio",
+    "Agosto",
+    "Septiembre",
+    "Octubre",
+    "Noviembre",
+    "Diciembre",
+)
+
+MONTHS_SHORT = (
+    "En",
+    "Feb",
+    "Mar",
+    "Abr",
+    "May",
+    "Jun",
+    "Jul",
+    "Ago",
+    "Sept",
+    "Oct",
+    "Nov",
+    "Dic",
+)
+
+
+def _lookup(names: tuple, codes: np.ndarray) -> np.ndarray:
+    """Names of the month codes, code -1 gives NaN"""
+
+    return np.array(names + (np.nan,), dtype=object)[codes]
+
+
+def _month_codes(time: pd.Series) -> np.ndarray:
+    """Month codes 0-11 of a datetime Series, -1 for NaT"""
+
+    return time.dt.month.fillna(0).to_numpy(dtype="int64") - 1
+
+
+def month_labels(time: pd.Series, short: bool = False) -> pd.Series:
+    """Spanish month name of every row
+    Args:
+        time (pd.Series): datetime64 values.
+        short (bool): Abbreviated names exp(En, Feb) instead of Enero.
+    Returns:
+        pd.Series: Month names, NaN for NaT.
+    """
+
+    return pd.Series(
+        _lookup(MONTHS_SHORT if short else MONTHS, _month_codes(time)),
+        index=time.index,
+    )
+
+
+def month_year_labels(time: pd.Series) -> pd.Series:
+    """Month and year of every row exp(Enero-2022)
+
+    Like date_labels, each distinct month is formatted once.
+    Args:
+        time (pd.Series): datetime64 values.
+    Returns:
+        pd.Series: Month-year labels, NaN for NaT.
+    """
+
+    year = time.dt.year.fillna(0).to_numpy(dtype="int64")
+    keys, codes = np.unique(
+        year * 12 + _month_codes(time), return_inverse=True
+    )
+    labels = np.array(
+        [f"{MONTHS[k % 12]}-{k // 12}" if k >= 0 else np.nan for k in keys],
+        dtype=object,
+    )
+
+    return pd.Series(labels[codes], index=time.index)
+
+
+def date_labels(dates: pd.Series) -> pd.Series:
+    """Day, short month and year of every row exp(5-Ago-2022)
+
+    Each distinct date is formatted once and the labels are taken back by
+    code, daily reports repeat every date once per sensor.
+    Args:
+        dates (pd.Series): datetime.date or datetime64 values.
+    Returns:
+        pd.Series: Date labels, NaN for missing dates.
+    """
+
+    codes, uniques = pd.factorize(dates)
+    uniques = pd.Series(pd.to_datetime(uniques))
+    labels = (
+        uniques.dt.day.astype(str)
+        + "-"
+        + _lookup(MONTHS_SHORT, _month_codes(uniques))
+        + "-"
+        + uniques.dt.year.astype(str)
+    )
+
+    return pd.Series(
+        np.append(labels.to_numpy(dtype=object), np.nan)[codes],
+        index=dates.index,
+    )
\ No newline at end of file
@@ -0,0 +1,54 @@
+# Rendering mode of the report figures
+
+MODES = ("headless", "preview", "both")
+
+# Set by configure_render from the report parameters
+RENDER = "headless"
+
+
+def configure_render(params: dict = None):
+    """Select where the report sections are rendered
+
+    headless only writes the HTML report, which is what scheduled and batch
+    runs use. preview shows every section with fig.show() in the notebook
+    or browser instead of writing the report, and both does the two.
+    Args:
+        params (dict): mode exp('headless', 'preview', 'both')
+    """
+
+    global RENDER
+
+    mode = (params or {}).get("mode", "headless")
+    if mode not in MODES:
+        raise ValueError(f"Unknown render mode: {mode}")
+
+    RENDER = mode
+
+
+def writes_report() -> bool:
+    """Whether the configured mode writes the HTML report"""
+
+    return RENDER != "preview"
+
+
+def preview_section(values, kind: str, config: dict = None):
+    """Show a report section if the configured mode previews them
+    Args:
+        values (go.Figure or pd.DataFrame): Section values.
+        kind (str): Section type exp('Graph', 'Table')
+        config (dict): Plotly config of a Graph, the default one if None.
+    """
+
+    if RENDER == "headless":
+        return
+
+    if kind == "Graph" and config is not None:
+        values.show(config=config)
+    elif kind == "Graph":
+        values.show()
+    elif kind == "Table":
+        try:
+            from IPython.display import display
+        except ImportError:
+            display = print
+        display(values)
\ No newline at end of file
@@ -0,0 +1,85 @@
+# Vectorized timestamp decoding for the report scripts
+
+# Python packages
+import time
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# UTC offsets only change on quarter hour boundaries
+QUARTER_MS = 15 * 60 * 1000
+
+
+def decode_time(timestamp: pd.Series, timezone: str = None) -> pd.Series:
+    """Convert epoch milliseconds to naive wall-clock datetimes
+    Args:
+        timestamp (pd.Series): Epoch milliseconds from ioa.
+        timezone (str): IANA zone exp('America/Bogota'), host zone if None.
+    Returns:
+        pd.Series: datetime64 wall-clock time in timezone.
+    """
+
+    if timezone is not None:
+        return (
+            pd.to_datetime(timestamp, unit="ms", utc=True)
+            .dt.tz_convert(timezone)
+            .dt.tz_localize(None)
+        )
+
+    # Host zone, as datetime.fromtimestamp: look the offset up once per
+    # quarter hour bucket instead of once per row.
+    ms = timestamp.to_numpy(dtype="int64")
+    buckets, inverse = np.unique(ms // QUARTER_MS, return_inverse=True)
+    offsets = np.array(
+        [time.localtime(x * QUARTER_MS // 1000).tm_gmtoff for x in buckets],
+        dtype="int64",
+    )
+
+    return pd.Series(
+        pd.to_datetime(ms + offsets[inverse] * 1000, unit="ms"),
+        index=timestamp.index,
+    )
+
+
+def add_calendar_columns(
+    df: pd.DataFrame, columns: Iterable[str], time_column: str = "time"
+) -> pd.DataFrame:
+    """Derive the calendar columns used by the reports in one pass
+
+    hour, semana and mes are int8 and year int16, the smallest types that
+    hold them. week is the ISO year and week label exp('2021-W52'), which
+    sorts in time order across years where semana does not.
+    Args:
+        df (pd.DataFrame): Frame with a datetime64 time column.
+        columns (Iterable[str]): Any of date, hour, semana, week, mes,
+            year.
+        time_column (str): Name of the time column.
+    Returns:
+        pd.DataFrame: df with the requested columns added.
+    """
+
+    dt = df[time_column].dt
+
+    for column in columns:
+        if column == "date":
+            df["date"] = dt.date
+        elif column == "hour":
+            df["hour"] = dt.hour.astype("int8")
+        elif column == "semana":
+            # ISO week, week 52 is reported as week 0
+            semana = dt.isocalendar().week.astype("int8")
+            df["semana"] = semana.where(semana != 52, 0)
+        elif column == "week":
+            iso = dt.isocalendar()
+            df["week"] = (
+                iso.year.astype(str) + "-W" + iso.week.astype(str).str.zfill(2)
+            )
+        elif column == "mes":
+            df["mes"] = dt.month.astype("int8")
+        elif column == "year":
+            df["year"] = dt.year.astype("int16")
+        else:
+            raise ValueError(f"Unknown calendar column: {column}")
+
+    return df
\ No newline at end of file
@@ -0,0 +1,175 @@
+# Streaming HTML writer of the reports
+
+# Python packages
+import os
+import time
+
+from lazy_import import lazy_import
+from report_assets import head_tags, logo_tag
+
+offline = lazy_import("plotly.offline")
+
+HEAD = """
+<!DOCTYPE html>
+<html>
+    <head>
+    """
+
+STYLE = """
+        <meta charset="UTF-8">
+        <style type="text/css">
+            h3 {text-align: left;font-family: Helvetica Neue;}
+            h4 {text-align: left;font-family: Helvetica Neue;}
+            h5 {text-align: left;font-family: Helvetica Neue; color: gray; }
+            h6 {text-align: center;font-family: Helvetica Neue; color: gray; }
+            table { margin-left: auto;margin-right: auto;width:'20%'}
+            table, th, td {border: 1px solid black;border-collapse: collapse;}
+            th, td {padding: 5px;text-align: center;font-family: Helvetica Neue;font-size: 90%;}
+            table tbody tr:hover {background-color: #dddddd;}
+            .wide {width: 90%; }
+            .text{margin-left: 5%;margin-right: 5%;}
+            .container{padding-bottom:3%;}
+            .title{text-align: center;font-family: Helvetica Neue;}
+            
+        </style>
+    </head>
+    <body style="margin-left:12%;margin-right:12%;margin-top:3%;margin-bottom:3%;padding-left:3%;padding-right:3%;padding-top:3%;
+    box-shadow: 0 5px 9px 0 rgba(0, 0, 0, 0.5), 0 6px 20px 0 rgba(0, 0, 0, 0.19);border-radius:10px">
+    """
+
+FOOTER = """
+    </body>
+</html>
+"""
+
+
+class ReportWriter:
+    """Write a report section by section to a file or a file-like sink
+
+    Each section is rendered and written as soon as it is produced, so
+    only one section is held in memory instead of the whole document.
+    A path is written to a temporary file that replaces it on close, so
+    a report that fails half way never overwrites a complete one. Text
+    sinks such as io.StringIO are written directly and left open.
+    Args:
+        sink (str or file-like): Output path or open text sink.
+        com_farm (str): Company and farm line of the report.
+        heading (str): Report heading.
+        date_format (str): strftime format of the report date.
+    """
+
+    def __init__(
+        self,
+        sink,
+        com_farm: str,
+        heading: str = "H2Okuo Reporting",
+        date_format: str = "%d-%m-%Y",
+    ):
+        self.sink = sink
+        self.com_farm = com_farm
+        self.heading = heading
+        self.date_format = date_format
+        self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(complete=exc_type is None)
+
+    def open(self):
+        """Start the document with the head, logo and report heading"""
+
+        report_path = None
+        if isinstance(self.sink, (str, os.PathLike)):
+            report_path = self.sink
+            self._tmp = f"{self.sink}.{os.getpid()}.tmp"
+            self._file = open(self._tmp, "w", encoding="utf-8")
+        else:
+            self._file = self.sink
+
+        self._file.write(HEAD)
+        self._file.write(head_tags(report_path))
+        self._file.write(STYLE)
+        self._file.write(logo_tag(report_path))
+        self._file.write('<div class="container">')
+        self._file.write(
+            "<h2 class=title><strong> %s </strong></h2>\n" % self.heading
+        )
+        self._file.write(
+            "<h3 class=title><strong> %s </strong></h3>\n" % self.com_farm
+        )
+        self._file.write(
+            "<h4 class=title><strong> %s </strong></h4>\n"
+            % time.strftime(self.date_format)
+        )
+        self._file.write('<div class="container">')
+        self._file.write("</div>")
+
+        return self
+
+    def write_section(self, data: dict):
+        """Render one report section
+        Args:
+            data (dict): values, title, subtitle, text and type
+                exp(Graph, Table) of the section, and optionally the
+                plotly config of a Graph, no mode bar by default.
+        """
+
+        if data["title"] != None:
+            self._file.write(
+                "<h3><strong> %s </strong></h3>\n" % data["title"]
+            )
+        if data["subtitle"] != None:
+            self._file.write(
+                "<h4><strong> %s </strong></h4>\n" % data["subtitle"]
+            )
+        if data["text"] != None:
+            self._file.write('<h5 class="text"> %s </h5>\n' % data["text"])
+
+        if data["type"] == "Table":
+            self._file.write(
+                data["values"].to_html(
+                    classes="wide", escape=False, index=False
+                )
+            )
+        elif data["type"] == "Graph":
+            self._file.write(
+                offline.plot(
+                    data["values"],
+                    config=data.get("config") or {"displayModeBar": False},
+                    show_link=False,
+                    include_plotlyjs=False,
+                    output_type="div",
+                )
+            )
+        else:
+            self._file.write(
+                "<h3><strong> %s </strong></h3>\n" % "Ningun tipo coincide"
+            )
+
+        self._file.write('<div class="container">')
+        self._file.write("</div>")
+
+    def close(self, complete: bool = True):
+        """Write the footer and publish the report
+        Args:
+            complete (bool): False drops an unfinished file report.
+        """
+
+        if complete:
+            self._file.write('<div style="text-align: center">')
+            self._file.write("<h6>¿Quieres saber mas?</h6>")
+            self._file.write(
+                '<a href="https://app.asimetrix.co/auth/login" rel="noopener" style="text-decoration:underline;color:#0068a5" target="_blank"><h6>%s</h6></a>\n'
+                % '<strong> <font color="#0068a5">www.asimetrix.co </font></strong>'
+            )
+            self._file.write('<div class="container">')
+            self._file.write(FOOTER)
+
+        if self._file is not self.sink:
+            self._file.close()
+            if complete:
+                os.replace(self._tmp, self.sink)
+            else:
+                os.remove(self._tmp)
\ No newline at end of file
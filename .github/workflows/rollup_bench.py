@@ -0,0 +1,197 @@
+# Rollup benchmark of the water reports
+
+# Adds up hourly water readings of the fake sensor API into day, week and
+# month totals per sensor, once with the groupby chain of the original
+# CERVALLE process_water, get_weekly_df and get_monthly_df and once with
+# rollups.rollup, and fails when a total differs or the rollup is not
+# faster. Best of 3.
+
+# Python packages
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+from golden_check import FIXTURES, TIMEZONE
+
+# Sensors and days of a small, a medium and a large report
+SIZES = ((2, 245), (10, 365), (50, 365))
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Rollup Benchmark",
+        description="Time rollups.rollup against the groupby chain",
+    )
+
+    config_parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs of each aggregation, the best one is kept",
+    )
+
+    return config_parser.parse_args()
+
+
+def chain(df_water) -> dict:
+    """Day, week and month totals as the CERVALLE functions built them
+    Args:
+        df_water (pd.DataFrame): water rows from melt_values.
+    Returns:
+        dict: day, week and month tables.
+    """
+
+    from report_labels import month_labels
+    from report_time import add_calendar_columns
+
+    df_water = df_water.copy()
+    add_calendar_columns(df_water, ["semana", "mes"])
+    df_water["monthName"] = month_labels(df_water["time"])
+
+    day = (
+        df_water.groupby(
+            ["date", "mes", "monthName", "semana", "Sensor"], observed=True
+        )["water"]
+        .sum()
+        .reset_index()
+    )
+
+    week = (
+        day.groupby(["Sensor", "monthName", "mes", "semana"], observed=True)
+        .agg({"water": ["sum"]})
+        .reset_index()
+    )
+    week.columns = ["_".join(x) for x in week.columns]
+    week.rename(
+        columns={
+            "monthName_": "monthName",
+            "mes_": "mes",
+            "Sensor_": "Sensor",
+            "semana_": "semana",
+            "water_sum": "water",
+        },
+        inplace=True,
+    )
+
+    month = (
+        week.groupby(["Sensor", "mes", "monthName"], observed=True)
+        .agg({"water": ["sum"]})
+        .reset_index()
+    )
+    month.columns = ["_".join(x) for x in month.columns]
+    month.rename(
+        columns={
+            "mes_": "mes",
+            "monthName_": "monthName",
+            "Sensor_": "Sensor",
+            "water_sum": "water",
+        },
+        inplace=True,
+    )
+
+    return {"day": day, "week": week, "month": month}
+
+
+def same_totals(old, new, keys: list) -> bool:
+    """Whether two tables have the same water total per key
+    Args:
+        old (pd.DataFrame): chain table.
+        new (pd.DataFrame): rollup table.
+        keys (list): Columns of a row.
+    Returns:
+        bool: Same keys and totals up to float rounding.
+    """
+
+    import numpy as np
+
+    old = old.astype({key: str for key in keys})
+    new = new.astype({key: str for key in keys})
+    merged = old.merge(new, on=keys, how="outer", suffixes=("_old", "_new"))
+
+    return len(merged) == len(old) == len(new) and np.allclose(
+        merged["water_old"], merged["water_new"], rtol=1e-9
+    )
+
+
+def best(function, df, repeat: int) -> tuple:
+    """Result and best time of a few runs"""
+
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function(df)
+        seconds.append(time.perf_counter() - started)
+
+    return result, min(seconds)
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    import pandas as pd
+    from funciones_ioa import ioa
+
+    from report_engine import melt_values
+    from rollups import rollup
+    from sensor_fetch import to_long_frame
+
+    keys = {
+        "day": ["Sensor", "date"],
+        "week": ["Sensor", "mes", "semana"],
+        "month": ["Sensor", "mes"],
+    }
+
+    failed = False
+    print(
+        f"{'sensors':<10}{'days':>6}{'rows':>10}{'chain ms':>10}"
+        f"{'rollup ms':>11}"
+    )
+    for sensors, days in SIZES:
+        ini_date = datetime(2021, 1, 1)
+        end_date = ini_date + pd.Timedelta(days=days)
+        df_water = melt_values(
+            to_long_frame(
+                [
+                    ioa.get_sensor_values(f"water-{i}", ini_date, end_date)
+                    for i in range(sensors)
+                ],
+                [f"Linea {i}" for i in range(sensors)],
+            ),
+            "water",
+        )
+
+        old, old_seconds = best(chain, df_water, args.repeat)
+        new, new_seconds = best(
+            lambda df: rollup(df, "Sensor", ["water"]), df_water, args.repeat
+        )
+
+        problems = []
+        if not all(
+            same_totals(old[level], new[level], keys[level]) for level in keys
+        ):
+            problems.append("totals differ")
+        elif new_seconds >= old_seconds:
+            problems.append("not faster")
+        failed = failed or bool(problems)
+        print(
+            f"{sensors:<10}{days:>6}{len(df_water):>10}"
+            f"{old_seconds * 1000:>10.0f}{new_seconds * 1000:>11.0f}"
+            f"  {'; '.join(problems)}"
+        )
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,143 @@
+# Daily, weekly and monthly totals of the consumption reports
+
+# Python packages
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+from aggregate_store import TotalsWindow
+from report_labels import month_labels, month_year_labels
+from report_time import add_calendar_columns
+
+# Calendar columns of each resolution, besides the group column
+LABELS = {
+    "day": ["date", "year", "mes", "semana", "week", "monthName", "yearMonth"],
+    "week": ["year", "mes", "semana", "week", "monthName", "yearMonth"],
+    "month": ["year", "mes", "monthName", "yearMonth"],
+}
+
+
+def _sums(
+    inverse: np.ndarray,
+    size: int,
+    df: pd.DataFrame,
+    columns: List[str],
+    rows: np.ndarray = None,
+) -> dict:
+    """Sum of the columns per key code, NaN counted as 0 like groupby
+    Args:
+        inverse (np.ndarray): Key code 0 to size - 1 of every row.
+        size (int): Number of key codes.
+        df (pd.DataFrame): Frame with the columns.
+        columns (List[str]): Columns to add up.
+        rows (np.ndarray): Mask of the rows of df inverse is for, all if
+            None.
+    Returns:
+        dict: Sums by column, one per key code.
+    """
+
+    sums = {}
+    for column in columns:
+        weights = np.nan_to_num(df[column].to_numpy(dtype=float))
+        if rows is not None:
+            weights = weights[rows]
+        sums[column] = np.bincount(inverse, weights=weights, minlength=size)
+
+    return sums
+
+
+def rollup(
+    df: pd.DataFrame,
+    group: str,
+    values: List[str],
+    on_day: Callable = None,
+    time_column: str = "time",
+    stored: TotalsWindow = None,
+) -> dict:
+    """Day, week and month totals per group in one pass over the rows
+
+    Every row gets an integer day and group key once, and the day totals
+    are bincount sums over that key instead of a groupby on label columns.
+    Weeks and months are added up from the days the same way, so on_day
+    can mask or derive daily values first, and columns it adds are totalled
+    too. A week is an ISO week within a month, as semana and mes, so a week
+    across two months gives a row in each. Plots of several years go by the
+    week label, semana repeats every year.
+
+    With a stored window of the aggregate store, the rows only need the
+    days from its fetch_start on, the earlier day totals are read back.
+    Args:
+        df (pd.DataFrame): Rows with time_column, group and values.
+        group (str): Column with the sensor or label of every row.
+        values (List[str]): Columns to add up.
+        on_day (Callable): Function applied to the day table in place.
+        time_column (str): Column with the naive datetime of every row.
+        stored (TotalsWindow): Stored day totals to merge, None to use the
+            rows only.
+    Returns:
+        dict: day, week and month tables with group, LABELS and the totals,
+            days ordered by date then group, weeks and months by group
+            then time.
+    """
+
+    codes, groups = pd.factorize(df[group], sort=True)
+    rows = codes >= 0
+    codes = codes[rows]
+    width = max(len(groups), 1)
+
+    days = df[time_column].to_numpy(dtype="datetime64[D]")
+    days = days[rows].astype("int64")
+    start = days.min() if len(days) else 0
+    key = (days - start) * width + codes
+    size = int(key.max()) + 1 if len(key) else 0
+    present = np.flatnonzero(np.bincount(key, minlength=size))
+
+    sums = pd.DataFrame(
+        {group: groups.take(present % width), "day": start + present // width}
+    )
+    for column, total in _sums(key, size, df, values, rows).items():
+        sums[column] = total[present]
+    if stored is not None:
+        sums = stored.merge(sums, group)
+
+    day = pd.DataFrame(
+        {
+            group: sums[group],
+            time_column: sums["day"].to_numpy().astype("datetime64[D]"),
+        }
+    )
+    add_calendar_columns(
+        day, ["date", "year", "mes", "semana", "week"], time_column
+    )
+    day["monthName"] = month_labels(day[time_column])
+    day["yearMonth"] = month_year_labels(day[time_column])
+    for column in values:
+        day[column] = sums[column].to_numpy()
+
+    if on_day is not None:
+        on_day(day)
+
+    keys = [group, time_column] + LABELS["day"]
+    totals = [column for column in day.columns if column not in keys]
+    month = day["year"].to_numpy(dtype="int64") * 12 + day["mes"].to_numpy()
+    periods = {
+        "week": month * 64 + day["semana"].to_numpy(dtype="int64"),
+        "month": month,
+    }
+
+    codes = pd.factorize(day[group], sort=True)[0]
+    tables = {"day": day[[group] + LABELS["day"] + totals]}
+    for resolution, period in periods.items():
+        _, first, inverse = np.unique(
+            np.column_stack([codes, period]),
+            axis=0,
+            return_index=True,
+            return_inverse=True,
+        )
+        table = day[[group] + LABELS[resolution]].iloc[first]
+        table = table.reset_index(drop=True)
+        for column, total in _sums(inverse, len(first), day, totals).items():
+            table[column] = total
+        tables[resolution] = table
+
+    return tables
\ No newline at end of file
@@ -0,0 +1,267 @@
+# On-disk cache of ioa.get_sensor_values
+
+# Python packages
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import List
+
+import pandas as pd
+from funciones_ioa import ioa as ioa
+
+HOUR_MS = 3600 * 1000
+
+# Length of the ioa buckets of each period, raw values are not bucketed
+BUCKETS = {"1H": "H", "1D": "D"}
+
+
+def to_ms(date: datetime, timezone: str = None) -> int:
+    # Naive dates are local time unless a timezone is given, the same
+    # convention process_data uses with datetime.fromtimestamp.
+    if timezone is None:
+        return int(date.timestamp() * 1000)
+    return pd.Timestamp(date).tz_localize(timezone).value // 10**6
+
+
+def from_ms(ms: int, timezone: str = None) -> datetime:
+    if timezone is None:
+        return datetime.fromtimestamp(ms / 1000)
+    return (
+        pd.Timestamp(ms, unit="ms", tz="UTC")
+        .tz_convert(timezone)
+        .tz_localize(None)
+        .to_pydatetime()
+    )
+
+
+def bucket_start(ms: int, period: str, timezone: str = None) -> int:
+    # ioa day buckets start at local midnight, so the floor is taken on the
+    # wall-clock time in timezone and not on the epoch milliseconds.
+    if period not in BUCKETS:
+        return ms
+    start = pd.Timestamp(from_ms(ms, timezone)).floor(BUCKETS[period])
+    return to_ms(start.to_pydatetime(), timezone)
+
+
+def month_bounds(month: str) -> tuple:
+    start = pd.Timestamp(month + "-01", tz="UTC")
+    end = start + pd.offsets.MonthBegin(1)
+    return start.value // 10**6, end.value // 10**6
+
+
+def merge_intervals(intervals: List[list]) -> List[list]:
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_intervals(start: int, end: int, covered: List[list]) -> List[list]:
+    missing = []
+    for covered_start, covered_end in merge_intervals(covered):
+        if covered_end <= start or covered_start >= end:
+            continue
+        if covered_start > start:
+            missing.append([start, covered_start])
+        start = max(start, covered_end)
+    if start < end:
+        missing.append([start, end])
+    return missing
+
+
+class SensorCache:
+    """Persistent cache of hourly sensor values
+
+    Values are stored as one Parquet file per sensor, period and UTC month
+    under directory/raw_id/period/YYYY-MM.parquet, next to a coverage.json
+    that records which time intervals of each month were already fetched.
+    Only the intervals missing from the coverage are requested to ioa.
+
+    The last refresh_hours before each fetch, and a bucket cut by the end
+    of a request, are never marked as covered, so the buckets that can
+    still change are fetched again on the next run. Naive request dates
+    are read in the `timezone` argument, the host local zone by default.
+    Month files older than max_age_days, or the least recently written
+    ones once the cache exceeds max_size_mb, are evicted together with
+    their coverage.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_age_days: float = None,
+        max_size_mb: float = None,
+        refresh_hours: float = 24,
+        timezone: str = None,
+    ):
+        self.directory = Path(directory)
+        self.max_age = max_age_days and max_age_days * 24 * 3600
+        self.max_size = max_size_mb and max_size_mb * 1024 * 1024
+        self.refresh = int(refresh_hours * HOUR_MS)
+        self.timezone = timezone
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _folder(self, raw_id: str, period: str) -> Path:
+        return (
+            self.directory
+            / str(raw_id).replace(os.sep, "_")
+            / (period or "raw")
+        )
+
+    def _lock(self, folder: Path) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(folder, threading.Lock())
+
+    @staticmethod
+    def _read_coverage(folder: Path) -> dict:
+        path = folder / "coverage.json"
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_coverage(folder: Path, coverage: dict):
+        path = folder / "coverage.json"
+        with open(path.with_suffix(".tmp"), "w") as f:
+            json.dump(coverage, f)
+        os.replace(path.with_suffix(".tmp"), path)
+
+    @staticmethod
+    def _write_month(path: Path, df: pd.DataFrame):
+        if path.exists():
+            df = pd.concat([pd.read_parquet(path), df])
+        df = df.drop_duplicates("timestamp", keep="last").sort_values(
+            "timestamp"
+        )
+        df.to_parquet(path.with_suffix(".tmp"), index=False)
+        os.replace(path.with_suffix(".tmp"), path)
+
+    def _store(
+        self,
+        folder: Path,
+        coverage: dict,
+        df: pd.DataFrame,
+        start,
+        end,
+        period: str,
+    ):
+        if not df.empty:
+            df = pd.DataFrame(
+                {
+                    "timestamp": df["timestamp"].astype("int64"),
+                    "value": pd.to_numeric(df["value"], errors="coerce"),
+                }
+            )
+            df = df[(df.timestamp >= start) & (df.timestamp < end)]
+
+            months = pd.to_datetime(df.timestamp, unit="ms").dt.strftime(
+                "%Y-%m"
+            )
+            for month, df_month in df.groupby(months):
+                self._write_month(folder / (month + ".parquet"), df_month)
+
+        # Buckets inside the refresh window can still change upstream, and
+        # so can the bucket cut by the end, a day summed up to that hour.
+        fetched_at = int(time.time() * 1000) // HOUR_MS * HOUR_MS
+        end = bucket_start(
+            min(end, fetched_at - self.refresh), period, self.timezone
+        )
+
+        month = pd.Timestamp(start, unit="ms").strftime("%Y-%m")
+        while start < end:
+            _, month_end = month_bounds(month)
+            coverage[month] = merge_intervals(
+                coverage.get(month, []) + [[start, min(end, month_end)]]
+            )
+            start = month_end
+            month = pd.Timestamp(start, unit="ms").strftime("%Y-%m")
+
+    def get_sensor_values(
+        self,
+        raw_id: str,
+        ini_date: datetime,
+        end_date: datetime,
+        period: str = "1H",
+    ) -> pd.DataFrame:
+        """Cached replacement of ioa.get_sensor_values
+        Args:
+            raw_id (str): Sensor raw id.
+            ini_date (datetime): Start date.
+            end_date (datetime): End date.
+            period (str): Aggregation period exp('', '1H', '1D')
+        Returns:
+            pd.DataFrame: timestamp and value of the sensor.
+        """
+
+        start = to_ms(ini_date, self.timezone)
+        end = to_ms(end_date, self.timezone)
+        folder = self._folder(raw_id, period)
+
+        with self._lock(folder):
+            folder.mkdir(parents=True, exist_ok=True)
+            coverage = self._read_coverage(folder)
+            covered = [x for month in coverage.values() for x in month]
+
+            for missing_start, missing_end in missing_intervals(
+                start, end, covered
+            ):
+                df = ioa.get_sensor_values(
+                    raw_id,
+                    from_ms(missing_start, self.timezone),
+                    from_ms(missing_end, self.timezone),
+                    period=period,
+                )
+                self._store(
+                    folder, coverage, df, missing_start, missing_end, period
+                )
+                self._write_coverage(folder, coverage)
+
+            paths = [
+                folder / (month + ".parquet")
+                for month in pd.period_range(
+                    pd.Timestamp(start, unit="ms"),
+                    pd.Timestamp(end, unit="ms"),
+                    freq="M",
+                ).strftime("%Y-%m")
+            ]
+            frames = [pd.read_parquet(x) for x in paths if x.exists()]
+
+        if not frames:
+            return pd.DataFrame(columns=["timestamp", "value"])
+
+        df = pd.concat(frames, ignore_index=True)
+        df = df[(df.timestamp >= start) & (df.timestamp < end)]
+
+        return df.reset_index(drop=True)
+
+    def evict(self):
+        """Remove expired month files, then the least recently written ones
+        until the cache fits in max_size_mb"""
+
+        files = sorted(
+            self.directory.glob("*/*/*.parquet"),
+            key=lambda x: x.stat().st_mtime,
+        )
+        total = sum(x.stat().st_size for x in files)
+        now = time.time()
+
+        for path in files:
+            stat = path.stat()
+            expired = self.max_age and now - stat.st_mtime > self.max_age
+            if not expired and not (self.max_size and total > self.max_size):
+                continue
+
+            with self._lock(path.parent):
+                coverage = self._read_coverage(path.parent)
+                coverage.pop(path.stem, None)
+                self._write_coverage(path.parent, coverage)
+                path.unlink()
+            total -= stat.st_size
\ No newline at end of file
@@ -0,0 +1,471 @@
+# Shared sensor fetch engine
+
+# Python packages
+import time
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from frame_dtypes import to_values
+from funciones_ioa import ioa as ioa
+from sensor_cache import SensorCache
+
+MAX_WORKERS = 8
+TIMEOUT = 300
+RETRIES = 2
+BACKOFF = 1.0
+
+# Set by configure_cache from the report parameters
+CACHE = None
+
+# Set by configure_fetch from the report parameters
+CHUNK = None
+
+
+def configure_cache(params: dict = None):
+    """Enable the on-disk cache from the "cache" report parameters
+    Args:
+        params (dict): directory, max_age_days, max_size_mb, refresh_hours
+    """
+
+    global CACHE
+
+    CACHE = SensorCache(**params) if params else None
+
+
+def configure_fetch(params: dict = None):
+    """Set how sensor windows are split from the "fetch" report parameters
+    Args:
+        params (dict): chunk, the pandas frequency of the chunk boundaries
+            exp('MS', '7D'), one call per sensor if missing or None.
+    """
+
+    global CHUNK
+
+    CHUNK = (params or {}).get("chunk")
+
+
+def get_sensor_values(
+    raw_id: str, ini_date: datetime, end_date: datetime, period: str = "1H"
+) -> pd.DataFrame:
+
+    if CACHE is None:
+        return ioa.get_sensor_values(raw_id, ini_date, end_date, period=period)
+
+    return CACHE.get_sensor_values(raw_id, ini_date, end_date, period=period)
+
+
+def get_sensor_columns(df_sensors: pd.DataFrame) -> List[Tuple[str, str]]:
+    """Return the (raw_id, column name) pair of every sensor
+    Args:
+        df_sensors (pd.DataFrame): Sensors info Dataframe.
+    Returns:
+        List[Tuple[str, str]]: raw_id and sensor name per sensor.
+    """
+
+    return [
+        (row["raw_id"], row["sensor"].split("|")[-1])
+        for _, row in df_sensors.iterrows()
+    ]
+
+
+def split_range(
+    ini_date: datetime, end_date: datetime, chunk: str = None
+) -> List[Tuple[datetime, datetime]]:
+    """Split a fetch window at the chunk boundaries
+    Args:
+        ini_date (datetime): Start date.
+        end_date (datetime): End date.
+        chunk (str): pandas frequency of the boundaries exp('MS', '7D'),
+            the whole window if None.
+    Returns:
+        List[Tuple[datetime, datetime]]: Consecutive (start, end) chunks.
+    """
+
+    edges = [ini_date, end_date]
+    if chunk is not None:
+        edges[1:1] = [
+            x.to_pydatetime()
+            for x in pd.date_range(
+                pd.Timestamp(ini_date).normalize(), end_date, freq=chunk
+            )
+            if ini_date < x < end_date
+        ]
+
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def stitch_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Join the chunk frames of a sensor in order
+
+    The API can return the boundary bucket in both chunks next to it, only
+    the first one is kept.
+    Args:
+        chunks (List[pd.DataFrame]): get_sensor_values result per chunk.
+    Returns:
+        pd.DataFrame: timestamp and value of the whole window.
+    """
+
+    chunks = [x for x in chunks if len(x)] or chunks[:1]
+    if len(chunks) == 1:
+        return chunks[0]
+
+    df = pd.concat(chunks, ignore_index=True)
+
+    return df[~df["timestamp"].duplicated()].reset_index(drop=True)
+
+
+def _timed_call(started: dict, key: tuple, delay: float, *args, **kwargs):
+
+    if delay:
+        time.sleep(delay)
+
+    started[key] = time.monotonic()
+
+    return get_sensor_values(*args, **kwargs)
+
+
+def fetch_sensor_frames(
+    raw_ids: List[str],
+    ini_date: datetime,
+    end_date: datetime,
+    period: str = "1H",
+    max_workers: int = MAX_WORKERS,
+    timeout: float = TIMEOUT,
+    retries: int = RETRIES,
+    consume: Callable = None,
+) -> List[pd.DataFrame]:
+    """Fetch the values of many sensors over a bounded thread pool
+
+    Each sensor window is one call, or with a CHUNK frequency is split into
+    chunks fetched as separate calls, so a long report with few sensors
+    neither waits on one large request per sensor nor times it out as a
+    whole. Reports opt in with the "fetch" parameters, chunks only pay off
+    when there are fewer sensors than workers. Sensors are submitted
+    max_workers at a time, chunk by chunk across them, so sensors complete
+    group after group and the chunks of a sensor are stitched as soon as
+    its last one arrives.
+    A consume function then processes that sensor in this thread, so its
+    pandas work overlaps the calls the pool is still waiting on.
+    Args:
+        raw_ids (List[str]): Sensor raw ids.
+        ini_date (datetime): Start date.
+        end_date (datetime): End date.
+        period (str): Aggregation period exp('', '1H', '1D')
+        max_workers (int): Concurrent get_sensor_values calls.
+        timeout (float): Seconds allowed for each call once it starts.
+        retries (int): Extra attempts after a failed or timed out call.
+        consume (Callable): Function of (position, frame) called with each
+            stitched sensor frame, whose result replaces it.
+    Returns:
+        List[pd.DataFrame]: timestamp and value of each raw_id, or its
+            consume result, in order.
+    """
+
+    ranges = split_range(ini_date, end_date, CHUNK)
+    frames = [None] * len(raw_ids)
+    chunks = [[None] * len(ranges) for _ in raw_ids]
+    remaining = [len(ranges)] * len(raw_ids)
+    started = {}
+    pending = {}
+    abandoned = False
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(i: int, j: int, attempt: int):
+        delay = BACKOFF * 2 ** (attempt - 1) if attempt else 0
+        future = executor.submit(
+            _timed_call,
+            started,
+            (i, j, attempt),
+            delay,
+            raw_ids[i],
+            *ranges[j],
+            period=period,
+        )
+        pending[future] = (i, j, attempt)
+
+    try:
+        # max_workers sensors at a time, chunk by chunk across them
+        for first in range(0, len(raw_ids), max_workers):
+            for j in range(len(ranges)):
+                for i in range(first, min(first + max_workers, len(raw_ids))):
+                    submit(i, j, 0)
+
+        while pending:
+            done, _ = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+            now = time.monotonic()
+
+            for future, (i, j, attempt) in list(pending.items()):
+                if future in done:
+                    del pending[future]
+                    error = future.exception()
+                    if error is None:
+                        chunks[i][j] = future.result()
+                        remaining[i] -= 1
+                        if not remaining[i]:
+                            frames[i] = stitch_chunks(chunks[i])
+                            chunks[i] = None
+                            if consume is not None:
+                                frames[i] = consume(i, frames[i])
+                        continue
+                elif now - started.get((i, j, attempt), now) > timeout:
+                    # The worker thread cannot be interrupted, the call
+                    # is abandoned and its result ignored.
+                    del pending[future]
+                    abandoned = True
+                    error = TimeoutError(
+                        f"get_sensor_values({raw_ids[i]}, "
+                        f"{ranges[j][0]:%Y-%m-%d}) took more than "
+                        f"{timeout} seconds"
+                    )
+                else:
+                    continue
+
+                if attempt >= retries:
+                    raise error
+                submit(i, j, attempt + 1)
+    finally:
+        executor.shutdown(wait=not (pending or abandoned), cancel_futures=True)
+
+    if CACHE is not None:
+        CACHE.evict()
+
+    return frames
+
+
+async def fetch_sensor_frames_async(
+    raw_ids: List[str],
+    ini_date: datetime,
+    end_date: datetime,
+    period: str = "1H",
+    max_workers: int = MAX_WORKERS,
+    timeout: float = TIMEOUT,
+    retries: int = RETRIES,
+) -> List[pd.DataFrame]:
+    """asyncio variant of fetch_sensor_frames
+
+    For callers that already run an event loop. Each call runs in a thread
+    of the loop's default executor, max_workers at a time.
+    Args:
+        raw_ids (List[str]): Sensor raw ids.
+        ini_date (datetime): Start date.
+        end_date (datetime): End date.
+        period (str): Aggregation period exp('', '1H', '1D')
+        max_workers (int): Concurrent get_sensor_values calls.
+        timeout (float): Seconds allowed for each call once it starts.
+        retries (int): Extra attempts after a failed or timed out call.
+    Returns:
+        List[pd.DataFrame]: timestamp and value of each raw_id, in order.
+    """
+
+    ranges = split_range(ini_date, end_date, CHUNK)
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch(
+        raw_id: str, start: datetime, end: datetime
+    ) -> pd.DataFrame:
+        for attempt in range(retries + 1):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        asyncio.to_thread(
+                            get_sensor_values,
+                            raw_id,
+                            start,
+                            end,
+                            period=period,
+                        ),
+                        timeout,
+                    )
+                except Exception:
+                    if attempt >= retries:
+                        raise
+            await asyncio.sleep(BACKOFF * 2**attempt)
+
+    chunks = await asyncio.gather(
+        *(fetch(raw_id, *chunk) for raw_id in raw_ids for chunk in ranges)
+    )
+    frames = [
+        stitch_chunks(chunks[i : i + len(ranges)])
+        for i in range(0, len(chunks), len(ranges))
+    ]
+
+    if CACHE is not None:
+        CACHE.evict()
+
+    return frames
+
+
+def to_long_frame(
+    frames: List[pd.DataFrame], columns: List[str]
+) -> pd.DataFrame:
+    """Stack the sensor frames as one row per reading
+
+    Each frame is appended with the code of its sensor, so the result has
+    as many rows as readings instead of rows times sensors. Values are
+    coerced to the frame_dtypes.VALUES dtype here, so no later stage sees
+    object columns, and readings without a numeric value are dropped.
+    Sensor is an ordered categorical of the sensor names that have
+    readings, which compact_frame keeps as it is.
+    Args:
+        frames (List[pd.DataFrame]): get_sensor_values result per sensor.
+        columns (List[str]): Sensor name per frame.
+    Returns:
+        pd.DataFrame: timestamp, Sensor and value columns, in frame order,
+            with the coerced and invalid reading counts in attrs.
+    """
+
+    names = sorted(set(columns))
+    codes = {name: code for code, name in enumerate(names)}
+    frames = [
+        (frame, codes[column])
+        for frame, column in zip(frames, columns)
+        if len(frame) and "value" in frame
+    ]
+
+    values, coerced, invalid = to_values(
+        np.concatenate(
+            [np.array([], dtype=float)]
+            + [frame["value"].to_numpy() for frame, _ in frames]
+        )
+    )
+    kept = ~np.isnan(values)
+
+    timestamp = np.concatenate(
+        [np.array([], dtype="int64")]
+        + [frame["timestamp"].to_numpy() for frame, _ in frames]
+    )
+    sensor = np.repeat(
+        np.array([code for _, code in frames], dtype="int32"),
+        np.array([len(frame) for frame, _ in frames], dtype="int64"),
+    )
+
+    df = pd.DataFrame(
+        {
+            "timestamp": timestamp[kept],
+            "Sensor": pd.Categorical.from_codes(
+                sensor[kept], names, ordered=True
+            ).remove_unused_categories(),
+            "value": values[kept],
+        }
+    )
+    df.attrs.update(coerced=coerced, invalid=invalid)
+
+    return df
+
+
+def concat_long_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Join long frames of different sensors in order
+
+    Their Sensor categoricals have different categories, which pd.concat
+    would turn into objects, so they are united into one ordered
+    categorical, and the coerced and invalid counts are added up.
+    Args:
+        frames (List[pd.DataFrame]): Long frames with a Sensor column.
+    Returns:
+        pd.DataFrame: Rows of every frame with the columns of the first.
+    """
+
+    df = pd.concat(
+        [frame.drop(columns="Sensor") for frame in frames], ignore_index=True
+    )
+    df.insert(
+        frames[0].columns.get_loc("Sensor"),
+        "Sensor",
+        union_categoricals(
+            [frame["Sensor"].array for frame in frames],
+            sort_categories=True,
+            ignore_order=True,
+        ).as_ordered(),
+    )
+    df.attrs.update(
+        {
+            count: sum(frame.attrs.get(count, 0) for frame in frames)
+            for count in ("coerced", "invalid")
+        }
+    )
+
+    return df
+
+
+def fetch_sensor_data(
+    df_sensors: pd.DataFrame,
+    ini_date: datetime,
+    end_date: datetime,
+    period: str = "1H",
+    max_workers: int = MAX_WORKERS,
+    timeout: float = TIMEOUT,
+    retries: int = RETRIES,
+    process: Callable = None,
+) -> pd.DataFrame:
+    """Concurrent replacement of the get_sensor_data loop
+
+    With process, every sensor is turned into its long frame and processed
+    as soon as it is fetched, while the pool fetches the others, and the
+    processed sensors are joined at the end, see fetch_sensor_frames.
+    Args:
+        df_sensors (pd.DataFrame): Sensors info Dataframe.
+        ini_date (datetime): Start date.
+        end_date (datetime): End date.
+        period (str): Aggregation period exp('', '1H', '1D')
+        max_workers (int): Concurrent get_sensor_values calls.
+        timeout (float): Seconds allowed for each call once it starts.
+        retries (int): Extra attempts after a failed or timed out call.
+        process (Callable): Function of the long frame of one sensor
+            exp(report_engine.melt_values), None to return the readings.
+    Returns:
+        pd.DataFrame: timestamp, Sensor and value per reading, see
+            to_long_frame, or the joined process results.
+    """
+
+    sensor_columns = get_sensor_columns(df_sensors)
+
+    def consume(i: int, frame: pd.DataFrame) -> pd.DataFrame:
+        return process(to_long_frame([frame], [sensor_columns[i][1]]))
+
+    frames = fetch_sensor_frames(
+        [raw_id for raw_id, _ in sensor_columns],
+        ini_date,
+        end_date,
+        period=period,
+        max_workers=max_workers,
+        timeout=timeout,
+        retries=retries,
+        consume=None if process is None else consume,
+    )
+
+    if process is None:
+        return to_long_frame(frames, [column for _, column in sensor_columns])
+
+    return concat_long_frames(frames)
+
+
+async def fetch_sensor_data_async(
+    df_sensors: pd.DataFrame,
+    ini_date: datetime,
+    end_date: datetime,
+    period: str = "1H",
+    max_workers: int = MAX_WORKERS,
+    timeout: float = TIMEOUT,
+    retries: int = RETRIES,
+) -> pd.DataFrame:
+    """asyncio variant of fetch_sensor_data, without process"""
+
+    sensor_columns = get_sensor_columns(df_sensors)
+
+    frames = await fetch_sensor_frames_async(
+        [raw_id for raw_id, _ in sensor_columns],
+        ini_date,
+        end_date,
+        period=period,
+        max_workers=max_workers,
+        timeout=timeout,
+        retries=retries,
+    )
+
+    return to_long_frame(frames, [column for _, column in sensor_columns])
\ No newline at end of file
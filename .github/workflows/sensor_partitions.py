@@ -0,0 +1,44 @@
+# Per-sensor views of a report frame
+
+# Python packages
+import numpy as np
+import pandas as pd
+
+
+class SensorPartitions:
+    """Report frame split by sensor once
+
+    The row positions of every sensor come from a single groupby, and each
+    slice is taken the first time it is requested, so plot builders read a
+    ready partition per trace instead of filtering the whole frame with
+    df[df["sensors"] == i]. Rows are sorted by sort_by first, unless the
+    frame already is, which keeps every partition in time order.
+    Args:
+        df (pd.DataFrame): Report frame.
+        key (str): Column with the sensor of each row.
+        sort_by (str): Column the partitions are ordered by, None to keep
+            the frame order.
+    """
+
+    def __init__(
+        self, df: pd.DataFrame, key: str = "sensors", sort_by: str = "time"
+    ):
+        if sort_by is not None and not df[sort_by].is_monotonic_increasing:
+            df = df.sort_values(sort_by, kind="stable")
+
+        self.frame = df
+        self.key = key
+        self._positions = df.groupby(key, sort=False, observed=True).indices
+        self._partitions = {}
+
+    def __getitem__(self, sensor) -> pd.DataFrame:
+        if sensor not in self._partitions:
+            positions = self._positions.get(sensor, np.array([], dtype=int))
+            self._partitions[sensor] = self.frame.take(positions)
+        return self._partitions[sensor]
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self) -> int:
+        return len(self._positions)
\ No newline at end of file
@@ -0,0 +1,87 @@
+# Per-sensor unit and outlier rules of the consumption reports
+
+# Python packages
+import numpy as np
+import pandas as pd
+
+# Rule of the sensors without one of their own
+DEFAULT = "*"
+
+
+def rules_table(rules: dict) -> pd.DataFrame:
+    """Sensor rules as one row per sensor name
+    Args:
+        rules (dict): Sensor name -> rule, see apply_sensor_rules.
+    Returns:
+        pd.DataFrame: label, max and one factor column per unit.
+    """
+
+    units = list(
+        dict.fromkeys(
+            unit for rule in rules.values() for unit in rule.get("units", {})
+        )
+    )
+
+    return pd.DataFrame(
+        [
+            [rule.get("label"), rule.get("max", np.inf)]
+            + [rule.get("units", {}).get(unit, np.nan) for unit in units]
+            for rule in rules.values()
+        ],
+        index=list(rules),
+        columns=["label", "max"] + units,
+    )
+
+
+def apply_sensor_rules(
+    df: pd.DataFrame,
+    rules: dict,
+    value_column: str = "water",
+    sensor_column: str = "Sensor",
+    label_column: str = None,
+) -> pd.DataFrame:
+    """Unit columns, outlier masking and labels from the sensor rules
+
+    A rule is a dict with:
+        units: Column -> factor, each column is the value times its factor
+            exp({"litros": 0.001} for mL, {"kilos": 1.3} for 1.3 kg/L)
+        max: Largest plausible value, larger values and their unit columns
+            become NaN.
+        label: Written to label_column, the sensor name if missing.
+    Rules are looked up once per sensor name and spread to the rows by
+    their codes, then every column is computed in one vectorized pass.
+    Sensors without a rule of their own use the DEFAULT ("*") rule, if
+    any, and a unit without a factor gives NaN.
+    Args:
+        df (pd.DataFrame): Rows with value_column and sensor_column.
+        rules (dict): Sensor name -> rule.
+        value_column (str): Column with the sensor values.
+        sensor_column (str): Column with the sensor names.
+        label_column (str): Column for the rule labels, None to skip them.
+    Returns:
+        pd.DataFrame: df, updated in place.
+    """
+
+    table = rules_table(rules)
+    codes, names = pd.factorize(df[sensor_column])
+    names = np.append(np.asarray(names, dtype=object), None)
+
+    # The last row, for code -1, is the empty rule of a missing sensor
+    keys = np.where(np.isin(names, table.index), names, DEFAULT)
+    keys[-1] = None
+    rows = table.reindex(keys).take(codes)
+
+    value = df[value_column].to_numpy(dtype=float)
+    plausible = ~(value > rows["max"].to_numpy(dtype=float))
+
+    for unit in table.columns[2:]:
+        df[unit] = np.where(
+            plausible, value * rows[unit].to_numpy(dtype=float), np.nan
+        )
+    df[value_column] = df[value_column].where(plausible)
+
+    if label_column is not None:
+        labels = rows["label"].to_numpy(dtype=object)
+        df[label_column] = np.where(pd.isna(labels), names[codes], labels)
+
+    return df
\ No newline at end of file
@@ -0,0 +1,206 @@
+# Size check of the pH report figures
+
+# With trace downsampling on, the size of a figure must grow with its
+# sensors and not with the readings of each sensor. The pH reports are
+# built on the fake sensor API with hourly and with minute readings, and
+# the reference bands must keep the same points and the line traces about
+# the same size. Box plots draw every reading by design and are left out.
+# The daily pH figure is then built for more sensors, whose reports only
+# have one, with hourly and minute readings.
+
+# Python packages
+import argparse
+import importlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+from golden_check import FIXTURES, TIMEZONE, report_sections
+
+CLIENTS = ("don_pollo", "acondesa", "agrinsa", "nutriavicola")
+
+# Fetch periods of the report runs, hourly is the reference
+PERIODS = ("1H", "")
+
+SENSORS = (1, 2, 4, 8)
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Size Check",
+        description="Check that the pH figures grow with sensors, not rows",
+    )
+
+    config_parser.add_argument(
+        "-p",
+        "--points",
+        type=int,
+        default=200,
+        help="Downsampling points per trace",
+    )
+
+    config_parser.add_argument(
+        "-t",
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Largest size ratio allowed with minute readings",
+    )
+
+    return config_parser.parse_args()
+
+
+def figure_sizes(html: str) -> tuple:
+    """Sizes of the figures of a report
+    Args:
+        html (str): Report HTML.
+    Returns:
+        tuple: Points of the dashed band lines and JSON bytes of the other
+            line traces.
+    """
+
+    band_points, line_bytes = 0, 0
+    for kind, figure in report_sections(html):
+        if kind != "figure":
+            continue
+        for trace in figure["data"]:
+            if trace.get("type") != "scatter":
+                continue
+            if trace.get("line", {}).get("dash") == "dash":
+                band_points += len(trace.get("x", []))
+            else:
+                line_bytes += len(json.dumps(trace))
+
+    return band_points, line_bytes
+
+
+def build_report(client: str, period: str, points: int) -> str:
+    """Run a pH report with its sources fetched at period
+    Args:
+        client (str): Report script name.
+        period (str): Fetch period exp('', '1H')
+        points (int): Downsampling points per trace.
+    Returns:
+        str: Report HTML.
+    """
+
+    import report_engine
+
+    json_dict = dict(
+        report_engine.read_parameters(
+            os.path.join(FIXTURES, "parameters", client + ".json")
+        ),
+        downsample={"points": points},
+    )
+    report_engine.configure_report(json_dict)
+    spec = importlib.import_module(client).REPORT
+    spec = dict(
+        spec,
+        sources={
+            name: dict(source, period=period)
+            for name, source in spec["sources"].items()
+        },
+    )
+
+    path = report_engine.run_report(spec, json_dict)
+    with open(path, encoding="utf-8") as file:
+        html = file.read()
+    os.remove(path)
+
+    return html
+
+
+def daily_ph_bytes(sensors: int, freq: str) -> int:
+    """JSON bytes of the traces of agrinsa.plot_daily_ph
+    Args:
+        sensors (int): Sensors of the figure.
+        freq (str): pandas frequency of the readings exp('H', 'T')
+    Returns:
+        int: Size of the figure data.
+    """
+
+    import numpy as np
+    import pandas as pd
+    import plotly.utils
+    from agrinsa import plot_daily_ph
+    from funciones_ioa import ioa
+    from sensor_partitions import SensorPartitions
+
+    times = pd.date_range("2021-07-01", "2021-07-15", freq=freq)
+    names = [f"pH{i}" for i in range(sensors)]
+    df = pd.DataFrame(
+        {
+            "time": times.repeat(sensors),
+            "sensors": names * len(times),
+            "pH": np.column_stack(
+                [ioa.bucket_values(name, times) for name in names]
+            ).ravel(),
+        }
+    )
+    fig = plot_daily_ph(SensorPartitions(df), names)
+
+    return len(
+        json.dumps(
+            fig.to_plotly_json()["data"], cls=plotly.utils.PlotlyJSONEncoder
+        )
+    )
+
+
+def main():
+
+    args = parser_config()
+
+    # The fake sensor API and the host zone of the fixtures, before the
+    # report modules import funciones_ioa
+    sys.path.insert(0, FIXTURES)
+    os.environ["TZ"] = TIMEZONE
+    time.tzset()
+
+    from downsampling import configure_downsampling
+
+    failed = False
+    print(f"{'report':<16}{'bands':>8}{'lines':>10}{'minute':>8}")
+    directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as output:
+        os.chdir(output)
+        try:
+            for client in CLIENTS:
+                (bands, lines), (minute_bands, minute) = [
+                    figure_sizes(build_report(client, period, args.points))
+                    for period in PERIODS
+                ]
+                problems = []
+                if minute_bands != bands:
+                    problems.append("band points change")
+                if minute > lines * args.tolerance:
+                    problems.append("lines grow with the readings")
+                failed = failed or bool(problems)
+                print(
+                    f"{client:<16}{bands:>8}{lines:>10}"
+                    f"{minute / lines:>8.2f}  {'; '.join(problems)}"
+                )
+        finally:
+            os.chdir(directory)
+
+    configure_downsampling({"points": args.points})
+    print(f"\n{'sensors':<16}{'bytes':>8}{'per sensor':>12}{'minute':>8}")
+    for sensors in SENSORS:
+        hourly = daily_ph_bytes(sensors, "H")
+        minute = daily_ph_bytes(sensors, "T")
+        grows = minute > hourly * args.tolerance
+        failed = failed or grows
+        print(
+            f"{sensors:<16}{hourly:>8}{hourly // sensors:>12}"
+            f"{minute / hourly:>8.2f}"
+            f"  {'figure grows with the readings' if grows else ''}"
+        )
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
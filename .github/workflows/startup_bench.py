@@ -0,0 +1,129 @@
+# Startup benchmark of the report command lines
+
+# Runs every report script with --help under python -X importtime and
+# fails when one of them imports a heavy module or takes longer than the
+# budget, so a top level import of pandas or plotly does not slip back in.
+
+# Python packages
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+SCRIPTS = (
+    "don_pollo.py",
+    "acondesa.py",
+    "agrinsa.py",
+    "nutriavicola.py",
+    "refinal.py",
+    "CERVALLE_informe.py",
+    "report_batch.py",
+)
+
+# Packages that must not load before the arguments are checked
+HEAVY = ("numpy", "pandas", "plotly", "funciones_ioa")
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Startup Benchmark",
+        description="Check that the report scripts answer --help without heavy imports",
+    )
+
+    config_parser.add_argument(
+        "-b",
+        "--budget",
+        type=float,
+        default=300,
+        help="Maximum milliseconds of each --help run",
+    )
+
+    config_parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Runs per script, the fastest one is kept",
+    )
+
+    return config_parser.parse_args()
+
+
+def imported_modules(importtime: str) -> dict:
+    """Modules listed by python -X importtime
+    Args:
+        importtime (str): stderr of the run.
+    Returns:
+        dict: Cumulative microseconds by module name.
+    """
+
+    modules = {}
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+
+    return modules
+
+
+def bench_script(script: str, repeat: int = 3) -> tuple:
+    """Time the --help of a script and list its imports
+    Args:
+        script (str): Path of the report script.
+        repeat (int): Runs, the fastest one is kept.
+    Returns:
+        tuple: Milliseconds, heavy modules imported and the slowest
+            top level import.
+    """
+
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run = subprocess.run(
+            [sys.executable, "-X", "importtime", script, "--help"],
+            capture_output=True,
+            text=True,
+        )
+        seconds = time.perf_counter() - started
+        if run.returncode != 0:
+            raise RuntimeError(f"{script} --help failed:\n{run.stderr}")
+        if best is None or seconds < best[0]:
+            best = (seconds, run.stderr)
+
+    modules = imported_modules(best[1])
+    heavy = sorted({name.split(".")[0] for name in modules} & set(HEAVY))
+    top = [name for name in modules if "." not in name]
+    slowest = max(top, key=modules.get) if top else ""
+
+    return best[0] * 1000, heavy, slowest
+
+
+def main():
+
+    args = parser_config()
+    directory = os.path.dirname(os.path.abspath(__file__))
+
+    failed = False
+    print(f"{'script':<24}{'ms':>8}  slowest import / problem")
+    for script in SCRIPTS:
+        ms, heavy, slowest = bench_script(
+            os.path.join(directory, script), args.repeat
+        )
+        problems = []
+        if heavy:
+            problems.append("imports " + ", ".join(heavy))
+        if ms > args.budget:
+            problems.append(f"over the {args.budget:.0f} ms budget")
+        failed = failed or bool(problems)
+        print(f"{script:<24}{ms:>8.1f}  {'; '.join(problems) or slowest}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
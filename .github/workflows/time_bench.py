@@ -0,0 +1,96 @@
+# Timestamp decoding benchmark
+
+# Decodes millions of epoch milliseconds with the row-wise
+# datetime.fromtimestamp apply of the original process_data and with
+# report_time.decode_time, in the host zone and in an explicit one, and
+# fails when a decode differs from the apply or is not faster than it.
+
+# Python packages
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from report_time import decode_time
+
+ZONE = "America/Bogota"
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Time Benchmark",
+        description="Time report_time against the fromtimestamp apply",
+    )
+
+    config_parser.add_argument(
+        "-r",
+        "--rows",
+        type=int,
+        default=10_000_000,
+        help="Timestamps decoded",
+    )
+
+    return config_parser.parse_args()
+
+
+def readings(rows: int) -> pd.Series:
+    """Minute epoch milliseconds at a random second of each minute
+    Args:
+        rows (int): Readings, from 2010 on.
+    Returns:
+        pd.Series: Epoch milliseconds, as ioa returns them.
+    """
+
+    start = pd.Timestamp("2010-01-01", tz="UTC").value // 10**6
+    jitter = np.random.default_rng(0).integers(0, 60_000, rows)
+
+    return pd.Series(
+        start + np.arange(rows, dtype="int64") * 60_000 + jitter,
+        name="timestamp",
+    )
+
+
+def main():
+
+    args = parser_config()
+
+    os.environ["TZ"] = ZONE
+    time.tzset()
+    timestamp = readings(args.rows)
+
+    decodes = {
+        "apply": lambda: pd.to_datetime(
+            timestamp.apply(lambda x: datetime.fromtimestamp(x / 1000))
+        ),
+        "host": lambda: decode_time(timestamp),
+        "explicit": lambda: decode_time(timestamp, ZONE),
+    }
+
+    print(f"{'decode':<10}{'rows':>12}{'seconds':>10}{'speedup':>10}")
+    problems = []
+    for name, decode in decodes.items():
+        started = time.perf_counter()
+        times = decode()
+        seconds = time.perf_counter() - started
+        if name == "apply":
+            apply, expected = seconds, times.to_numpy()
+        elif not (times.to_numpy() == expected).all():
+            problems.append(f"{name} decodes other times")
+        elif seconds >= apply:
+            problems.append(f"{name} not faster than the apply")
+        print(
+            f"{name:<10}{len(times):>12}{seconds:>10.2f}"
+            f"{apply / seconds:>10.1f}"
+        )
+
+    if problems:
+        print("; ".join(problems))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
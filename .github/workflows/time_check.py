@@ -0,0 +1,138 @@
+# Parity check of the timestamp decoding
+
+# Decodes years of readings with report_time under host zones with and
+# without daylight saving time, and with offsets that are not whole hours,
+# and fails when a time or calendar column differs from the row-wise
+# datetime.fromtimestamp conversion the report scripts used before.
+
+# Python packages
+import argparse
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from report_time import add_calendar_columns, decode_time
+
+ZONES = (
+    "America/Bogota",
+    "Europe/Madrid",
+    "America/Santiago",
+    "Australia/Lord_Howe",
+    "Asia/Kathmandu",
+)
+
+HOUR_MS = 3600 * 1000
+
+
+def parser_config() -> argparse.Namespace:
+
+    config_parser = argparse.ArgumentParser(
+        prog="Time Check",
+        description="Compare report_time with the fromtimestamp conversion",
+    )
+
+    config_parser.add_argument(
+        "-s",
+        "--start",
+        default="2019-01-01",
+        help="First reading of the check",
+    )
+
+    config_parser.add_argument(
+        "-e",
+        "--end",
+        default="2023-01-01",
+        help="Last reading of the check",
+    )
+
+    return config_parser.parse_args()
+
+
+def readings(start: str, end: str) -> pd.Series:
+    """Hourly epoch milliseconds at a random minute of each hour
+    Args:
+        start (str): First hour.
+        end (str): Last hour.
+    Returns:
+        pd.Series: Epoch milliseconds, as ioa returns them.
+    """
+
+    hours = pd.date_range(start, end, freq="H", tz="UTC").asi8 // 10**6
+    jitter = np.random.default_rng(0).integers(0, HOUR_MS, len(hours))
+
+    return pd.Series(hours + jitter, name="timestamp")
+
+
+def old_columns(timestamp: pd.Series) -> pd.DataFrame:
+    """Time and calendar columns as process_data derived them row by row
+    Args:
+        timestamp (pd.Series): Epoch milliseconds.
+    Returns:
+        pd.DataFrame: time, date, hour, semana and mes.
+    """
+
+    times = [datetime.fromtimestamp(x / 1000) for x in timestamp]
+    weeks = [x.isocalendar()[1] for x in times]
+
+    return pd.DataFrame(
+        {
+            "time": pd.to_datetime(times),
+            "date": [x.date() for x in times],
+            "hour": [x.hour for x in times],
+            "semana": [0 if x == 52 else x for x in weeks],
+            "mes": [x.month for x in times],
+        }
+    )
+
+
+def mismatches(old: pd.DataFrame, new: pd.DataFrame) -> list:
+    """Columns of old whose values differ in new
+    Args:
+        old (pd.DataFrame): old_columns result.
+        new (pd.DataFrame): Same columns from report_time.
+    Returns:
+        list: (column, rows that differ) pairs.
+    """
+
+    problems = []
+    for column in old.columns:
+        rows = int((old[column].to_numpy() != new[column].to_numpy()).sum())
+        if rows:
+            problems.append((column, rows))
+
+    return problems
+
+
+def main():
+
+    args = parser_config()
+    timestamp = readings(args.start, args.end)
+
+    failed = False
+    print(f"{'zone':<22}{'host':>12}{'explicit':>12}")
+    for zone in ZONES:
+        os.environ["TZ"] = zone
+        time.tzset()
+
+        old = old_columns(timestamp)
+        results = []
+        for timezone in (None, zone):
+            new = pd.DataFrame({"time": decode_time(timestamp, timezone)})
+            new = add_calendar_columns(new, ["date", "hour", "semana", "mes"])
+            problems = mismatches(old, new)
+            failed = failed or bool(problems)
+            results.append(
+                ", ".join(f"{column} {rows}" for column, rows in problems)
+                or "same"
+            )
+        print(f"{zone:<22}{results[0]:>12}{results[1]:>12}")
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file